@@ -0,0 +1,93 @@
+"""
+Payload size and encode/decode time of cache codecs for user list pages,
+GetUserListPageResponseSchema as cached by UserService.get_user_page.
+
+    make bench-codec
+"""
+import pickle
+import timeit
+
+from application.core.helpers.cache.codec import Codec
+from application.domain.user.models import (
+    GetUserListPageResponseSchema,
+    GetUserListResponseSchema,
+    User,
+)
+
+PAGE_SIZES = (12, 100, 1000)
+CODECS = (
+    ("orjson", None),
+    ("orjson", "zstd"),
+    ("orjson", "lz4"),
+    ("msgpack", None),
+    ("msgpack", "zstd"),
+)
+
+
+def make_page(size: int) -> GetUserListPageResponseSchema:
+    return GetUserListPageResponseSchema(
+        items=[
+            GetUserListResponseSchema(
+                id=i, email=f"user{i}@example.com", nickname=f"nickname-{i}"
+            )
+            for i in range(size)
+        ],
+        next_cursor="eyJpZCI6IDEyfQ",
+    )
+
+
+def make_rows(size: int) -> list[User]:
+    return [
+        User(id=i, email=f"user{i}@example.com", nickname=f"nickname-{i}")
+        for i in range(size)
+    ]
+
+
+def measure(encode, decode, value, number: int) -> tuple[int, float, float]:
+    data = encode(value)
+    encode_time = timeit.timeit(lambda: encode(value), number=number) / number
+    decode_time = timeit.timeit(lambda: decode(data), number=number) / number
+    return len(data), encode_time, decode_time
+
+
+def report(name: str, size: int, result: tuple[int, float, float]) -> None:
+    length, encode_time, decode_time = result
+    print(
+        f"{name:<24}{size:>6}{length:>10}"
+        f"{encode_time * 1e6:>14.1f}{decode_time * 1e6:>14.1f}"
+    )
+
+
+def main() -> None:
+    print(f"{'codec':<24}{'rows':>6}{'bytes':>10}{'encode(us)':>14}{'decode(us)':>14}")
+    for size in PAGE_SIZES:
+        number = max(10, 20000 // size)
+        # previous behaviour, ORM rows pickled with their instance state
+        report(
+            "pickle(orm rows)",
+            size,
+            measure(pickle.dumps, pickle.loads, make_rows(size), number),
+        )
+        page = make_page(size)
+        report(
+            "pickle(page)",
+            size,
+            measure(pickle.dumps, pickle.loads, page, number),
+        )
+        for fmt, compression in CODECS:
+            try:
+                codec = Codec(
+                    format=fmt, compression=compression, compression_threshold=0
+                )
+            except ValueError as e:
+                print(f"{fmt}+{compression}: skipped, {e}")
+                continue
+            report(
+                f"{fmt}+{compression or 'none'}",
+                size,
+                measure(codec.encode, codec.decode, page, number),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Per request time of request logging, handed to an in-memory log handler, no database needed.
+LogRoute as it was(BackgroundTasks and headers dict per request), LogRoute now, and RequestLogMiddleware,
+against the same endpoint without logging.
+
+    make bench-request-log
+"""
+import asyncio
+import time
+from typing import Callable
+
+from fastapi import APIRouter, BackgroundTasks, FastAPI, Request, Response
+from fastapi.routing import APIRoute
+
+from application.core.fastapi.log_policy import LOG_ALL
+from application.core.fastapi.log_route import LogRoute
+from application.core.middlewares.request_log import RequestLogMiddleware
+
+REQUESTS = 20000
+
+
+class User:
+    user_id = 1
+
+
+class MemoryLogHandler:
+    def __init__(self) -> None:
+        self.records: list = []
+
+    async def __call__(self, data) -> None:
+        self.records.append(data)
+
+
+handler = MemoryLogHandler()
+
+
+class LegacyLogRoute(APIRoute):
+    """LogRoute before log sink."""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            response: Response = await original_route_handler(request)
+            log_data = {
+                "user_id": request.user.user_id,
+                "ip": request.client.host if request.client else None,
+                "port": request.client.port if request.client else None,
+                "method": request.method,
+                "path": request.url.path,
+                "agent": dict(request.headers.items())["user-agent"],
+                "response_status": response.status_code,
+            }
+            pre_background = response.background
+            response.background = BackgroundTasks()
+            if pre_background:
+                response.background = BackgroundTasks([pre_background])
+            response.background.add_task(func=handler, data=log_data)
+            return response
+
+        return custom_route_handler
+
+
+class BenchLogRoute(LogRoute):
+    def get_route_handler(self, **kwargs) -> Callable:
+        return super().get_route_handler(
+            log_handler=handler, default_log_policy=LOG_ALL, request_log_mode="route"
+        )
+
+
+async def health() -> Response:
+    return Response(status_code=200)
+
+
+def build_app(route_class: type[APIRoute] = APIRoute) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+    router.add_api_route("/api/v1/items", health, methods=["GET"])
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/items",
+        "raw_path": b"/api/v1/items",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"user-agent", b"bench/1.0"),
+            (b"accept", b"*/*"),
+            (b"accept-encoding", b"gzip, deflate"),
+            (b"authorization", b"Bearer token"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "user": User(),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def run(app) -> float:
+    for _ in range(1000):
+        await app(scope(), receive, send)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(scope(), receive, send)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    apps = {
+        "no logging": build_app(),
+        "LogRoute before": build_app(LegacyLogRoute),
+        "LogRoute": build_app(BenchLogRoute),
+        "RequestLogMiddleware": RequestLogMiddleware(
+            build_app(), log_handler=handler, log_policy=LOG_ALL
+        ),
+    }
+    baseline = None
+    print(f"{'mode':<24}{'us/request':>12}{'logging us':>12}")
+    for name, app in apps.items():
+        handler.records.clear()
+        elapsed = await run(app) / REQUESTS * 1e6
+        baseline = elapsed if baseline is None else baseline
+        print(f"{name:<24}{elapsed:>12.1f}{elapsed - baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Connections checked out per request, session per repository call versus request scoped session.
+Needs the database configured by ENV_FILE, e.g. `make test-db-run` with `.env.test`.
+
+    ENV_FILE=.env.test make bench-session
+"""
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from application.container import AppContainer
+from application.core.db import Base, standalone_session
+
+REQUESTS = 200
+EMAIL = "bench@example.com"
+NICKNAME = "bench"
+
+
+class CheckoutCounter:
+    def __init__(self, *engines) -> None:
+        self.count = 0
+        for engine in engines:
+            event.listen(engine.sync_engine, "checkout", self._on_checkout)
+
+    def _on_checkout(self, *args) -> None:
+        self.count += 1
+
+
+async def session_per_call(repository) -> None:
+    """Each repository call in its own session, as repositories used to run."""
+    await standalone_session(repository.get_user_by_email)(email=EMAIL)
+    await standalone_session(repository.get_user_by_email_or_nickname)(
+        email=EMAIL, nickname=NICKNAME
+    )
+    await standalone_session(repository.get_user_list)(limit=12)
+
+
+@standalone_session
+async def request_scoped(repository) -> None:
+    """Repository calls joining one session, as within SQLAlchemyMiddleware."""
+    await repository.get_user_by_email(email=EMAIL)
+    await repository.get_user_by_email_or_nickname(email=EMAIL, nickname=NICKNAME)
+    await repository.get_user_list(limit=12)
+
+
+async def run(name: str, request, repository, counter: CheckoutCounter) -> None:
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await request(repository)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<20}{counter.count / REQUESTS:>12.2f}"
+        f"{elapsed / REQUESTS * 1000:>14.2f}"
+    )
+
+
+async def main() -> None:
+    container = AppContainer()
+    writer_engine = container.writer_engine()
+    replica_set = container.replica_set()
+    async with writer_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    repository = container.user_container.user_repository()
+    counter = CheckoutCounter(
+        writer_engine, *(replica.engine for replica in replica_set.replicas)
+    )
+
+    print(f"{'mode':<20}{'checkouts/req':>12}{'ms/req':>14}")
+    await run("session per call", session_per_call, repository, counter)
+    await run("request scoped", request_scoped, repository, counter)
+
+    await replica_set.close()
+    await writer_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
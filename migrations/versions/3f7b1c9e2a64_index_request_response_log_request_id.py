@@ -0,0 +1,33 @@
+"""index request_response_log by request_id
+
+Revision ID: 3f7b1c9e2a64
+Revises: 88f2cb0d4fc9
+Create Date: 2026-10-18 09:00:00.000000
+
+Replayed request logs are looked up by request_id within their created_at range.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7b1c9e2a64'
+down_revision = '88f2cb0d4fc9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f('ix_request_response_log_request_id_created_at'),
+        'request_response_log',
+        ['request_id', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_request_response_log_request_id_created_at'),
+        table_name='request_response_log',
+    )
@@ -0,0 +1,135 @@
+"""partition request_response_log by month of created_at
+
+Revision ID: 5c2e8a1f7d34
+Revises: 3f7b1c9e2a64
+Create Date: 2026-10-18 10:00:00.000000
+
+Existing rows are copied into the partitioned table, run in a maintenance window on a large table.
+Partitions of following months are created by celery beat task `log.premake_partitions`.
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy_utils
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a1f7d34'
+down_revision = '3f7b1c9e2a64'
+branch_labels = None
+depends_on = None
+
+# months created from oldest row's month up to this many months ahead
+PREMAKE_MONTHS = 3
+COLUMNS = (
+    "id, created_at, user_id, ip, port, agent, method, path,"
+    " response_status, request_id, updated_at"
+)
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _columns():
+    return [
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.INTEGER(), nullable=True),
+        sa.Column('ip', sa.VARCHAR(), nullable=False),
+        sa.Column('port', sa.INTEGER(), nullable=False),
+        sa.Column('agent', sa.VARCHAR(), nullable=False),
+        sa.Column('method', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('path', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('response_status', sa.SMALLINT(), nullable=False),
+        sa.Column('request_id', sqlalchemy_utils.types.uuid.UUIDType(binary=False), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def _create_request_id_index():
+    op.create_index(
+        op.f('ix_request_response_log_request_id_created_at'),
+        'request_response_log',
+        ['request_id', 'created_at'],
+        unique=False,
+    )
+
+
+def _drop_request_id_index():
+    op.drop_index(
+        op.f('ix_request_response_log_request_id_created_at'),
+        table_name='request_response_log',
+    )
+
+
+def upgrade():
+    # index names are free for the new table, legacy one is dropped at the end anyway
+    _drop_request_id_index()
+    op.rename_table('request_response_log', 'request_response_log_legacy')
+    op.execute('ALTER SEQUENCE request_response_log_id_seq RENAME TO request_response_log_legacy_id_seq')
+    op.create_table(
+        'request_response_log',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    # created on every partition, those attached later included
+    _create_request_id_index()
+    op.create_index(
+        op.f('ix_request_response_log_created_at'),
+        'request_response_log',
+        ['created_at'],
+        unique=False,
+    )
+    op.execute('CREATE TABLE request_response_log_default PARTITION OF request_response_log DEFAULT')
+
+    oldest = op.get_bind().execute(
+        sa.text('SELECT min(created_at) FROM request_response_log_legacy')
+    ).scalar()
+    today = datetime.datetime.utcnow().date()
+    month = datetime.date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(datetime.date(today.year, today.month, 1), PREMAKE_MONTHS)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE request_response_log_p{month:%Y_%m} PARTITION OF request_response_log"
+            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(
+        f'INSERT INTO request_response_log ({COLUMNS})'
+        f' SELECT {COLUMNS} FROM request_response_log_legacy'
+    )
+    op.execute(
+        "SELECT setval('request_response_log_id_seq',"
+        " (SELECT coalesce(max(id), 0) + 1 FROM request_response_log), false)"
+    )
+    op.drop_table('request_response_log_legacy')
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_request_response_log_created_at'),
+        table_name='request_response_log',
+    )
+    _drop_request_id_index()
+    op.rename_table('request_response_log', 'request_response_log_partitioned')
+    op.execute('ALTER SEQUENCE request_response_log_id_seq RENAME TO request_response_log_partitioned_id_seq')
+    op.create_table(
+        'request_response_log',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    _create_request_id_index()
+    op.execute(
+        f'INSERT INTO request_response_log ({COLUMNS})'
+        f' SELECT {COLUMNS} FROM request_response_log_partitioned'
+    )
+    op.execute(
+        "SELECT setval('request_response_log_id_seq',"
+        " (SELECT coalesce(max(id), 0) + 1 FROM request_response_log), false)"
+    )
+    # partitions go with their parent
+    op.drop_table('request_response_log_partitioned')
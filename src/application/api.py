@@ -3,7 +3,7 @@ from fastapi import APIRouter
 from application.core.fastapi.custom_json_response import CustomORJSONResponse
 from application.core.fastapi.pydantic_models import ResponseBaseModel
 from application.domain.auth.views import auth_router
-from application.domain.home.views import home_router
+from application.domain.home.views import home_router, metrics_router
 from application.domain.user.views import user_router as user_v1_router
 
 
@@ -27,3 +27,4 @@ router = APIRouter(
 router.include_router(user_v1_router, prefix="/api/v1/users", tags=["User"])
 router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 router.include_router(home_router, tags=["Home"])
+router.include_router(metrics_router, tags=["Home"])
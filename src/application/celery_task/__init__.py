@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 
 from application.core.config.config_container import config
 
@@ -6,7 +7,18 @@ celery_app = Celery(
     "worker",
     backend=config.CELERY_BACKEND_URL(),
     broker=config.CELERY_BROKER_URL(),
+    include=["application.celery_task.tasks.log_partition"],
 )
 
 celery_app.conf.task_routes = {"worker.celery_worker.test_celery": "test-queue"}
 celery_app.conf.update(task_track_started=True)
+celery_app.conf.beat_schedule = {
+    "premake-log-partitions": {
+        "task": "log.premake_partitions",
+        "schedule": crontab(minute=0, hour=0),
+    },
+    "drop-expired-log-partitions": {
+        "task": "log.drop_expired_partitions",
+        "schedule": crontab(minute=30, hour=0),
+    },
+}
@@ -0,0 +1,31 @@
+import asyncio
+
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from application.celery_task import celery_app
+from application.core.config.config_container import config
+from application.core.db.partition import MonthlyPartitions
+from application.domain.log.models import RequestResponseLog
+
+
+async def _run(action: str, months: int) -> list[str]:
+    # event loop is per task, connections must not outlive it
+    engine = create_async_engine(config.WRITER_DB_URL(), poolclass=pool.NullPool)
+    partitions = MonthlyPartitions(engine, RequestResponseLog.__tablename__)
+    try:
+        if action == "premake":
+            return await partitions.premake(months_ahead=months)
+        return await partitions.drop_older_than(retention_months=months)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="log.premake_partitions")
+def premake_log_partitions() -> list[str]:
+    return asyncio.run(_run("premake", config.LOG_PARTITION_PREMAKE_MONTHS()))
+
+
+@celery_app.task(name="log.drop_expired_partitions")
+def drop_expired_log_partitions() -> list[str]:
+    return asyncio.run(_run("drop", config.LOG_RETENTION_MONTHS()))
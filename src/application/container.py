@@ -2,24 +2,35 @@ from dependency_injector import containers, providers
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from redis.asyncio.client import Redis
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_scoped_session,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
 from sqlalchemy.orm import sessionmaker
 
 from application.core.config.config_container import config_container
+from application.core.db.engine import create_engine
+from application.core.db.instrumentation import DBMetrics
+from application.core.db.replica import ReplicaSet
 from application.core.db.session_maker import RoutingSession, get_session_context
 from application.core.external_service.auth_client import AuthClient
 from application.core.external_service.http_client import Aiohttp
-from application.core.helpers.cache import CacheManager, CustomKeyMaker, RedisBackend
+from application.core.external_service.jwks import JWKSKeySet
+from application.core.external_service.token_cache import VerifiedTokenCache
+from application.core.fastapi.log_policy import LogPolicy
+from application.core.helpers.cache import (
+    CacheManager,
+    Codec,
+    CustomKeyMaker,
+    RedisBackend,
+    TwoTierBackend,
+)
 from application.core.helpers.logging import init_logger
 from application.core.middlewares import (
     AuthenticationMiddleware,
     ExternalAuthBackend,
+    JWKSAuthBackend,
     on_auth_error,
 )
+from application.core.middlewares.db_stats import DBStatsMiddleware
+from application.core.middlewares.request_log import RequestLogMiddleware
 from application.core.middlewares.sqlalchemy import SQLAlchemyMiddleware
 from application.domain.auth.container import AuthContainer
 from application.domain.log.container import LogContainer
@@ -44,6 +55,13 @@ class AppContainer(containers.DeclarativeContainer):
         limit_per_host=config.SIZE_POOL_AIOHTTP,
     )
 
+    token_cache = providers.Singleton(
+        VerifiedTokenCache,
+        max_size=config.AUTH_TOKEN_CACHE_SIZE,
+        max_ttl=config.AUTH_TOKEN_CACHE_MAX_TTL,
+        negative_ttl=config.AUTH_TOKEN_CACHE_NEGATIVE_TTL,
+        use_redis=config.AUTH_TOKEN_CACHE_USE_REDIS,
+    )
     auth_client = providers.Singleton(
         AuthClient,
         auth_base_url=config.AUTH_BASE_URL,
@@ -53,6 +71,8 @@ class AppContainer(containers.DeclarativeContainer):
         scope=config.AUTH_SCOPE,
         session=async_http_client,
         ssl=True if config.ENV == "production" else False,
+        token_cache=token_cache,
+        server_token_refresh_margin=config.AUTH_SERVER_TOKEN_REFRESH_MARGIN,
     )
 
     # middleware
@@ -64,9 +84,22 @@ class AppContainer(containers.DeclarativeContainer):
         allow_methods=config.ALLOW_METHODS,
         allow_headers=config.ALLOW_HEADERS,
     )
-    auth_backend = providers.Singleton(
-        # auth_client is injected on AstAuthBackend declaration
-        ExternalAuthBackend
+    auth_key_set = providers.Singleton(
+        JWKSKeySet,
+        min_refresh_interval=config.AUTH_JWKS_MIN_REFRESH_INTERVAL,
+    )
+    # selected by config.AUTH_BACKEND
+    auth_backend = providers.Selector(
+        config.AUTH_BACKEND,
+        # auth_client, token_cache are injected on ExternalAuthBackend declaration
+        external=providers.Singleton(ExternalAuthBackend),
+        jwks=providers.Singleton(
+            JWKSAuthBackend,
+            key_set=auth_key_set,
+            algorithms=config.AUTH_JWT_ALGORITHMS,
+            revocation_sensitive_scopes=config.AUTH_REVOCATION_SENSITIVE_SCOPES,
+            audience=config.AUTH_JWT_AUDIENCE,
+        ),
     )
     auth_middleware = providers.Singleton(
         Middleware,
@@ -74,31 +107,87 @@ class AppContainer(containers.DeclarativeContainer):
         backend=auth_backend,
         on_error=on_auth_error,
     )
-    sqlalchemy_middleware = providers.Factory(Middleware, SQLAlchemyMiddleware)
-    middleware_list = providers.List(
-        cors_middleware,
-        auth_middleware,
-        sqlalchemy_middleware,
+    sqlalchemy_middleware = providers.Factory(
+        Middleware,
+        SQLAlchemyMiddleware,
+        secret_key=config.JWT_SECRET_KEY,
+        read_your_writes_window=config.DB_READ_YOUR_WRITES_WINDOW,
     )
+    db_stats_middleware = providers.Factory(Middleware, DBStatsMiddleware)
 
     # redis
-    redis_backend = providers.Factory(RedisBackend)
+    cache_codec = providers.Singleton(
+        Codec,
+        format=config.CACHE_CODEC,
+        compression=config.CACHE_COMPRESSION,
+        compression_threshold=config.CACHE_COMPRESSION_THRESHOLD,
+    )
+    redis_backend = providers.Factory(
+        RedisBackend,
+        scan_count=config.CACHE_SCAN_COUNT,
+        delete_batch_size=config.CACHE_DELETE_BATCH_SIZE,
+        codec=cache_codec,
+    )
     redis_key_maker = providers.Factory(CustomKeyMaker)
     redis = providers.Singleton(
         Redis.from_url,
         # this value should be called when declared. If not, repr(config.value) will be injected.
         url=f"redis://{config.REDIS_HOST()}:{config.REDIS_PORT()}",
     )
+    two_tier_backend = providers.Singleton(
+        TwoTierBackend,
+        remote=redis_backend,
+        max_entries=config.CACHE_L1_MAX_ENTRIES,
+        max_bytes=config.CACHE_L1_MAX_BYTES,
+        ttl=config.CACHE_L1_TTL,
+        channel=config.CACHE_INVALIDATION_CHANNEL,
+    )
+    # selected by config.CACHE_BACKEND
+    cache_backend = providers.Selector(
+        config.CACHE_BACKEND,
+        redis=redis_backend,
+        two_tier=two_tier_backend,
+    )
     cache_manager = providers.Singleton(
-        CacheManager, backend=redis_backend, key_maker=redis_key_maker
+        CacheManager, backend=cache_backend, key_maker=redis_key_maker
     )
 
     # session
-    writer_engine = providers.Factory(
-        create_async_engine, config.WRITER_DB_URL, pool_recycle=3600
+    db_metrics = providers.Singleton(
+        DBMetrics, slow_query_threshold=config.DB_SLOW_QUERY_THRESHOLD
+    )
+    # one pool per engine per worker, disposed on shutdown
+    writer_engine = providers.Singleton(
+        create_engine,
+        config.WRITER_DB_URL,
+        role="writer",
+        metrics=db_metrics,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        statement_cache_size=config.DB_STATEMENT_CACHE_SIZE,
     )
-    reader_engine = providers.Factory(
-        create_async_engine, config.READER_DB_URL, pool_recycle=3600
+    # READER_DB_URLS, or READER_DB_URL when not set
+    replica_set = providers.Singleton(
+        ReplicaSet.from_urls,
+        writer=writer_engine,
+        urls=config.READER_DB_URLS,
+        fallback_url=config.READER_DB_URL,
+        weights=config.READER_DB_WEIGHTS,
+        balancer=config.DB_READER_BALANCER,
+        health_check_interval=config.DB_HEALTH_CHECK_INTERVAL,
+        health_check_timeout=config.DB_HEALTH_CHECK_TIMEOUT,
+        max_lag=config.DB_REPLICA_MAX_LAG,
+        role="reader",
+        metrics=db_metrics,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        statement_cache_size=config.DB_STATEMENT_CACHE_SIZE,
     )
 
     async_session_factory = providers.Factory(
@@ -115,4 +204,34 @@ class AppContainer(containers.DeclarativeContainer):
     # domain/.../config
     user_container = providers.Container(UserContainer)
     auth_container = providers.Container(AuthContainer)
-    log_container = providers.Container(LogContainer)
+    log_container = providers.Container(LogContainer, config=config)
+    log_policy = providers.Singleton(
+        LogPolicy.from_settings,
+        sample_rate=config.LOG_SAMPLE_RATE,
+        client_error_sample_rate=config.LOG_CLIENT_ERROR_SAMPLE_RATE,
+        skip_paths=config.LOG_SKIP_PATHS,
+    )
+
+    # middleware stack, outermost first, selected by config.REQUEST_LOG_MODE
+    request_log_middleware = providers.Factory(
+        Middleware,
+        RequestLogMiddleware,
+        log_handler=log_container.log_sink,
+        log_policy=log_policy,
+    )
+    middleware_list = providers.Selector(
+        config.REQUEST_LOG_MODE,
+        route=providers.List(
+            cors_middleware,
+            auth_middleware,
+            db_stats_middleware,
+            sqlalchemy_middleware,
+        ),
+        middleware=providers.List(
+            cors_middleware,
+            auth_middleware,
+            db_stats_middleware,
+            request_log_middleware,
+            sqlalchemy_middleware,
+        ),
+    )
@@ -0,0 +1,155 @@
+import base64
+import binascii
+import datetime
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+
+import orjson
+from sqlalchemy import and_, or_
+
+from application.core.exceptions import InvalidCursorException
+
+ModelType = TypeVar("ModelType")
+
+FORWARD = "next"
+BACKWARD = "prev"
+
+
+@dataclass(slots=True)
+class SortKey:
+    """Column attribute name, `-name` for descending."""
+
+    name: str
+    descending: bool = False
+
+    @classmethod
+    def parse(cls, key: str) -> "SortKey":
+        if key.startswith("-"):
+            return cls(name=key[1:], descending=True)
+        return cls(name=key)
+
+
+@dataclass(slots=True)
+class KeysetPage(Generic[ModelType]):
+    items: list[ModelType] = field(default_factory=list)
+    # None when there is no page in that direction
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _restore(value: Any, python_type: type | None) -> Any:
+    """Cursor values come back as json, restore types json can not carry."""
+    if value is None or python_type is None:
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if python_type in (Decimal, uuid.UUID):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    payload = orjson.dumps({"d": direction, "v": list(values)}, default=str)
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> tuple[str, list[Any]]:
+    try:
+        payload = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        direction, values = payload["d"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorException()
+    if direction not in (FORWARD, BACKWARD) or not isinstance(values, list):
+        raise InvalidCursorException()
+    if len(values) != size:
+        raise InvalidCursorException()
+    return direction, values
+
+
+class Keyset:
+    """
+    Keyset(seek) pagination over sort keys of a model.
+
+    Page after a cursor is found by comparing sort key tuple instead of OFFSET, so a deep page costs as much as the first.
+    Sort keys must be non null and unique together, `id` is appended as tie breaker when missing.
+    """
+
+    def __init__(self, model: type, order_by: Sequence[str]) -> None:
+        self.model = model
+        self.keys = [SortKey.parse(key) for key in order_by]
+        if hasattr(model, "id") and "id" not in {key.name for key in self.keys}:
+            self.keys.append(SortKey(name="id"))
+        self.columns = []
+        for key in self.keys:
+            if not hasattr(model, key.name):
+                raise ValueError(f"{model} has no {key.name}")
+            self.columns.append(getattr(model, key.name))
+
+    def _python_types(self) -> list[type | None]:
+        types = []
+        for column in self.columns:
+            try:
+                types.append(column.type.python_type)
+            except NotImplementedError:
+                types.append(None)
+        return types
+
+    def order_by(self, direction: str) -> list:
+        clauses = []
+        for key, column in zip(self.keys, self.columns):
+            # walking backward reverses every key
+            descending = key.descending != (direction == BACKWARD)
+            clauses.append(column.desc() if descending else column.asc())
+        return clauses
+
+    def after(self, direction: str, values: Sequence[Any]):
+        """
+        Rows past `values` in direction, OR expanded so mixed asc/desc keys work:
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        """
+        alternatives = []
+        for i, (key, column) in enumerate(zip(self.keys, self.columns)):
+            descending = key.descending != (direction == BACKWARD)
+            equals = [self.columns[j] == values[j] for j in range(i)]
+            beyond = column < values[i] if descending else column > values[i]
+            alternatives.append(and_(*equals, beyond))
+        return or_(*alternatives)
+
+    def values_of(self, item: Any) -> list[Any]:
+        return [getattr(item, key.name) for key in self.keys]
+
+    def apply(self, query, limit: int, cursor: str | None = None):
+        """Query fetching one page plus one row telling whether more exists."""
+        direction = FORWARD
+        if cursor is not None:
+            direction, raw_values = decode_cursor(cursor, len(self.keys))
+            values = [
+                _restore(value, python_type)
+                for value, python_type in zip(raw_values, self._python_types())
+            ]
+            query = query.where(self.after(direction, values))
+        return query.order_by(*self.order_by(direction)).limit(limit + 1), direction
+
+    def page(
+        self, rows: Sequence[ModelType], limit: int, direction: str, cursor: str | None
+    ) -> KeysetPage[ModelType]:
+        has_more = len(rows) > limit
+        items = list(rows[:limit])
+        if direction == BACKWARD:
+            items.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None
+
+        page: KeysetPage[ModelType] = KeysetPage(items=items)
+        if items and has_next:
+            page.next_cursor = encode_cursor(FORWARD, self.values_of(items[-1]))
+        if items and has_prev:
+            page.prev_cursor = encode_cursor(BACKWARD, self.values_of(items[0]))
+        return page
@@ -1,9 +1,26 @@
-from typing import Any, Generic, Optional, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Hashable,
+    Iterator,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
 from dependency_injector.wiring import Provide
-from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine.row import Row
 from sqlalchemy.ext.asyncio import async_scoped_session
 
+from application.core.base_class.pagination import Keyset, KeysetPage
+from application.core.db.batch_loader import BatchLoader
+from application.core.db.session_scope import session_scope
+from application.core.db.statement_cache import statement_cache
 from application.core.enums.repository import SynchronizeSessionEnum
 
 session: async_scoped_session = Provide["session"]
@@ -11,6 +28,19 @@ session: async_scoped_session = Provide["session"]
 
 ModelType = TypeVar("ModelType")
 
+# bind parameter limit of a postgresql statement
+MAX_BIND_PARAMS = 32767
+
+
+def chunked(values: Sequence[dict], size: int) -> Iterator[Sequence[dict]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def multi_values_chunk_size(values: Sequence[dict], chunk_size: int) -> int:
+    """Rows per multi row VALUES statement, kept under bind parameter limit."""
+    return max(1, min(chunk_size, MAX_BIND_PARAMS // max(len(values[0]), 1)))
+
 
 class BaseRepository:
     pass
@@ -18,29 +48,68 @@ class BaseRepository:
 
 class BaseAlchemyRepository(BaseRepository, Generic[ModelType]):
     model: Type[ModelType]
+    # rows per statement of bulk methods
+    bulk_chunk_size: int = 1000
+    # rows per round trip of stream methods
+    stream_fetch_size: int = 1000
 
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
     async def get_by_id(self, id: int) -> Optional[ModelType]:
+        """Batched with other loads of the same tick, cached for the session."""
         if hasattr(self.model, "id"):
-            query = select(self.model.id == id)  # type: ignore[attr-defined]
-            result = await session.execute(query)
-            return result.scalars().first()
+            return await BatchLoader.of(self.model).load(id)
         return None
 
+    async def get_many_by_ids(self, ids: Sequence[int]) -> list[Optional[ModelType]]:
+        """Models in order of ids, None for missing, by one query."""
+        if hasattr(self.model, "id"):
+            return await BatchLoader.of(self.model).load_many(ids)
+        return [None for _ in ids]
+
+    async def paginate(
+        self,
+        order_by: Sequence[str],
+        limit: int,
+        cursor: str | None = None,
+        query=None,
+    ) -> KeysetPage[ModelType]:
+        """
+        Keyset pagination, `-name` sorts descending, cursor comes from a previous page.
+        query: filtered select of model, all rows by default.
+        """
+        keyset = Keyset(self.model, order_by)
+        if query is None:
+            query = select(self.model)  # type: ignore[arg-type]
+        query, direction = keyset.apply(query, limit=limit, cursor=cursor)
+        result = await session.execute(query)
+        return keyset.page(result.scalars().all(), limit, direction, cursor)
+
+    def statement(self, shape: Hashable, build: Callable[[], Any]) -> Any:
+        """Statement of this model built once per shape, values go as bind parameters."""
+        return statement_cache.get((self.model, shape), build)
+
+    def _condition_query(self, conjunction, where_condition: dict[str, str | int]):
+        keys = tuple(sorted(where_condition))
+        for k in keys:
+            if not hasattr(self.model, k):
+                raise ValueError(f"{self.model} has no {k}")
+
+        def build():
+            conditions = [getattr(self.model, k) == bindparam(f"w_{k}") for k in keys]
+            return select(self.model).where(conjunction(*conditions))  # type: ignore[arg-type]
+
+        query = self.statement((conjunction.__name__, keys), build)
+        return query, {f"w_{k}": v for k, v in where_condition.items()}
+
     async def find_by_or_condition(
         self,
         where_condition: dict[str, str | int],
         is_first: bool = False,
     ) -> Any | list[ModelType] | None:
-        cond_dict = {}
-        for k, v in where_condition.items():
-            if not hasattr(self.model, k):
-                raise ValueError(f"{self.model} has no {k}")
-            cond_dict[getattr(self.model, k)] = v
-        query = select(self.model).where(or_(**cond_dict))  # type: ignore[arg-type]
-        result = await session.execute(query)
+        query, params = self._condition_query(or_, where_condition)
+        result = await session.execute(query, params)
         if is_first:
             return result.scalars().first()
         return result.scalars().all()
@@ -50,37 +119,85 @@ class BaseAlchemyRepository(BaseRepository, Generic[ModelType]):
         where_condition: dict[str, str | int],
         is_first: bool = False,
     ) -> Any | list[ModelType] | None:
-        cond_dict = {}
-        for k, v in where_condition.items():
-            if not hasattr(self.model, k):
-                raise ValueError(f"{self.model} has no {k}")
-            cond_dict[getattr(self.model, k)] = v
-        query = select(self.model).where(and_(**cond_dict))  # type: ignore[arg-type]
-        result = await session.execute(query)
+        query, params = self._condition_query(and_, where_condition)
+        result = await session.execute(query, params)
         if is_first:
             return result.scalars().first()
         return result.scalars().all()
 
+    @session_scope
+    async def stream_by_or_condition(
+        self,
+        where_condition: dict[str, str | int],
+        fetch_size: int | None = None,
+    ) -> AsyncIterator[ModelType]:
+        query, params = self._condition_query(or_, where_condition)
+        async for model in self._stream(query, fetch_size, params):
+            yield model
+
+    @session_scope
+    async def stream_by_and_condition(
+        self,
+        where_condition: dict[str, str | int],
+        fetch_size: int | None = None,
+    ) -> AsyncIterator[ModelType]:
+        query, params = self._condition_query(and_, where_condition)
+        async for model in self._stream(query, fetch_size, params):
+            yield model
+
+    async def _stream(
+        self, query, fetch_size: int | None = None, params: dict | None = None
+    ) -> AsyncIterator[ModelType]:
+        """
+        Rows by server side cursor, fetch_size rows per round trip, in constant memory.
+        Connection is held until iteration ends, run within a session scope.
+        """
+        query = query.execution_options(yield_per=fetch_size or self.stream_fetch_size)
+        result = await session.stream(query, params)
+        try:
+            async for model in result.scalars():
+                yield model
+        finally:
+            await result.close()
+
     async def update_by_id(
         self,
         id: int,
         params: dict,
         synchronize_session: SynchronizeSessionEnum = SynchronizeSessionEnum.FALSE,
     ) -> None:
-        if hasattr(self.model, "id"):
+        if not hasattr(self.model, "id"):
+            raise ValueError(f"{self.model} HAS NO ID")
+        if synchronize_session != SynchronizeSessionEnum.FALSE:
+            # session synchronization evaluates the SET clause, values must be literal
             query = (
                 update(self.model)  # type: ignore[arg-type]
                 .where(self.model.id == id)  # type: ignore[attr-defined]
                 .values(**params)
-                .execution_options(synchronize_session=synchronize_session)
+                .execution_options(synchronize_session=synchronize_session.value)
             )
             await session.execute(query)
         else:
-            raise ValueError(f"{self.model} HAS NO ID")
+            keys = tuple(sorted(params))
+            # bind names must differ from column names in SET clause
+            query = self.statement(
+                ("update_by_id", keys),
+                lambda: (
+                    update(self.model)  # type: ignore[arg-type]
+                    .where(self.model.id == bindparam("b_id"))  # type: ignore[attr-defined]
+                    .values({k: bindparam(f"b_{k}") for k in keys})
+                    .execution_options(synchronize_session=False)
+                ),
+            )
+            await session.execute(
+                query, {"b_id": id, **{f"b_{k}": v for k, v in params.items()}}
+            )
+        BatchLoader.of(self.model).forget(id)
 
-    @staticmethod
-    async def delete(model: ModelType) -> None:
+    async def delete(self, model: ModelType) -> None:
         await session.delete(model)  # type: ignore[arg-type]
+        if (id := getattr(model, "id", None)) is not None:
+            BatchLoader.of(self.model).forget(id)
 
     async def delete_by_id(
         self,
@@ -91,12 +208,118 @@ class BaseAlchemyRepository(BaseRepository, Generic[ModelType]):
             query = (
                 delete(self.model)  # type: ignore[arg-type]
                 .where(self.model.id == id)  # type: ignore[attr-defined]
-                .execution_options(synchronize_session=synchronize_session)
+                .execution_options(synchronize_session=synchronize_session.value)
             )
             await session.execute(query)
+            BatchLoader.of(self.model).forget(id)
         else:
             raise ValueError(f"{self.model} HAS NO ID")
 
     @staticmethod
     def save(model: ModelType) -> None:
         session.add(model)  # type: ignore[func-returns-value]
+
+    def _returning_columns(self, returning: Sequence[str]) -> list:
+        columns = self.model.__table__.c  # type: ignore[attr-defined]
+        for name in returning:
+            if name not in columns:
+                raise ValueError(f"{self.model} has no {name}")
+        return [columns[name] for name in returning]
+
+    async def bulk_insert(
+        self,
+        values: Sequence[dict],
+        chunk_size: int | None = None,
+        returning: Sequence[str] = (),
+    ) -> list[Row]:
+        """
+        Insert rows, one round trip per chunk.
+        Without returning rows go by executemany, with returning by multi row VALUES.
+        """
+        if not values:
+            return []
+        chunk_size = chunk_size or self.bulk_chunk_size
+        if not returning:
+            for chunk in chunked(values, chunk_size):
+                await session.execute(insert(self.model), chunk)  # type: ignore[arg-type]
+            return []
+
+        columns = self._returning_columns(returning)
+        rows: list[Row] = []
+        for chunk in chunked(values, multi_values_chunk_size(values, chunk_size)):
+            query = insert(self.model).values(chunk).returning(*columns)  # type: ignore[arg-type]
+            result = await session.execute(query)
+            rows.extend(result.all())
+        return rows
+
+    async def bulk_upsert(
+        self,
+        values: Sequence[dict],
+        index_elements: Sequence[str],
+        update_fields: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+        returning: Sequence[str] = (),
+    ) -> list[Row]:
+        """
+        INSERT ... ON CONFLICT(index_elements) DO UPDATE, by multi row VALUES per chunk.
+        update_fields: columns overwritten on conflict, every inserted column except
+            index_elements by default, empty means DO NOTHING.
+        """
+        if not values:
+            return []
+        if update_fields is None:
+            update_fields = [key for key in values[0] if key not in index_elements]
+        columns = self._returning_columns(returning)
+        chunk_size = multi_values_chunk_size(values, chunk_size or self.bulk_chunk_size)
+
+        rows: list[Row] = []
+        for chunk in chunked(values, chunk_size):
+            query = pg_insert(self.model).values(chunk)  # type: ignore[arg-type]
+            if update_fields:
+                query = query.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={field: query.excluded[field] for field in update_fields},
+                )
+            else:
+                query = query.on_conflict_do_nothing(index_elements=index_elements)
+            if columns:
+                query = query.returning(*columns)
+            result = await session.execute(query)
+            if columns:
+                rows.extend(result.all())
+        return rows
+
+    async def bulk_update_by_ids(
+        self,
+        values: Sequence[dict],
+        chunk_size: int | None = None,
+    ) -> None:
+        """
+        Update rows by their `id`, executemany per chunk.
+        Every dict carries `id` and the same columns to set.
+        Session's loaded instances are not synchronized.
+        """
+        if not values:
+            return
+        if not hasattr(self.model, "id"):
+            raise ValueError(f"{self.model} HAS NO ID")
+        table = self.model.__table__  # type: ignore[attr-defined]
+        fields = [key for key in values[0] if key != "id"]
+        for field in fields:
+            if field not in table.c:
+                raise ValueError(f"{self.model} has no {field}")
+
+        # bind names must differ from column names in SET clause
+        query = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({field: bindparam(f"b_{field}") for field in fields})
+        )
+        for chunk in chunked(values, chunk_size or self.bulk_chunk_size):
+            await session.execute(
+                query,
+                [{f"b_{key}": value for key, value in row.items()} for row in chunk],
+            )
+        loader = BatchLoader.of(self.model)
+        for row in values:
+            loader.forget(row["id"])
@@ -16,6 +16,51 @@ class Settings(BaseSettings):
     APP_DOMAIN: str
     WRITER_DB_URL: str
     READER_DB_URL: str
+    # Read replicas, comma separated. READER_DB_URL is used when empty
+    READER_DB_URLS: list[str] = []
+    READER_DB_WEIGHTS: list[int] = []
+    # "least_outstanding" or "round_robin"(weighted)
+    DB_READER_BALANCER: str = "least_outstanding"
+    DB_HEALTH_CHECK_INTERVAL: float = 5
+    DB_HEALTH_CHECK_TIMEOUT: float = 2
+    # replicas lagging more are skipped
+    DB_REPLICA_MAX_LAG: float = 10
+    # seconds a client's reads are pinned after it wrote, 0 disables
+    DB_READ_YOUR_WRITES_WINDOW: float = 5
+    # DB connection pool, per engine per worker
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_RECYCLE: int = 3600
+    # asyncpg prepared statement cache size per connection, None keeps driver default
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None
+    # statements slower than this many seconds are logged
+    DB_SLOW_QUERY_THRESHOLD: float = 0.5
+    # Request log sink, batches written every LOG_SINK_BATCH_SIZE records or LOG_SINK_FLUSH_INTERVAL seconds
+    LOG_SINK_MAX_SIZE: int = 10000
+    LOG_SINK_BATCH_SIZE: int = 500
+    LOG_SINK_FLUSH_INTERVAL: float = 1.0
+    # when queue is full, "drop", "sample" or "block"
+    LOG_SINK_OVERFLOW: str = "drop"
+    LOG_SINK_SAMPLE_RATE: float = 0.1
+    # batches failing or slower than LOG_SINK_WRITE_TIMEOUT go to local spool, replayed when database recovers
+    LOG_SINK_WRITE_TIMEOUT: float = 5.0
+    LOG_SINK_RETRY_INTERVAL: float = 30.0
+    # mount a volume here to keep spooled logs across container restarts
+    LOG_SPOOL_DIR: str = "/tmp/request-log-spool"
+    LOG_SPOOL_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    LOG_SPOOL_MAX_BYTES: int = 1024 * 1024 * 1024
+    # "route": routes of LogRoute are logged, "middleware": every request by RequestLogMiddleware
+    REQUEST_LOG_MODE: str = "route"
+    # Request log policy, 5xx always logged, 4xx and others sampled by rate(0 to 1)
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_CLIENT_ERROR_SAMPLE_RATE: float = 1.0
+    # comma separated route paths never logged
+    LOG_SKIP_PATHS: list[str] = ["/health"]
+    # request_response_log monthly partitions created ahead, and kept, this month included
+    LOG_PARTITION_PREMAKE_MONTHS: int = 3
+    LOG_RETENTION_MONTHS: int = 6
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "SHA256"
     SENTRY_SDN: Optional[str] = None
@@ -23,6 +68,19 @@ class Settings(BaseSettings):
     CELERY_BACKEND_URL: str
     REDIS_HOST: str
     REDIS_PORT: int
+
+    # Cache backend, "redis" or "two_tier"(in-process LRU in front of redis)
+    CACHE_BACKEND: str = "redis"
+    CACHE_L1_MAX_ENTRIES: int = 1024
+    CACHE_L1_MAX_BYTES: int = 16 * 1024 * 1024
+    CACHE_L1_TTL: int = 5
+    CACHE_INVALIDATION_CHANNEL: str = "cache-invalidation"
+    CACHE_SCAN_COUNT: int = 1000
+    CACHE_DELETE_BATCH_SIZE: int = 1000
+    # Cache value codec, "orjson" or "msgpack", compression None, "zstd" or "lz4"
+    CACHE_CODEC: str = "orjson"
+    CACHE_COMPRESSION: Optional[str] = None
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
     JWT_EXPIRE_SECONDS: int = 3600
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 60
     REFRESH_TOKEN_EXPIRE_SECONDS: int = 86400
@@ -37,6 +95,23 @@ class Settings(BaseSettings):
     AUTH_CLIENT_SECRET: str
     AUTH_REFRESH_TOKEN_KEY: str
     AUTH_SCOPE: list[str] = Field(..., env="AUTH_SCOPE")
+    # seconds before expiry server access token is refreshed in background
+    AUTH_SERVER_TOKEN_REFRESH_MARGIN: int = 30
+
+    # Verified token cache, 0 max ttl disables cache
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_MAX_TTL: int = 60
+    AUTH_TOKEN_CACHE_NEGATIVE_TTL: int = 10
+    AUTH_TOKEN_CACHE_USE_REDIS: bool = False
+
+    # Auth backend, "external" or "jwks"
+    AUTH_BACKEND: str = "external"
+    AUTH_JWT_ALGORITHMS: list[str] = Field(["RS256"], env="AUTH_JWT_ALGORITHMS")
+    AUTH_JWT_AUDIENCE: Optional[str] = None
+    AUTH_JWKS_MIN_REFRESH_INTERVAL: int = 30
+    AUTH_REVOCATION_SENSITIVE_SCOPES: list[str] = Field(
+        [], env="AUTH_REVOCATION_SENSITIVE_SCOPES"
+    )
 
     # CORS Settings
     ALLOW_ORIGINS: list[str] = Field(..., env="ALLOW_ORIGINS")
@@ -50,6 +125,11 @@ class Settings(BaseSettings):
 
         comma_separated_key = [
             "AUTH_SCOPE",
+            "LOG_SKIP_PATHS",
+            "READER_DB_URLS",
+            "READER_DB_WEIGHTS",
+            "AUTH_JWT_ALGORITHMS",
+            "AUTH_REVOCATION_SENSITIVE_SCOPES",
             "ALLOW_ORIGINS",
             "ALLOW_METHODS",
             "ALLOW_HEADERS",
@@ -57,7 +137,7 @@ class Settings(BaseSettings):
 
         @classmethod
         def parse_env_var(cls, field_name: str, raw_val: str) -> Any:
-            """comma separated string to list"""
+            """comma separated string to list, blank entries(e.g. of an empty value) dropped"""
             if field_name in cls.comma_separated_key:
-                return [scope for scope in raw_val.split(",")]
+                return [scope for scope in raw_val.split(",") if scope.strip()]
             return cls.json_loads(raw_val)
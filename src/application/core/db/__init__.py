@@ -1,9 +1,25 @@
+from .engine import (
+    create_engine,
+    dispose_engines,
+    pool_status,
+    start_replica_health_check,
+)
+from .partition import MonthlyPartitions
+from .replica import ReplicaSet
 from .session_maker import Base
+from .session_scope import session_scope
 from .standalone_session_maker import standalone_session
 from .transactional import Transactional
 
 __all__ = [
     "Base",
+    "create_engine",
+    "dispose_engines",
+    "pool_status",
+    "MonthlyPartitions",
+    "ReplicaSet",
+    "start_replica_health_check",
     "Transactional",
+    "session_scope",
     "standalone_session",
 ]
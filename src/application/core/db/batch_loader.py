@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Hashable, Iterable
+
+from dependency_injector.wiring import Provide
+from sqlalchemy import any_, bindparam, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import async_scoped_session
+
+session: async_scoped_session = Provide["session"]
+
+
+class BatchLoader:
+    """
+    Primary key loads of a model, per session.
+
+    Loads requested in the same event loop tick are sent as one `WHERE id = ANY(:ids)` query.
+    Loaded rows are kept for the session, repeated loads are free.
+    Misses are not kept, a row inserted later in the session is found.
+    Expired instances(after commit) are loaded again.
+
+    Queries run in their own task, loaders of a session share a lock
+    so that only one of them uses the session at a time.
+    """
+
+    def __init__(self, model: type, lock: asyncio.Lock | None = None) -> None:
+        self.model = model
+        column = model.id  # type: ignore[attr-defined]
+        self._query = select(model).where(  # type: ignore[arg-type]
+            column == any_(bindparam("ids", type_=ARRAY(column.type)))
+        )
+        self._lock = lock or asyncio.Lock()
+        self._cache: dict[Hashable, Any] = {}
+        # requested this tick, not sent yet
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        # sent, waiting for result
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        self._fetches: set[asyncio.Task] = set()
+        self.queries = 0
+
+    @classmethod
+    def of(cls, model: type) -> "BatchLoader":
+        """Loader of model bound to current session."""
+        loaders = session.info.setdefault("batch_loaders", {})
+        if (loader := loaders.get(model)) is None:
+            if (lock := session.info.get("batch_loader_lock")) is None:
+                lock = session.info["batch_loader_lock"] = asyncio.Lock()
+            loader = loaders[model] = cls(model, lock)
+        return loader
+
+    def _cached(self, id: Hashable) -> tuple[bool, Any]:
+        if (instance := self._cache.get(id)) is None:
+            return False, None
+        if inspect(instance).expired:
+            del self._cache[id]
+            return False, None
+        return True, instance
+
+    async def load(self, id: Hashable) -> Any:
+        hit, instance = self._cached(id)
+        if hit:
+            return instance
+
+        future = self._pending.get(id) or self._loading.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[id] = loop.create_future()
+        return await asyncio.shield(future)
+
+    async def load_many(self, ids: Iterable[Hashable]) -> list[Any]:
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def forget(self, id: Hashable) -> None:
+        self._cache.pop(id, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._loading.update(pending)
+        task = asyncio.ensure_future(self._fetch(pending))
+        self._fetches.add(task)
+        task.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, pending: dict[Hashable, asyncio.Future]) -> None:
+        self.queries += 1
+        try:
+            async with self._lock:
+                result = await session.execute(self._query, {"ids": list(pending)})
+                found = {instance.id: instance for instance in result.scalars().all()}
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            for id in pending:
+                self._loading.pop(id, None)
+
+        self._cache.update(found)
+        for id, future in pending.items():
+            instance = found.get(id)
+            if not future.done():
+                future.set_result(instance)
@@ -0,0 +1,124 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass(slots=True)
+class CheckoutStats:
+    """Time spent waiting for a pooled connection, in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool measuring checkout latency, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+        # called with each checkout latency, set by instrumentation
+        self.on_checkout: Callable[[float], None] | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checkout_stats.record(elapsed)
+            if self.on_checkout is not None:
+                self.on_checkout(elapsed)
+
+    def recreate(self) -> "TimedQueuePool":
+        # dispose() swaps in a new pool, measurements carry over
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        pool.on_checkout = self.on_checkout
+        return pool
+
+
+def create_engine(
+    url: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_pre_ping: bool = False,
+    pool_recycle: int = 3600,
+    statement_cache_size: int | None = None,
+    role: str = "writer",
+    metrics=None,
+    **kwargs,
+) -> AsyncEngine:
+    """
+    Pooled async engine, meant to be created once per worker.
+    statement_cache_size: asyncpg prepared statement cache per connection, asyncpg driver only.
+    metrics: DBMetrics recording the engine's queries and checkouts under role.
+    """
+    db_url = make_url(url)
+    if statement_cache_size is not None and db_url.drivername.endswith("asyncpg"):
+        db_url = db_url.update_query_dict(  # type: ignore[attr-defined]
+            {"prepared_statement_cache_size": str(statement_cache_size)}
+        )
+    engine = create_async_engine(
+        db_url,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        **kwargs,
+    )
+    if metrics is not None:
+        metrics.instrument(engine, role)
+    return engine
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Pool occupancy and checkout latency of engine."""
+    pool = engine.sync_engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checked_in": pool.checkedin(),
+    }
+    if (stats := getattr(pool, "checkout_stats", None)) is not None:
+        status |= {
+            "checkout_count": stats.count,
+            "checkout_mean": stats.mean,
+            "checkout_max": stats.max,
+        }
+    return status
+
+
+@inject
+async def start_replica_health_check(replica_set=Provide["replica_set"]) -> None:
+    replica_set.start()
+
+
+@inject
+async def dispose_engines(
+    writer_engine: AsyncEngine = Provide["writer_engine"],
+    replica_set=Provide["replica_set"],
+) -> None:
+    """Stop replica health check and close pooled connections on shutdown."""
+    await replica_set.close()
+    await writer_engine.dispose()
@@ -0,0 +1,202 @@
+import bisect
+import logging
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .engine import TimedQueuePool, pool_status
+
+logger = logging.getLogger(__name__)
+
+# seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Cumulative bucket histogram, as exported by prometheus."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # last slot counts values above every bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((f"{bound}", total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+@dataclass(slots=True)
+class RequestDBStats:
+    """Database time spent by one request, in seconds."""
+
+    queries: int = 0
+    query_time: float = 0.0
+    checkouts: int = 0
+    checkout_wait: float = 0.0
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries", '
+            f'db-pool;dur={self.checkout_wait * 1000:.1f};desc="{self.checkouts} checkouts"'
+        )
+
+
+request_db_stats_context: ContextVar[RequestDBStats | None] = ContextVar(
+    "request_db_stats_context", default=None
+)
+
+
+def get_request_db_stats() -> RequestDBStats | None:
+    return request_db_stats_context.get()
+
+
+def set_request_db_stats(stats: RequestDBStats) -> Token:
+    return request_db_stats_context.set(stats)
+
+
+def reset_request_db_stats(context: Token) -> None:
+    request_db_stats_context.reset(context)
+
+
+@dataclass(slots=True)
+class RoleMetrics:
+    query_latency: Histogram = field(default_factory=Histogram)
+    checkout_wait: Histogram = field(default_factory=Histogram)
+    slow_queries: int = 0
+
+
+class DBMetrics:
+    """
+    Statement latency, pool checkout wait and slow queries of instrumented engines, by role(writer, reader).
+    Statements slower than slow_query_threshold seconds are logged.
+    """
+
+    def __init__(self, slow_query_threshold: float = 0.5) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.roles: dict[str, RoleMetrics] = {}
+        self.engines: list[tuple[str, AsyncEngine]] = []
+
+    def instrument(self, engine: AsyncEngine, role: str) -> None:
+        metrics = self.roles.setdefault(role, RoleMetrics())
+        self.engines.append((role, engine))
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(
+            sync_engine,
+            "after_cursor_execute",
+            partial(self._after_execute, role, metrics),
+        )
+        event.listen(sync_engine, "handle_error", self._on_error)
+        if isinstance(sync_engine.pool, TimedQueuePool):
+            sync_engine.pool.on_checkout = partial(self._on_checkout, metrics)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @staticmethod
+    def _on_error(exception_context) -> None:
+        # failed statement gets no after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and (started := connection.info.get("query_started")):
+            started.pop()
+
+    def _after_execute(
+        self,
+        role: str,
+        metrics: RoleMetrics,
+        conn,
+        cursor,
+        statement,
+        parameters,
+        context,
+        executemany,
+    ):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        metrics.query_latency.observe(elapsed)
+        if (stats := get_request_db_stats()) is not None:
+            stats.queries += 1
+            stats.query_time += elapsed
+        if elapsed >= self.slow_query_threshold:
+            metrics.slow_queries += 1
+            logger.warning(f"slow query {elapsed:.3f}s on {role}: {statement[:1000]}")
+
+    @staticmethod
+    def _on_checkout(metrics: RoleMetrics, elapsed: float) -> None:
+        metrics.checkout_wait.observe(elapsed)
+        if (stats := get_request_db_stats()) is not None:
+            stats.checkouts += 1
+            stats.checkout_wait += elapsed
+
+    def render(self) -> str:
+        """Prometheus text exposition."""
+        lines = []
+        # engines told apart by position within role, urls are not exposed
+        positions: dict[str, int] = {}
+        statuses = []
+        for role, engine in self.engines:
+            position = positions[role] = positions.get(role, -1) + 1
+            statuses.append((role, position, pool_status(engine)))
+        pool_gauges = {
+            "size": "db_pool_size",
+            "checked_out": "db_pool_checked_out",
+            "overflow": "db_pool_overflow",
+            "checked_in": "db_pool_checked_in",
+        }
+        for key, name in pool_gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            for role, position, status in statuses:
+                labels = f'role="{role}",engine="{position}"'
+                lines.append(f"{name}{{{labels}}} {status[key]}")
+
+        for name, attribute in (
+            ("db_query_duration_seconds", "query_latency"),
+            ("db_pool_checkout_wait_seconds", "checkout_wait"),
+        ):
+            lines.append(f"# TYPE {name} histogram")
+            for role, metrics in self.roles.items():
+                histogram: Histogram = getattr(metrics, attribute)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{role="{role}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{role="{role}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{role="{role}"}} {histogram.count}')
+
+        lines.append("# TYPE db_slow_queries_total counter")
+        for role, metrics in self.roles.items():
+            lines.append(
+                f'db_slow_queries_total{{role="{role}"}} {metrics.slow_queries}'
+            )
+        return "\n".join(lines) + "\n"
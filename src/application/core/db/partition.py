@@ -0,0 +1,154 @@
+import datetime
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+LIST_PARTITIONS_QUERY = text(
+    "SELECT child.relname FROM pg_inherits"
+    " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+    " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+    " WHERE parent.relname = :table"
+)
+
+
+def month_floor(value: datetime.date) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+class MonthlyPartitions:
+    """
+    Monthly partitions of a table declared `PARTITION BY RANGE (timestamp column)`.
+
+    Partition of month 2024-01 is `{table}_p2024_01` holding [2024-01-01, 2024-02-01).
+    Rows out of every partition land in `{table}_default`, create months ahead of time to keep it empty.
+    A month already having rows in default gets its partition with those rows moved into it.
+    Retention drops whole partitions instead of deleting rows.
+    DDL goes to writer engine directly, not through routing session.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, table: str, column: str = "created_at"
+    ) -> None:
+        self.engine = engine
+        self.table = table
+        self.column = column
+        self.default = f"{table}_default"
+        self._pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})_(\d{{2}})$")
+
+    def name(self, month: datetime.date) -> str:
+        return f"{self.table}_p{month:%Y_%m}"
+
+    @staticmethod
+    def bounds(month: datetime.date) -> str:
+        return (
+            f"FOR VALUES FROM ('{month.isoformat()}')"
+            f" TO ('{add_months(month, 1).isoformat()}')"
+        )
+
+    def create_statement(self, month: datetime.date) -> str:
+        month = month_floor(month)
+        return (
+            f'CREATE TABLE IF NOT EXISTS "{self.name(month)}" PARTITION OF "{self.table}"'
+            f" {self.bounds(month)}"
+        )
+
+    async def months(self) -> list[datetime.date]:
+        """Months having a partition, oldest first."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(LIST_PARTITIONS_QUERY, {"table": self.table})
+            names = result.scalars().all()
+        months = []
+        for name in names:
+            if match := self._pattern.match(name):
+                months.append(datetime.date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def premake(
+        self, months_ahead: int, today: datetime.date | None = None
+    ) -> list[str]:
+        """Partitions of this month and months_ahead following months, created when missing."""
+        this_month = month_floor(today or datetime.datetime.utcnow().date())
+        existing = set(await self.months())
+        created = []
+        # one transaction per month, a failing month does not hold back the others
+        for i in range(months_ahead + 1):
+            month = add_months(this_month, i)
+            if month in existing:
+                continue
+            try:
+                await self._create(month)
+            except Exception as e:
+                logger.error(f"partition {self.name(month)} not created: {e!r}")
+                continue
+            created.append(self.name(month))
+        if created:
+            logger.info(f"created partitions {created}")
+        return created
+
+    async def _create(self, month: datetime.date) -> None:
+        """
+        Creating a partition fails while default holds rows of its month,
+        the partition is then filled from default and attached in one transaction.
+        """
+        name = self.name(month)
+        within_month = (
+            f"\"{self.column}\" >= '{month.isoformat()}'"
+            f" AND \"{self.column}\" < '{add_months(month, 1).isoformat()}'"
+        )
+        async with self.engine.begin() as conn:
+            has_default = await conn.scalar(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": self.default}
+            )
+            rows_in_default = has_default and await conn.scalar(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM "{self.default}" WHERE {within_month})'
+                )
+            )
+            if not rows_in_default:
+                await conn.execute(text(self.create_statement(month)))
+                return
+            await conn.execute(
+                text(
+                    f'CREATE TABLE "{name}"'
+                    f' (LIKE "{self.table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+                )
+            )
+            result = await conn.execute(
+                text(
+                    f'WITH moved AS (DELETE FROM "{self.default}" WHERE {within_month} RETURNING *)'
+                    f' INSERT INTO "{name}" SELECT * FROM moved'
+                )
+            )
+            await conn.execute(
+                text(
+                    f'ALTER TABLE "{self.table}" ATTACH PARTITION "{name}" {self.bounds(month)}'
+                )
+            )
+        logger.warning(f"moved {result.rowcount} rows of {name} out of {self.default}")
+
+    async def drop_older_than(
+        self, retention_months: int, today: datetime.date | None = None
+    ) -> list[str]:
+        """Partitions ending before retention_months ago dropped, this month counts as one."""
+        if retention_months < 1:
+            raise ValueError("retention_months must be at least 1")
+        this_month = month_floor(today or datetime.datetime.utcnow().date())
+        cutoff = add_months(this_month, -retention_months + 1)
+        expired = [month for month in await self.months() if month < cutoff]
+        dropped = []
+        async with self.engine.begin() as conn:
+            for month in expired:
+                await conn.execute(text(f'DROP TABLE IF EXISTS "{self.name(month)}"'))
+                dropped.append(self.name(month))
+        if dropped:
+            logger.info(f"dropped partitions {dropped}")
+        return dropped
@@ -0,0 +1,70 @@
+import hashlib
+import hmac
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class WriteState:
+    """
+    Last write seen by a client, carried across requests by a signed token.
+    Reads within `window` seconds after it go to the writer or a replica known to have caught up.
+    """
+
+    window: float
+    last_write_at: float | None = None
+    # written during current request
+    wrote: bool = False
+
+    def mark_write(self) -> None:
+        self.last_write_at = time.time()
+        self.wrote = True
+
+    def pinned_to(self) -> float | None:
+        """Last write time while reads are pinned, None otherwise."""
+        if self.last_write_at is None:
+            return None
+        if time.time() - self.last_write_at >= self.window:
+            return None
+        return self.last_write_at
+
+
+write_state_context: ContextVar[WriteState | None] = ContextVar(
+    "write_state_context", default=None
+)
+
+
+def get_write_state() -> WriteState | None:
+    return write_state_context.get()
+
+
+def set_write_state(state: WriteState) -> Token:
+    return write_state_context.set(state)
+
+
+def reset_write_state(context: Token) -> None:
+    write_state_context.reset(context)
+
+
+def _signature(secret_key: str, value: str) -> str:
+    return hmac.new(secret_key.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def sign_write_token(secret_key: str, last_write_at: float) -> str:
+    value = f"{last_write_at:.3f}"
+    return f"{value}.{_signature(secret_key, value)}"
+
+
+def verify_write_token(secret_key: str, token: str) -> float | None:
+    """Write time carried by token, None if token is malformed, forged or from the future."""
+    value, _, signature = token.rpartition(".")
+    if not value or not hmac.compare_digest(signature, _signature(secret_key, value)):
+        return None
+    try:
+        last_write_at = float(value)
+    except ValueError:
+        return None
+    if last_write_at > time.time() + 1:
+        return None
+    return last_write_at
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .engine import create_engine
+
+logger = logging.getLogger(__name__)
+
+# caught up replica reports 0 even when primary had no recent transaction
+REPLICATION_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+@dataclass(slots=True, eq=False)
+class Replica:
+    engine: AsyncEngine
+    weight: int = 1
+    healthy: bool = True
+    # replication lag in seconds as of last health check, None until measured
+    lag: float | None = None
+    # wall clock time up to which writes were replayed, as of last health check
+    replayed_until: float | None = None
+    # smooth weighted round robin state
+    current_weight: int = 0
+
+    @property
+    def outstanding(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+
+class ReplicaSet:
+    """
+    Read replicas balanced by least outstanding connections or weighted round robin.
+
+    A background health check ejects replicas failing `SELECT 1` and readmits them once they answer,
+    and measures replication lag. Replicas lagging more than max_lag are skipped.
+    Writer serves reads while no replica is usable.
+
+    `written_at`: time of the client's last write, reads then only go to replicas
+    which had replayed past it at their last health check.
+    """
+
+    BALANCERS = ("least_outstanding", "round_robin")
+
+    def __init__(
+        self,
+        writer: AsyncEngine,
+        readers: list[AsyncEngine],
+        weights: list[int] | None = None,
+        balancer: str = "least_outstanding",
+        health_check_interval: float = 5,
+        health_check_timeout: float = 2,
+        max_lag: float = 10,
+    ) -> None:
+        if balancer not in self.BALANCERS:
+            raise ValueError(f"unknown replica balancer: {balancer}")
+        weights = list(weights or [])
+        if len(weights) > len(readers):
+            raise ValueError(
+                f"{len(weights)} replica weights for {len(readers)} replicas"
+            )
+        weights += [1] * (len(readers) - len(weights))
+        self.writer = writer
+        self.replicas = [
+            Replica(engine=engine, weight=max(weight, 1))
+            for engine, weight in zip(readers, weights)
+        ]
+        self._by_engine = {id(replica.engine): replica for replica in self.replicas}
+        self.balancer = balancer
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.max_lag = max_lag
+        self._health_check: asyncio.Task | None = None
+
+    @classmethod
+    def from_urls(
+        cls,
+        writer: AsyncEngine,
+        urls: list[str],
+        fallback_url: str,
+        weights: list[int] | None = None,
+        balancer: str = "least_outstanding",
+        health_check_interval: float = 5,
+        health_check_timeout: float = 2,
+        max_lag: float = 10,
+        **engine_kwargs,
+    ) -> "ReplicaSet":
+        """Replica per url, fallback_url used when urls is empty."""
+        urls = [url for url in urls if url] or [fallback_url]
+        readers = [create_engine(url, **engine_kwargs) for url in urls]
+        return cls(
+            writer=writer,
+            readers=readers,
+            weights=weights,
+            balancer=balancer,
+            health_check_interval=health_check_interval,
+            health_check_timeout=health_check_timeout,
+            max_lag=max_lag,
+        )
+
+    @property
+    def healthy(self) -> list[Replica]:
+        return [replica for replica in self.replicas if replica.healthy]
+
+    def candidates(self, written_at: float | None = None) -> list[Replica]:
+        candidates = [
+            replica
+            for replica in self.replicas
+            if replica.healthy and (replica.lag is None or replica.lag <= self.max_lag)
+        ]
+        if written_at is not None:
+            candidates = [
+                replica
+                for replica in candidates
+                if replica.replayed_until is not None
+                and replica.replayed_until >= written_at
+            ]
+        return candidates
+
+    def is_available(
+        self, engine: AsyncEngine, written_at: float | None = None
+    ) -> bool:
+        """Engine is still a valid choice, writer only while no replica is usable."""
+        candidates = self.candidates(written_at)
+        if engine is self.writer:
+            return not candidates
+        replica = self._by_engine.get(id(engine))
+        return replica is not None and replica in candidates
+
+    def choose(self, written_at: float | None = None) -> AsyncEngine:
+        candidates = self.candidates(written_at)
+        if not candidates:
+            return self.writer
+        if len(candidates) == 1:
+            return candidates[0].engine
+        if self.balancer == "round_robin":
+            return self._round_robin(candidates).engine
+        return min(
+            candidates, key=lambda replica: replica.outstanding / replica.weight
+        ).engine
+
+    @staticmethod
+    def _round_robin(candidates: list[Replica]) -> Replica:
+        """Smooth weighted round robin, picks are spread instead of bursting per replica."""
+        total = 0
+        chosen = candidates[0]
+        for replica in candidates:
+            replica.current_weight += replica.weight
+            total += replica.weight
+            if replica.current_weight > chosen.current_weight:
+                chosen = replica
+        chosen.current_weight -= total
+        return chosen
+
+    async def check(self) -> None:
+        """One health check round over every replica."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            started = time.time()
+            lag = await asyncio.wait_for(
+                self._ping(replica.engine), self.health_check_timeout
+            )
+            replica.lag = lag
+            replica.replayed_until = started - lag
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"ReplicaSet ejected {replica.engine.url!r}: {e!r}")
+            replica.healthy = False
+            return
+        if not replica.healthy:
+            logger.info(f"ReplicaSet readmitted {replica.engine.url!r}")
+        replica.healthy = True
+
+    @staticmethod
+    async def _ping(engine: AsyncEngine) -> float:
+        """Replication lag in seconds, 0 for a primary or non postgresql database."""
+        async with engine.connect() as connection:
+            if engine.dialect.name != "postgresql":
+                await connection.execute(text("SELECT 1"))
+                return 0.0
+            result = await connection.execute(REPLICATION_LAG_QUERY)
+            return float(result.scalar() or 0.0)
+
+    async def _run_health_check(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check()
+
+    def start(self) -> None:
+        if self._health_check is None or self._health_check.done():
+            self._health_check = asyncio.ensure_future(self._run_health_check())
+
+    async def close(self) -> None:
+        if self._health_check is not None:
+            self._health_check.cancel()
+            self._health_check = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
@@ -5,6 +5,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
+from .read_your_writes import get_write_state
+
 session_context: ContextVar[str] = ContextVar("session_context")
 
 
@@ -12,6 +14,10 @@ def get_session_context() -> str:
     return session_context.get()
 
 
+def has_session_context() -> bool:
+    return session_context.get(None) is not None
+
+
 def set_session_context(session_id: str) -> Token:
     return session_context.set(session_id)
 
@@ -27,13 +33,20 @@ class RoutingSession(Session):
         mapper=None,
         clause=None,
         writer_engine=Provide["writer_engine"],
-        reader_engine=Provide["reader_engine"],
+        replica_set=Provide["replica_set"],
         **kw,
     ):
+        write_state = get_write_state()
         if self._flushing or isinstance(clause, (Update, Delete, Insert)):  # type: ignore[attr-defined]
+            if write_state is not None:
+                write_state.mark_write()
             return writer_engine.sync_engine
-        else:
-            return reader_engine.sync_engine
+        # reads of one session stay on one replica while it is usable
+        written_at = write_state.pinned_to() if write_state is not None else None
+        reader = self.info.get("reader")
+        if reader is None or not replica_set.is_available(reader, written_at):
+            reader = self.info["reader"] = replica_set.choose(written_at)
+        return reader.sync_engine
 
 
 Base = declarative_base()
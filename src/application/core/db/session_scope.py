@@ -0,0 +1,35 @@
+import inspect
+from contextlib import aclosing
+from functools import wraps
+
+from .session_maker import has_session_context
+from .standalone_session_maker import standalone_session
+
+
+def session_scope(func):
+    """
+    Unit of work, join the session of surrounding scope,
+    request scope of SQLAlchemyMiddleware or standalone_session. Commit is left to scope owner.
+    Called outside any scope, e.g. background work, runs as standalone_session.
+    Async generators, e.g. streams, are scoped the same way.
+    """
+    standalone = standalone_session(func)
+
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def _stream_scope(*args, **kwargs):
+            scoped = func if has_session_context() else standalone
+            async with aclosing(scoped(*args, **kwargs)) as stream:
+                async for item in stream:
+                    yield item
+
+        return _stream_scope
+
+    @wraps(func)
+    async def _session_scope(*args, **kwargs):
+        if has_session_context():
+            return await func(*args, **kwargs)
+        return await standalone(*args, **kwargs)
+
+    return _session_scope
@@ -1,3 +1,4 @@
+import inspect
 from uuid import uuid4
 
 from dependency_injector.wiring import Provide
@@ -9,6 +10,9 @@ session: async_scoped_session = Provide["session"]
 
 
 def standalone_session(func):
+    if inspect.isasyncgenfunction(func):
+        return standalone_stream(func)
+
     async def _standalone_session(*args, **kwargs):
         session_id = str(uuid4())
         context = set_session_context(session_id=session_id)
@@ -25,3 +29,38 @@ def standalone_session(func):
         return result
 
     return _standalone_session
+
+
+def standalone_stream(func):
+    """
+    standalone_session of an async generator. Scope is entered around each step only,
+    code consuming the stream between steps is not joined to its session.
+    """
+
+    async def _standalone_stream(*args, **kwargs):
+        session_id = str(uuid4())
+        stream = func(*args, **kwargs)
+
+        async def within_scope(call):
+            context = set_session_context(session_id=session_id)
+            try:
+                return await call()
+            finally:
+                reset_session_context(context=context)
+
+        try:
+            while True:
+                try:
+                    item = await within_scope(stream.__anext__)
+                except StopAsyncIteration:
+                    break
+                yield item
+            await within_scope(session.commit)
+        except Exception as e:
+            await within_scope(session.rollback)
+            raise e
+        finally:
+            await within_scope(stream.aclose)
+            await within_scope(session.remove)
+
+    return _standalone_stream
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+StatementType = TypeVar("StatementType")
+
+
+class StatementCache:
+    """
+    Parameterised statements by key, usually (model, shape of conditions).
+
+    Values go as bind parameters at execution, so a statement is built once per shape
+    and its SQL text stays the same, hitting SQLAlchemy's compiled cache
+    and asyncpg's prepared statement cache. LRU bounded by max_size shapes.
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        self.max_size = max_size
+        self._statements: OrderedDict[Hashable, object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(self, key: Hashable, build: Callable[[], StatementType]) -> StatementType:
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            return statement  # type: ignore[return-value]
+
+        self.misses += 1
+        statement = self._statements[key] = build()
+        if len(self._statements) > self.max_size:
+            self._statements.popitem(last=False)
+        return statement
+
+    def stats(self) -> dict:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+statement_cache = StatementCache()
@@ -8,6 +8,7 @@ from .http import (
     BadRequestException,
     DuplicateValueException,
     ForbiddenException,
+    InvalidCursorException,
     NotFoundException,
     UnauthorizedException,
     UnprocessableEntity,
@@ -16,6 +17,7 @@ from .http import (
 __all__ = [
     "CustomException",
     "BadRequestException",
+    "InvalidCursorException",
     "NotFoundException",
     "ForbiddenException",
     "UnprocessableEntity",
@@ -1,5 +1,7 @@
 from http import HTTPStatus
 
+from application.core.enums import ResponseCode
+
 from .base import HttpException
 
 
@@ -25,3 +27,8 @@ class UnprocessableEntity(HttpException):
 
 class DuplicateValueException(HttpException):
     http_code = HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+class InvalidCursorException(BadRequestException):
+    error_code = ResponseCode.INVALID_REQUEST_PARAM
+    message = "invalid cursor"
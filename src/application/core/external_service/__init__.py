@@ -1,5 +1,7 @@
 from .auth_client import AuthClient
+from .token_cache import VerifiedTokenCache
 
 __all__ = [
     "AuthClient",
+    "VerifiedTokenCache",
 ]
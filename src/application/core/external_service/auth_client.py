@@ -1,12 +1,18 @@
+import asyncio
 import base64
 import logging
+import time
 from typing import Literal
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
+from dependency_injector.wiring import Provide, inject
 
 from application.core.enums import ResponseCode
+from application.core.exceptions import ExternalServiceException
 from application.core.exceptions.token import TokenDecodeException, TokenExpireException
 from application.core.external_service.http_client import BaseHttpClient
+from application.core.external_service.token_cache import VerifiedTokenCache
+from application.core.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -31,16 +37,32 @@ class AuthClient(BaseHttpClient):
         session: ClientSession,
         ssl: bool = True,
         scope: list[str] | None = None,
+        token_cache: VerifiedTokenCache | None = None,
+        server_token_refresh_margin: int = 30,
     ) -> None:
         self._client_id = client_id
         self._client_secret = client_secret
         self._refresh_token_key = refresh_token_key
         self.session = session
         self.ssl = ssl
+        self.token_cache = token_cache
+        # concurrent identical calls share one request
+        self._verify_flight = SingleFlight()
+        self._refresh_flight = SingleFlight()
+        self._revoke_flight = SingleFlight()
+        # client credentials token, refreshed ahead of expiry
+        self.server_token_refresh_margin = server_token_refresh_margin
+        self._server_token: str | None = None
+        self._server_token_expires_at = 0.0
+        self._server_token_refresh_at = 0.0
+        self._server_token_flight = SingleFlight()
+        self._server_token_timer: asyncio.TimerHandle | None = None
+        self._background_tasks: set[asyncio.Task] = set()
         self._token_issue_url = auth_base_url + "/oauth2/token"
         self._token_verify_url = auth_base_url + "/oauth2/verify"
         self._token_refresh_url = auth_base_url + "/oauth2/token"
         self._token_revoke_url = auth_base_url + "/oauth2/revoke"
+        self._jwks_url = auth_base_url + "/.well-known/jwks.json"
         if scope is not None:
             self.scope = ",".join(scope)
         else:
@@ -54,6 +76,21 @@ class AuthClient(BaseHttpClient):
         }
 
     async def get_server_access_token(self) -> str:
+        """
+        Cached client credentials token.
+        Token is refreshed in background at refresh_at, even without calls,
+        still valid one is returned meanwhile.
+        """
+        now = time.monotonic()
+        if self._server_token is not None and now < self._server_token_expires_at:
+            if now >= self._server_token_refresh_at:
+                self._refresh_server_access_token_in_background()
+            return self._server_token
+        return await self._server_token_flight.do(
+            "server_token", self._issue_server_access_token
+        )
+
+    async def _issue_server_access_token(self) -> str:
         q_params = {"grant_type": "client_credentials", "scope": self.scope}
         resp = await self._post(
             self._token_issue_url,
@@ -61,7 +98,57 @@ class AuthClient(BaseHttpClient):
             headers={**self.get_basic_header(), **self.form_url_content_type},
         )
         resp_json = await resp.json()
-        return resp_json.get("access_token", None)
+        access_token = resp_json.get("access_token", None)
+        expires_in = resp_json.get("expires_in") or 0
+
+        issued_at = time.monotonic()
+        self._server_token = access_token
+        # keep a small skew for request in flight
+        self._server_token_expires_at = issued_at + expires_in - min(5, expires_in)
+        self._server_token_refresh_at = issued_at + max(
+            expires_in - self.server_token_refresh_margin, expires_in / 2
+        )
+        if access_token is not None:
+            self._schedule_server_token_refresh(
+                self._server_token_refresh_at - issued_at
+            )
+        return access_token
+
+    def _schedule_server_token_refresh(self, delay: float) -> None:
+        if self._server_token_timer is not None:
+            self._server_token_timer.cancel()
+        self._server_token_timer = asyncio.get_running_loop().call_later(
+            delay, self._refresh_server_access_token_in_background
+        )
+
+    def _refresh_server_access_token_in_background(self) -> None:
+        if len(self._server_token_flight):
+            return
+        task = asyncio.ensure_future(self._refresh_server_access_token())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _refresh_server_access_token(self) -> None:
+        try:
+            await self._server_token_flight.do(
+                "server_token", self._issue_server_access_token
+            )
+        except (ExternalServiceException, ClientError, asyncio.TimeoutError) as e:
+            # cached token is used until expiry, next call after that retries in foreground
+            logger.warning(f"Server access token refresh failed: {e}")
+            self._server_token_refresh_at = time.monotonic() + 1
+            if self._server_token_refresh_at < self._server_token_expires_at:
+                self._schedule_server_token_refresh(1)
+
+    async def close(self) -> None:
+        """Stop background refresh, call before http session is closed."""
+        if self._server_token_timer is not None:
+            self._server_token_timer.cancel()
+            self._server_token_timer = None
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def get_bearer_header(self) -> dict:
         atk = await self.get_server_access_token()
@@ -73,10 +160,31 @@ class AuthClient(BaseHttpClient):
     def get_header_cookie(self, key: str, value: str) -> dict:
         return {"Cookie": f"{key}={value}"}
 
+    async def get_jwks(self) -> dict:
+        resp = await self._get(self._jwks_url, ssl=self.ssl)
+        return await resp.json()
+
+    def single_flight_stats(self) -> dict:
+        return {
+            "verify": self._verify_flight.stats(),
+            "refresh": self._refresh_flight.stats(),
+            "revoke": self._revoke_flight.stats(),
+            "server_token": self._server_token_flight.stats(),
+        }
+
     async def is_token_valid(
         self,
         token: str,
         token_type: Literal["access_token", "refresh_token"] = "access_token",
+    ) -> bool:
+        return await self._verify_flight.do(
+            (token, token_type), self._is_token_valid, token, token_type
+        )
+
+    async def _is_token_valid(
+        self,
+        token: str,
+        token_type: Literal["access_token", "refresh_token"],
     ) -> bool:
         resp = await self._post(
             url=self._token_verify_url,
@@ -94,6 +202,11 @@ class AuthClient(BaseHttpClient):
         return False
 
     async def refresh_token(self, refresh_token: str) -> dict:
+        return await self._refresh_flight.do(
+            refresh_token, self._refresh_token, refresh_token
+        )
+
+    async def _refresh_token(self, refresh_token: str) -> dict:
         payload = {
             "grant_type": "refresh_token",
             "refresh_token_key": self._refresh_token_key,
@@ -113,6 +226,13 @@ class AuthClient(BaseHttpClient):
 
     async def revoke_token(
         self, token: str, token_type: Literal["access_token", "refresh_token"]
+    ) -> None:
+        await self._revoke_flight.do(
+            (token, token_type), self._revoke_token, token, token_type
+        )
+
+    async def _revoke_token(
+        self, token: str, token_type: Literal["access_token", "refresh_token"]
     ) -> None:
         payload = {"token": token, "token_type_hint": token_type}
         resp = await self._post(
@@ -120,3 +240,10 @@ class AuthClient(BaseHttpClient):
             data=payload,
             headers={**self.get_basic_header(), **self.form_url_content_type},
         )
+        if self.token_cache is not None:
+            await self.token_cache.invalidate(token)
+
+
+@inject
+async def close_auth_client(auth_client=Provide["auth_client"]) -> None:
+    await auth_client.close()
@@ -94,7 +94,7 @@ class BaseHttpClient:
         headers: dict | None = None,
         ssl: bool = True,
     ) -> ClientResponse:
-        resp = await self.session.post(url, params=q_params, headers=headers, ssl=ssl)
+        resp = await self.session.get(url, params=q_params, headers=headers, ssl=ssl)
         if resp.status == 200:
             return resp
         elif 400 <= resp.status < 500:
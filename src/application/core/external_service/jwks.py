@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+import jwt
+from aiohttp import ClientError
+from dependency_injector.providers import Singleton
+from dependency_injector.wiring import Provide
+
+from application.core.exceptions import ExternalServiceException
+from application.core.external_service.auth_client import AuthClient
+from application.core.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeySet:
+    """
+    Signing keys published by auth server, by `kid`.
+
+    Keys are fetched once and kept. On `kid` miss a refresh runs in background,
+    at most once per min_refresh_interval, and the miss is answered with None
+    so that caller can fall back to remote verification.
+    Auth server being unreachable on first fetch is a miss too.
+    """
+
+    auth_client_provider: Singleton[AuthClient] = Provide["auth_client.provider"]
+
+    def __init__(self, min_refresh_interval: int = 30) -> None:
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, Any] = {}
+        self._fetched_at: float | None = None
+        self._refresh_flight = SingleFlight()
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def refresh(self) -> None:
+        await self._refresh_flight.do("jwks", self._refresh)
+
+    async def _refresh(self) -> None:
+        self._fetched_at = time.monotonic()
+        jwks = await self.auth_client_provider().get_jwks()
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                key = jwt.PyJWK(jwk)
+            except jwt.PyJWTError as e:
+                logger.warning(f"JWKSKeySet skip unusable key: {e}")
+                continue
+            if key.key_id is not None:
+                keys[key.key_id] = key.key
+        self._keys = keys
+
+    def _refresh_in_background(self) -> None:
+        if (
+            self._fetched_at is not None
+            and time.monotonic() - self._fetched_at < self.min_refresh_interval
+        ):
+            return
+        task = asyncio.ensure_future(self._refresh_safely())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _refresh_safely(self) -> None:
+        try:
+            await self.refresh()
+        except (ExternalServiceException, ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"JWKSKeySet refresh failed: {e}")
+
+    async def get_signing_key(self, kid: str | None) -> Any | None:
+        if self._fetched_at is None:
+            # failed first fetch is retried in background like a kid miss
+            await self._refresh_safely()
+        if kid is not None and (key := self._keys.get(kid)) is not None:
+            return key
+        self._refresh_in_background()
+        return None
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+from dependency_injector.providers import Singleton
+from dependency_injector.wiring import Provide
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+
+from application.core.enums import ResponseCode
+
+logger = logging.getLogger(__name__)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Positive and negative cache of auth server verification results.
+
+    Results are stored as `ResponseCode` by token digest, never by raw token.
+    In-process LRU tier is always used, Redis tier is optional.
+    Positive entries live until min(token `exp`, max_ttl), negative entries for negative_ttl.
+    With Redis tier, positive entries are kept in Redis only,
+    a token revoked by one worker is rejected by every worker at once.
+    """
+
+    redis_provider: Singleton[Redis] = Provide["redis.provider"]
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        max_ttl: int = 60,
+        negative_ttl: int = 10,
+        use_redis: bool = False,
+        key_prefix: str = "verified_token",
+    ) -> None:
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.use_redis = use_redis
+        self.key_prefix = key_prefix
+        self._entries: OrderedDict[str, tuple[ResponseCode, float]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_ttl > 0 and self.max_size > 0
+
+    def _redis_key(self, digest: str) -> str:
+        return f"{self.key_prefix}::{digest}"
+
+    def _ttl(self, code: ResponseCode, exp: int | float | None) -> int:
+        if code != ResponseCode.OK:
+            return min(self.negative_ttl, self.max_ttl)
+        if exp is None:
+            return self.max_ttl
+        return min(int(exp - time.time()), self.max_ttl)
+
+    def _get_local(self, digest: str) -> ResponseCode | None:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        code, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return code
+
+    def _set_local(self, digest: str, code: ResponseCode, ttl: int) -> None:
+        if code == ResponseCode.OK and self.use_redis:
+            # revocation is shared through Redis, a local positive entry would outlive it
+            self._entries.pop(digest, None)
+            return
+        self._entries[digest] = (code, time.monotonic() + ttl)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, token: str) -> ResponseCode | None:
+        if not self.enabled:
+            return None
+        digest = token_digest(token)
+        if (code := self._get_local(digest)) is not None:
+            return code
+        if not self.use_redis:
+            return None
+
+        redis = self.redis_provider()
+        key = self._redis_key(digest)
+        pipe = redis.pipeline(transaction=False)
+        try:
+            async with pipe:
+                pipe.get(key)
+                pipe.ttl(key)
+                value, ttl = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"VerifiedTokenCache redis get failed: {e}")
+            return None
+        if value is None or ttl <= 0:
+            return None
+        code = ResponseCode(int(value))  # type: ignore[call-arg]
+        self._set_local(digest, code, min(ttl, self.max_ttl))
+        return code
+
+    async def set(
+        self, token: str, code: ResponseCode, exp: int | float | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+        ttl = self._ttl(code, exp)
+        if ttl <= 0:
+            return
+        digest = token_digest(token)
+        self._set_local(digest, code, ttl)
+        if not self.use_redis:
+            return
+
+        redis = self.redis_provider()
+        try:
+            await redis.set(name=self._redis_key(digest), value=int(code), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"VerifiedTokenCache redis set failed: {e}")
+
+    async def invalidate(self, token: str) -> None:
+        """
+        Replace any cached result with a revoked entry,
+        so that other workers sharing the Redis tier stop accepting the token too.
+        Without Redis tier, other workers accept the token until their entry expires(max_ttl).
+        """
+        if not self.enabled:
+            return
+        await self.set(token, ResponseCode.TOKEN_REVOKED)
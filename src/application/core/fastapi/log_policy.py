@@ -0,0 +1,43 @@
+import random
+from dataclasses import dataclass, field
+from typing import Iterable
+
+
+@dataclass(slots=True, frozen=True)
+class LogPolicy:
+    """
+    Which requests are logged.
+
+    5xx are always logged, 4xx by client_error_sample_rate, others by sample_rate(0 to 1).
+    Paths in skip_paths, e.g. load balancer health checks, are never logged.
+    """
+
+    sample_rate: float = 1.0
+    client_error_sample_rate: float = 1.0
+    skip_paths: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_settings(
+        cls,
+        sample_rate: float = 1.0,
+        client_error_sample_rate: float = 1.0,
+        skip_paths: Iterable[str] = (),
+    ) -> "LogPolicy":
+        return cls(
+            sample_rate=sample_rate,
+            client_error_sample_rate=client_error_sample_rate,
+            skip_paths=frozenset(path for path in skip_paths if path),
+        )
+
+    def skips(self, path: str) -> bool:
+        return path in self.skip_paths
+
+    def should_log(self, status_code: int) -> bool:
+        if status_code >= 500:
+            return True
+        rate = self.client_error_sample_rate if status_code >= 400 else self.sample_rate
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+LOG_ALL = LogPolicy()
+LOG_ERRORS = LogPolicy(sample_rate=0, client_error_sample_rate=0)
@@ -1,36 +1,57 @@
 from typing import Callable
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import BackgroundTasks, Request, Response
+from fastapi import Request, Response
 from fastapi.routing import APIRoute
 
+from application.core.middlewares.request_log import log_path
+
+from .log_policy import LogPolicy
+
 
 class LogRoute(APIRoute):
+    # None follows LogPolicy from settings
+    log_policy: LogPolicy | None = None
+
+    @classmethod
+    def with_policy(cls, log_policy: LogPolicy) -> type["LogRoute"]:
+        """Route class of a router with its own policy, APIRouter(route_class=LogRoute.with_policy(...))."""
+        return type(cls.__name__, (cls,), {"log_policy": log_policy})
+
     @inject
     def get_route_handler(
-        self, log_handler=Provide["log_container.db_log_handler"]
+        self,
+        log_handler=Provide["log_container.log_sink"],
+        default_log_policy: LogPolicy = Provide["log_policy"],
+        request_log_mode: str = Provide["config.REQUEST_LOG_MODE"],
     ) -> Callable:
         original_route_handler = super().get_route_handler()
+        # routes declared at import, before container wiring, are built again by include_router
+        if isinstance(default_log_policy, Provide):
+            return original_route_handler
+        log_policy = self.log_policy or default_log_policy
+        # RequestLogMiddleware logs every request instead
+        if request_log_mode == "middleware" or log_policy.skips(self.path):
+            return original_route_handler
 
         async def custom_route_handler(request: Request) -> Response:
 
             response: Response = await original_route_handler(request)
+            if not log_policy.should_log(response.status_code):
+                return response
 
             log_data = {
                 "user_id": request.user.user_id,
-                "ip": request.client.host if request.client else None,
-                "port": request.client.port if request.client else None,
+                "ip": request.client.host if request.client else "",
+                "port": request.client.port if request.client else 0,
                 "method": request.method,
-                "path": request.url.path,
-                "agent": dict(request.headers.items())["user-agent"],
+                "path": log_path(request.url.path),
+                "agent": request.headers.get("user-agent", ""),
                 "response_status": response.status_code,
             }
 
-            pre_background = response.background
-            response.background = BackgroundTasks()
-            if pre_background:
-                response.background = BackgroundTasks([pre_background])
-            response.background.add_task(func=log_handler, data=log_data)
+            # queued for log sink's batch write, no background task per request
+            await log_handler(data=log_data)
             return response
 
         return custom_route_handler
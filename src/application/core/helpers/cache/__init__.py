@@ -1,6 +1,16 @@
 from .cache_manager import CacheManager, cached
 from .cache_tag import CacheTag
+from .codec import Codec
 from .custom_key_maker import CustomKeyMaker
 from .redis_backend import RedisBackend
+from .two_tier_backend import TwoTierBackend
 
-__all__ = ["CacheManager", "RedisBackend", "CustomKeyMaker", "CacheTag", "cached"]
+__all__ = [
+    "CacheManager",
+    "RedisBackend",
+    "TwoTierBackend",
+    "CustomKeyMaker",
+    "CacheTag",
+    "Codec",
+    "cached",
+]
@@ -1,7 +1,8 @@
-from .backend import BaseBackend
+from .backend import BaseBackend, InvalidationReport
 from .key_maker import BaseKeyMaker
 
 __all__ = [
     "BaseKeyMaker",
     "BaseBackend",
+    "InvalidationReport",
 ]
@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterable
+
+
+@dataclass(slots=True)
+class InvalidationReport:
+    deleted: int
+    # seconds
+    elapsed: float
 
 
 class BaseBackend(ABC):
@@ -8,9 +17,25 @@ class BaseBackend(ABC):
         ...
 
     @abstractmethod
-    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+    async def set(
+        self, response: Any, key: str, ttl: int = 60, tags: Iterable[str] = ()
+    ) -> None:
         ...
 
     @abstractmethod
-    async def delete_startswith(self, value: str) -> None:
+    async def delete_startswith(self, value: str) -> InvalidationReport:
         ...
+
+    @abstractmethod
+    async def delete_by_tag(self, tag: str) -> InvalidationReport:
+        ...
+
+    @asynccontextmanager
+    async def lock(
+        self, key: str, timeout: float, blocking_timeout: float | None = None
+    ) -> AsyncIterator[bool]:
+        """Lock shared by processes, yield whether it is acquired. No lock by default."""
+        yield True
+
+    async def close(self) -> None:
+        """Stop background work of backend, called on shutdown."""
@@ -4,5 +4,7 @@ from typing import Callable
 
 class BaseKeyMaker(ABC):
     @abstractmethod
-    async def make(self, function: Callable, prefix: str) -> str:
+    async def make(
+        self, function: Callable, prefix: str, arguments: dict | None = None
+    ) -> str:
         ...
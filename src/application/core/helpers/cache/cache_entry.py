@@ -0,0 +1,28 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    Cached value with its logical expiry.
+    Stored by `cached` when stale-while-revalidate or early expiration is used.
+    """
+
+    value: Any
+    expires_at: float
+    # seconds taken to compute value
+    delta: float = 0.0
+
+    def is_fresh(self, beta: float = 0.0) -> bool:
+        """
+        Probabilistic early expiration(XFetch),
+        expensive values are treated as expired a bit earlier, spread over workers.
+        """
+        now = time.time()
+        if beta > 0 and self.delta > 0:
+            now -= self.delta * beta * math.log(1.0 - random.random())
+        return now < self.expires_at
@@ -1,11 +1,29 @@
+import asyncio
+import contextvars
+import inspect
+import logging
+import time
 from functools import wraps
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional, Union
 
-from dependency_injector.wiring import Provide, inject
+from dependency_injector.wiring import Provide, Provider, inject
+from fastapi.params import Depends
+from starlette.requests import HTTPConnection
 
-from .base import BaseBackend, BaseKeyMaker
+from application.core.db import standalone_session
+from application.core.utils.single_flight import SingleFlight
+
+from .base import BaseBackend, BaseKeyMaker, InvalidationReport
+from .cache_entry import CacheEntry
 from .cache_tag import CacheTag
 
+logger = logging.getLogger(__name__)
+
+# keeps background refresh, removal tasks referenced until done
+_background_tasks: set[asyncio.Task] = set()
+
+Tag = Union[CacheTag, str]
+
 
 class CacheManager:
     def __init__(
@@ -16,19 +34,157 @@ class CacheManager:
         self.backend = backend
         self.key_maker = key_maker
 
-    async def remove_by_tag(self, tag: CacheTag) -> None:
-        if self.backend is not None:
-            await self.backend.delete_startswith(value=tag.value)
+    async def remove_by_tag(
+        self, tag: Tag, background: bool = False
+    ) -> InvalidationReport | None:
+        """
+        Remove keys cached with tag, through tag index instead of scanning keyspace.
+        background: removal runs detached from caller, report is only logged.
+        """
+        if self.backend is None:
+            return None
+        return await self._run(
+            self.backend.delete_by_tag(tag=tag_value(tag)), background
+        )
+
+    async def remove_by_prefix(
+        self, prefix: str, background: bool = False
+    ) -> InvalidationReport | None:
+        """
+        Remove keys by prefix scan, O(keyspace).
+        Keys written before tag index existed are only reachable by this.
+        """
+        if self.backend is None:
+            return None
+        return await self._run(self.backend.delete_startswith(value=prefix), background)
 
-    async def remove_by_prefix(self, prefix: str) -> None:
+    async def close(self) -> None:
         if self.backend is not None:
-            await self.backend.delete_startswith(value=prefix)
+            await self.backend.close()
+
+    @staticmethod
+    async def _run(removal, background: bool) -> InvalidationReport | None:
+        if background:
+            task = asyncio.ensure_future(removal)
+            _background_tasks.add(task)
+            task.add_done_callback(_on_background_done)
+            return None
+        return await removal
+
+
+@inject
+async def close_cache_manager(
+    cache_manager: CacheManager = Provide["cache_manager"],
+) -> None:
+    await cache_manager.close()
+
+
+def tag_value(tag: Tag) -> str:
+    return tag.value if isinstance(tag, CacheTag) else tag
+
+
+def is_injected(parameter: inspect.Parameter) -> bool:
+    """Parameter filled by fastapi `Depends`, dependency injector marker or request itself."""
+    if isinstance(parameter.default, (Depends, Provide, Provider)):
+        return True
+    return inspect.isclass(parameter.annotation) and issubclass(
+        parameter.annotation, HTTPConnection
+    )
 
 
 def cached(
-    tag: CacheTag = CacheTag.DEFAULT, prefix: Optional[str] = None, ttl: int = 60
+    tag: CacheTag = CacheTag.DEFAULT,
+    prefix: Optional[str] = None,
+    ttl: int = 60,
+    exclude: Iterable[str] = (),
+    lock: bool = False,
+    lock_timeout: float = 10,
+    stale_ttl: int = 0,
+    early_expiration: float = 0,
+    tags: Iterable[Tag] | Callable[[Any], Iterable[Tag]] = (),
 ):
+    """
+    Cache return value by function and its argument values.
+    Injected dependencies and parameters in `exclude` are not part of the key.
+
+    lock: on miss only one caller computes value, single flight in worker and Redis lock across workers.
+    stale_ttl: expired value is served for stale_ttl more seconds while one task refreshes it in background,
+        in a standalone session.
+    early_expiration: XFetch beta, values are refreshed ahead of ttl with probability growing toward expiry.
+    tags: extra tags to index key under, or callable building them from the response.
+        `tag` is always recorded.
+    """
+    use_entry = stale_ttl > 0 or early_expiration > 0
+    static_tags = [] if callable(tags) else [tag_value(t) for t in tags]
+
+    def tags_of(response) -> list[str]:
+        extra = (
+            [tag_value(t) for t in tags(response)] if callable(tags) else static_tags
+        )
+        return list(dict.fromkeys([tag.value, *extra]))
+
     def _cached(function):
+        signature = inspect.signature(function)
+        excluded = set(exclude) | {
+            name
+            for name, parameter in signature.parameters.items()
+            if is_injected(parameter)
+        }
+        flight = SingleFlight()
+
+        async def compute(backend: BaseBackend, key: str, args, kwargs):
+            started = time.perf_counter()
+            response = await function(*args, **kwargs)
+            if use_entry:
+                entry = CacheEntry(
+                    value=response,
+                    expires_at=time.time() + ttl,
+                    delta=time.perf_counter() - started,
+                )
+                await backend.set(
+                    response=entry,
+                    key=key,
+                    ttl=ttl + stale_ttl,
+                    tags=tags_of(response),
+                )
+            else:
+                await backend.set(
+                    response=response, key=key, ttl=ttl, tags=tags_of(response)
+                )
+            return response
+
+        async def load(backend: BaseBackend, key: str, args, kwargs):
+            async with backend.lock(
+                key, timeout=lock_timeout, blocking_timeout=lock_timeout
+            ) as acquired:
+                if acquired:
+                    # other worker may have filled it while waiting
+                    cached_response = await backend.get(key=key)
+                    if isinstance(cached_response, CacheEntry):
+                        return cached_response.value
+                    if cached_response:
+                        return cached_response
+                return await compute(backend, key, args, kwargs)
+
+        async def refresh(backend: BaseBackend, key: str, args, kwargs):
+            async with backend.lock(
+                key, timeout=lock_timeout, blocking_timeout=0
+            ) as acquired:
+                if acquired:
+                    await compute(backend, key, args, kwargs)
+
+        def refresh_in_background(backend: BaseBackend, key: str, args, kwargs):
+            if key in flight:
+                return
+            # request's session is removed once response is sent,
+            # refresh runs out of request's context in a session of its own
+            task = asyncio.get_running_loop().create_task(
+                flight.do(key, standalone_session(refresh), backend, key, args, kwargs),
+                context=contextvars.Context(),
+            )
+            _background_tasks.add(task)
+            task.add_done_callback(_on_background_done)
+
         @wraps(function)
         @inject
         async def __cached(
@@ -36,18 +192,37 @@ def cached(
             cache_manager: CacheManager = Provide["cache_manager"],
             **kwargs,
         ):
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {
+                name: value
+                for name, value in bound.arguments.items()
+                if name not in excluded
+            }
             key = await cache_manager.key_maker.make(
                 function=function,
                 prefix=prefix if prefix is not None else tag.value,
+                arguments=arguments,
             )
-            cached_response = await cache_manager.backend.get(key=key)
+            backend = cache_manager.backend
+            cached_response = await backend.get(key=key)
+            if isinstance(cached_response, CacheEntry):
+                if not cached_response.is_fresh(early_expiration):
+                    refresh_in_background(backend, key, args, kwargs)
+                return cached_response.value
             if cached_response:
                 return cached_response
 
-            response = await function(*args, **kwargs)
-            await cache_manager.backend.set(response=response, key=key, ttl=ttl)
-            return response
+            if lock:
+                return await flight.do(key, load, backend, key, args, kwargs)
+            return await compute(backend, key, args, kwargs)
 
         return __cached
 
     return _cached
+
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and (e := task.exception()) is not None:
+        logger.warning(f"cache background task failed: {e}")
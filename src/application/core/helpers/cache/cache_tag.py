@@ -4,3 +4,8 @@ from enum import Enum
 class CacheTag(Enum):
     DEFAULT = "default"
     GET_USER_LIST = "get_user_list"
+    USER = "user"
+
+    def of(self, *parts) -> str:
+        """Tag narrowed to one entity, e.g. `CacheTag.USER.of(1)` -> `user:1`."""
+        return ":".join([self.value, *map(str, parts)])
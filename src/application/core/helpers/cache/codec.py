@@ -0,0 +1,281 @@
+import importlib
+import pickle
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, Extra
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from .cache_entry import CacheEntry
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+# Header byte: 11 e cc fff
+#   11  : marker, never the first byte of legacy payloads(orjson text < 0x80, pickle 0x80)
+#   e   : value is CacheEntry envelope
+#   cc  : compression
+#   fff : serialization format
+MARKER = 0b1100_0000
+MARKER_MASK = 0b1100_0000
+ENVELOPE = 0b0010_0000
+COMPRESSION_SHIFT = 3
+COMPRESSION_MASK = 0b0001_1000
+FORMAT_MASK = 0b0000_0111
+
+FORMATS = {"orjson": 0, "msgpack": 1, "pickle": 2}
+# pydantic model(s) as [type tag, many, field values], rebuilt without validation
+MODEL_FORMATS = {"orjson": 3, "msgpack": 4}
+COMPRESSIONS = {None: 0, "zstd": 1, "lz4": 2}
+
+
+SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_plain(value: Any) -> bool:
+    """
+    Whether value is read back by orjson, msgpack as it is:
+    lists, str keyed dicts and scalars, subclasses(e.g. enums) excluded.
+    """
+    kind = type(value)
+    if kind in SCALARS:
+        return True
+    if kind is list:
+        return all(_is_plain(item) for item in value)
+    if kind is dict:
+        return all(type(key) is str and _is_plain(item) for key, item in value.items())
+    return False
+
+
+def _model_type(value: Any) -> type[BaseModel] | None:
+    """Model class of a model, or of a non empty list of one model class."""
+    if isinstance(value, BaseModel):
+        return type(value)
+    if type(value) is list and value and isinstance(value[0], BaseModel):
+        model = type(value[0])
+        if all(type(item) is model for item in value):
+            return model
+    return None
+
+
+PLAIN_FIELD_TYPES = (str, int, float, bool)
+_plain_models: dict[type[BaseModel], bool] = {}
+
+
+def _is_plain_model(model: type[BaseModel]) -> bool:
+    """
+    Whether fields of model, and of nested models, are read back from JSON as they were:
+    plain or model types, optional, or lists of those. Checked once per model class.
+    """
+    if (plain := _plain_models.get(model)) is None:
+        # recursive models are not plain
+        _plain_models[model] = False
+        plain = _plain_models[model] = (
+            model.__config__.extra != Extra.allow
+            and not model.__private_attributes__
+            and all(_is_plain_field(field) for field in model.__fields__.values())
+        )
+    return plain
+
+
+def _is_plain_field(field: ModelField) -> bool:
+    if field.shape not in (SHAPE_SINGLETON, SHAPE_LIST):
+        return False
+    if field.type_ in PLAIN_FIELD_TYPES:
+        return True
+    return (
+        isinstance(field.type_, type)
+        and issubclass(field.type_, BaseModel)
+        and _is_plain_model(field.type_)
+    )
+
+
+def _model_dict(value: Any) -> dict:
+    """orjson, msgpack default, model values as they are, nested models included."""
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"{type(value)} is not serializable")
+
+
+def _construct(model: type[BaseModel], data: dict) -> BaseModel:
+    """Model of data it was encoded from, without validating again."""
+    values = {}
+    for name, field in model.__fields__.items():
+        value = data[name]
+        if value is not None and field.type_ not in PLAIN_FIELD_TYPES:
+            if field.shape == SHAPE_LIST:
+                value = [_construct(field.type_, item) for item in value]
+            else:
+                value = _construct(field.type_, value)
+        values[name] = value
+    # what construct does, minus defaults: every field was encoded
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", set(data))
+    return instance
+
+
+_models: dict[str, type[BaseModel]] = {}
+
+
+def _tag(model: type[BaseModel]) -> str:
+    return f"{model.__module__}:{model.__qualname__}"
+
+
+def _resolve(tag: str) -> type[BaseModel]:
+    if (model := _models.get(tag)) is None:
+        module, qualname = tag.split(":")
+        found: Any = importlib.import_module(module)
+        for name in qualname.split("."):
+            found = getattr(found, name)
+        if not (isinstance(found, type) and issubclass(found, BaseModel)):
+            raise ValueError(f"cached model {tag} is not a pydantic model")
+        model = _models[tag] = found
+    return model
+
+
+class Codec:
+    """
+    Serialize cached values behind one header byte, so decoding never guesses.
+
+    Plain data(lists, str keyed dicts, scalars) goes by `format`("orjson" or "msgpack"),
+    so do pydantic models, or lists of one model class, whose fields are of plain types:
+    tagged by model class and rebuilt as `construct` does, without validating again, on decode.
+    Anything else(tuples, datetimes, enums, ORM rows, models holding those) goes by pickle,
+    so a hit returns the same types as the miss computing it.
+    Payloads bigger than `compression_threshold` bytes are compressed by `compression`.
+    Header decides decoding, entries written by another codec setting stay readable.
+    """
+
+    def __init__(
+        self,
+        format: str = "orjson",
+        compression: str | None = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"unknown cache codec format: {format}")
+        if format == "msgpack" and msgpack is None:
+            raise ValueError("cache codec format msgpack requires `msgpack` package")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"unknown cache compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("cache compression zstd requires `zstandard` package")
+        if compression == "lz4" and lz4_frame is None:
+            raise ValueError("cache compression lz4 requires `lz4` package")
+
+        self.format = format
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self._zstd_compressor = zstandard.ZstdCompressor() if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, value: Any) -> bytes:
+        header = MARKER
+        if isinstance(value, CacheEntry):
+            header |= ENVELOPE
+            value = [value.value, value.expires_at, value.delta]
+
+        fmt, body = self._serialize(value)
+        header |= fmt
+
+        if self.compression is not None and len(body) > self.compression_threshold:
+            body = self._compress(self.compression, body)
+            header |= COMPRESSIONS[self.compression] << COMPRESSION_SHIFT
+        return bytes((header,)) + body
+
+    def decode(self, data: bytes) -> Any:
+        header = data[0]
+        if header & MARKER_MASK != MARKER:
+            return self._decode_legacy(data)
+
+        body: bytes | memoryview = memoryview(data)[1:]
+        compression = (header & COMPRESSION_MASK) >> COMPRESSION_SHIFT
+        if compression:
+            body = self._decompress(compression, body)
+
+        value = self._deserialize(header & FORMAT_MASK, body)
+        if header & ENVELOPE:
+            return CacheEntry(*value)
+        return value
+
+    def _serialize(self, value: Any) -> tuple[int, bytes]:
+        model = _model_type(value)
+        if model is not None and _is_plain_model(model):
+            tagged = [_tag(model), isinstance(value, list), value]
+            try:
+                if self.format == "orjson":
+                    body = orjson.dumps(tagged, default=_model_dict)
+                    return MODEL_FORMATS["orjson"], body
+                if self.format == "msgpack":
+                    body = msgpack.packb(tagged, default=_model_dict)
+                    return MODEL_FORMATS["msgpack"], body
+            except (TypeError, OverflowError):
+                pass
+        elif model is None and _is_plain(value):
+            try:
+                if self.format == "orjson":
+                    return FORMATS["orjson"], orjson.dumps(value)
+                if self.format == "msgpack":
+                    return FORMATS["msgpack"], msgpack.packb(value)
+            except (TypeError, OverflowError):
+                # integers out of 64 bit range
+                pass
+        return FORMATS["pickle"], pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _deserialize(self, fmt: int, body) -> Any:
+        if fmt in (FORMATS["orjson"], MODEL_FORMATS["orjson"]):
+            value = orjson.loads(body)
+        elif fmt in (FORMATS["msgpack"], MODEL_FORMATS["msgpack"]):
+            if msgpack is None:
+                raise ValueError("cached value is msgpack, `msgpack` package required")
+            value = msgpack.unpackb(body)
+        elif fmt == FORMATS["pickle"]:
+            return pickle.loads(body)
+        else:
+            raise ValueError(f"unknown cached value format: {fmt}")
+        if fmt in MODEL_FORMATS.values():
+            tag, many, data = value
+            model = _resolve(tag)
+            if many:
+                return [_construct(model, item) for item in data]
+            return _construct(model, data)
+        return value
+
+    def _compress(self, compression: str, body: bytes) -> bytes:
+        if compression == "zstd":
+            assert self._zstd_compressor is not None
+            return self._zstd_compressor.compress(body)
+        return lz4_frame.compress(body)
+
+    def _decompress(self, compression: int, body) -> bytes:
+        if compression == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ValueError("cached value is zstd, `zstandard` package required")
+            assert self._zstd_decompressor is not None
+            return self._zstd_decompressor.decompress(body)
+        if compression == COMPRESSIONS["lz4"]:
+            if lz4_frame is None:
+                raise ValueError("cached value is lz4, `lz4` package required")
+            return lz4_frame.decompress(body)
+        raise ValueError(f"unknown cached value compression: {compression}")
+
+    @staticmethod
+    def _decode_legacy(data: bytes) -> Any:
+        """Values written before the header existed, orjson dict or pickle."""
+        try:
+            return orjson.loads(data.decode("utf8"))
+        except UnicodeDecodeError:
+            return pickle.loads(data)
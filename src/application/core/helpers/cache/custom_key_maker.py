@@ -1,21 +1,48 @@
+import hashlib
 import inspect
-from typing import Callable
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel
 
 from application.core.helpers.cache.base import BaseKeyMaker
 
 
-class CustomKeyMaker(BaseKeyMaker):
-    async def make(self, function: Callable, prefix: str) -> str:
-        if (module := inspect.getmodule(function)) is not None:
-            path = f"{prefix}::{module.__name__}.{function.__name__}"
-        else:
-            path = "function.__name__"
-        args = ""
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return str(obj)
+
+
+def hash_arguments(arguments: dict) -> str:
+    """Stable digest of argument values, independent of keyword order."""
+    encoded = orjson.dumps(
+        arguments,
+        default=_encode_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
-        for arg in inspect.signature(function).parameters.values():
-            args += arg.name
 
-        if args:
-            return f"{path}.{args}"
+class CustomKeyMaker(BaseKeyMaker):
+    def __init__(self) -> None:
+        self._paths: dict[tuple[Callable, str], str] = {}
+
+    def _path(self, function: Callable, prefix: str) -> str:
+        if (path := self._paths.get((function, prefix))) is None:
+            if (module := inspect.getmodule(function)) is not None:
+                path = f"{prefix}::{module.__name__}.{function.__name__}"
+            else:
+                path = f"{prefix}::{function.__name__}"
+            self._paths[(function, prefix)] = path
+        return path
 
+    async def make(
+        self, function: Callable, prefix: str, arguments: dict | None = None
+    ) -> str:
+        path = self._path(function, prefix)
+        if arguments:
+            return f"{path}:{hash_arguments(arguments)}"
         return path
@@ -1,39 +1,179 @@
-import pickle
-from typing import Any
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
 
-import orjson
 from dependency_injector.providers import Singleton
 from dependency_injector.wiring import Provide
 from redis.asyncio.client import Redis
+from redis.exceptions import LockError, ResponseError
 
-from application.core.helpers.cache.base import BaseBackend
+from application.core.helpers.cache.base import BaseBackend, InvalidationReport
+from application.core.helpers.cache.codec import Codec
+
+logger = logging.getLogger(__name__)
+
+# keys per UNLINK command
+UNLINK_CHUNK_SIZE = 100
 
 
 class RedisBackend(BaseBackend):
 
     redis_provider: Singleton[Redis] = Provide["redis.provider"]
 
+    def __init__(
+        self,
+        scan_count: int = 1000,
+        delete_batch_size: int = 1000,
+        codec: Codec | None = None,
+    ) -> None:
+        self.scan_count = scan_count
+        self.delete_batch_size = delete_batch_size
+        self.codec = codec if codec is not None else Codec()
+
+    def encode(self, response: Any) -> bytes:
+        return self.codec.encode(response)
+
+    def decode(self, value: bytes) -> Any:
+        return self.codec.decode(value)
+
+    async def get_entry(self, key: str) -> tuple[bytes | None, int]:
+        """Raw value and remaining ttl in milliseconds by one round trip."""
+        pipe = self.redis_provider().pipeline(transaction=False)
+        async with pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = await pipe.execute()
+        return value, pttl
+
     async def get(self, key: str) -> Any:
         redis = self.redis_provider()
         result = await redis.get(key)
         if not result:
             return
 
-        try:
-            return orjson.loads(result.decode("utf8"))
-        except UnicodeDecodeError:
-            return pickle.loads(result)
+        return self.decode(result)
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        # sorted set, named apart from plain sets of `tag::` a running older version writes
+        return f"tags::{tag}"
 
-    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
-        if isinstance(response, dict):
-            response = orjson.dumps(response)
-        elif isinstance(response, object):
-            response = pickle.dumps(response)
+    async def set(
+        self, response: Any, key: str, ttl: int = 60, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Key is recorded in a sorted set per tag, scored by its expiry, by same round trip.
+        Members expired are pruned on every write, a tag written all the time
+        holds its live keys only. Tag set lives as long as its longest living key.
+        """
+        now = time.time()
+        pipe = self.redis_provider().pipeline(transaction=False)
+        async with pipe:
+            pipe.set(name=key, value=self.encode(response), ex=ttl)
+            for tag in tags:
+                tag_key = self.tag_key(tag)
+                pipe.zadd(tag_key, {key: now + ttl})
+                pipe.zremrangebyscore(tag_key, "-inf", now)
+                pipe.expire(tag_key, ttl, nx=True)
+                pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
 
+    async def delete_startswith(self, value: str) -> InvalidationReport:
+        """
+        Scan by large COUNT and remove keys by pipelined UNLINK,
+        memory is reclaimed by Redis in background.
+        """
+        started = time.perf_counter()
         redis = self.redis_provider()
-        await redis.set(name=key, value=response, ex=ttl)
+        deleted = 0
+        batch = []
+        async for key in redis.scan_iter(match=f"{value}::*", count=self.scan_count):
+            batch.append(key)
+            if len(batch) >= self.delete_batch_size:
+                deleted += await self._unlink(redis, batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink(redis, batch)
 
-    async def delete_startswith(self, value: str) -> None:
+        report = InvalidationReport(
+            deleted=deleted, elapsed=time.perf_counter() - started
+        )
+        logger.info(
+            f"RedisBackend removed {report.deleted} keys of {value} in {report.elapsed:.3f}s"
+        )
+        return report
+
+    async def delete_by_tag(
+        self,
+        tag: str,
+        on_batch: Callable[[list[bytes]], Awaitable[None]] | None = None,
+    ) -> InvalidationReport:
+        """
+        Remove keys recorded under tag, O(tagged keys), those expired are skipped.
+        Tag set is renamed first, so keys tagged meanwhile go to a new set and are kept.
+        """
+        started = time.perf_counter()
+        redis = self.redis_provider()
+        deleting_key = f"{self.tag_key(tag)}::deleting::{uuid.uuid4().hex}"
+        try:
+            await redis.rename(self.tag_key(tag), deleting_key)
+        except ResponseError:
+            # no such tag
+            return InvalidationReport(deleted=0, elapsed=time.perf_counter() - started)
+
+        deleted = 0
+        batch = []
+        now = time.time()
+        async for key, expires_at in redis.zscan_iter(
+            deleting_key, count=self.scan_count
+        ):
+            if expires_at <= now:
+                continue
+            batch.append(key)
+            if len(batch) >= self.delete_batch_size:
+                deleted += await self._unlink(redis, batch)
+                if on_batch is not None:
+                    await on_batch(batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink(redis, batch)
+            if on_batch is not None:
+                await on_batch(batch)
+        await redis.unlink(deleting_key)
+
+        report = InvalidationReport(
+            deleted=deleted, elapsed=time.perf_counter() - started
+        )
+        logger.info(
+            f"RedisBackend removed {report.deleted} keys tagged {tag} in {report.elapsed:.3f}s"
+        )
+        return report
+
+    @staticmethod
+    async def _unlink(redis: Redis, keys: list) -> int:
+        pipe = redis.pipeline(transaction=False)
+        async with pipe:
+            for start in range(0, len(keys), UNLINK_CHUNK_SIZE):
+                pipe.unlink(*keys[start : start + UNLINK_CHUNK_SIZE])
+            return sum(await pipe.execute())
+
+    @asynccontextmanager
+    async def lock(
+        self, key: str, timeout: float, blocking_timeout: float | None = None
+    ) -> AsyncIterator[bool]:
         redis = self.redis_provider()
-        async for key in redis.scan_iter(f"{value}::*"):
-            await redis.delete(key)
+        lock = redis.lock(
+            f"lock::{key}", timeout=timeout, blocking_timeout=blocking_timeout
+        )
+        acquired = await lock.acquire()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except LockError:
+                    # expired by timeout and maybe taken by other one
+                    pass
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+
+import orjson
+
+from application.core.helpers.cache.base import BaseBackend, InvalidationReport
+from application.core.helpers.cache.redis_backend import RedisBackend
+
+logger = logging.getLogger(__name__)
+
+
+class TwoTierBackend(BaseBackend):
+    """
+    Bounded in-process LRU/TTL tier in front of RedisBackend.
+
+    Writes and deletes are published on Redis pub/sub channel,
+    every worker drops matching local entries when message arrives.
+    Local tier is bypassed and cleared while the subscription is down,
+    so a worker never serves entries it could have missed invalidation for.
+    Local ttl bounds staleness of a read racing with a concurrent write.
+    Local entries are kept encoded, every hit decodes its own copy.
+    """
+
+    def __init__(
+        self,
+        remote: RedisBackend,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: int = 5,
+        channel: str = "cache-invalidation",
+        reconnect_interval: float = 1.0,
+    ) -> None:
+        self.remote = remote
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        # key -> (encoded value, expires_at, size)
+        self._entries: OrderedDict[str, tuple[bytes, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._subscribed = False
+        self._listener: asyncio.Task | None = None
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self) -> None:
+        redis = self.remote.redis_provider()
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self._subscribed = True
+                    elif message["type"] == "message":
+                        self._apply(message["data"])
+            except Exception as e:
+                logger.warning(f"TwoTierBackend invalidation listener failed: {e}")
+            finally:
+                self._subscribed = False
+                self.clear()
+                await pubsub.close()
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _apply(self, data: bytes) -> None:
+        message = orjson.loads(data)
+        if message["op"] == "key":
+            self._pop(message["value"])
+        elif message["op"] == "keys":
+            for key in message["value"]:
+                self._pop(key)
+        elif message["op"] == "prefix":
+            self._pop_startswith(message["value"])
+
+    async def _publish(self, op: str, value: str | list[str]) -> None:
+        redis = self.remote.redis_provider()
+        await redis.publish(self.channel, orjson.dumps({"op": op, "value": value}))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._bytes -= entry[2]
+
+    def _pop_startswith(self, value: str) -> None:
+        prefix = f"{value}::"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._pop(key)
+
+    def _get_local(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _set_local(self, key: str, raw: bytes, ttl: float) -> None:
+        size = len(raw)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        self._pop(key)
+        self._entries[key] = (raw, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    async def get(self, key: str) -> Any:
+        self._ensure_listener()
+        if self._subscribed and (raw := self._get_local(key)) is not None:
+            return self.remote.decode(raw)
+
+        raw, pttl = await self.remote.get_entry(key)
+        if not raw:
+            return None
+        if self._subscribed:
+            ttl = self.ttl if pttl < 0 else min(self.ttl, pttl / 1000)
+            self._set_local(key, raw, ttl)
+        return self.remote.decode(raw)
+
+    async def set(
+        self, response: Any, key: str, ttl: int = 60, tags: Iterable[str] = ()
+    ) -> None:
+        self._ensure_listener()
+        await self.remote.set(response=response, key=key, ttl=ttl, tags=tags)
+        self._pop(key)
+        await self._publish("key", key)
+
+    @asynccontextmanager
+    async def lock(
+        self, key: str, timeout: float, blocking_timeout: float | None = None
+    ) -> AsyncIterator[bool]:
+        async with self.remote.lock(
+            key, timeout=timeout, blocking_timeout=blocking_timeout
+        ) as acquired:
+            yield acquired
+
+    async def delete_startswith(self, value: str) -> InvalidationReport:
+        self._ensure_listener()
+        report = await self.remote.delete_startswith(value=value)
+        self._pop_startswith(value)
+        await self._publish("prefix", value)
+        return report
+
+    async def delete_by_tag(self, tag: str) -> InvalidationReport:
+        self._ensure_listener()
+        return await self.remote.delete_by_tag(tag=tag, on_batch=self._drop_keys)
+
+    async def _drop_keys(self, keys: list[bytes]) -> None:
+        decoded = [key.decode("utf8") for key in keys]
+        for key in decoded:
+            self._pop(key)
+        await self._publish("keys", decoded)
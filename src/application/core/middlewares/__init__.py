@@ -5,10 +5,12 @@ from .authentication_external import (
     ExternalAuthBackend,
     on_auth_error,
 )
+from .authentication_jwks import JWKSAuthBackend
 
 __all__ = [
     "AuthenticationMiddleware",
     "ExternalAuthBackend",
+    "JWKSAuthBackend",
     "on_auth_error",
     "CustomAuthCredentials",
     "AuthUser",
@@ -13,9 +13,10 @@ from starlette.middleware.authentication import (
 )
 from starlette.requests import HTTPConnection
 
+from application.core.enums import ResponseCode
 from application.core.exceptions import ExternalServiceException, TokenException
-from application.core.exceptions.token import TokenDecodeException
-from application.core.external_service import AuthClient
+from application.core.exceptions.token import TokenDecodeException, TokenExpireException
+from application.core.external_service import AuthClient, VerifiedTokenCache
 
 from ..exceptions.middleware import NoAuthenticationException
 
@@ -87,11 +88,54 @@ class AuthUser(BaseUser):
 class ExternalAuthBackend(AuthenticationBackend):
 
     auth_client_provider: Singleton[AuthClient] = Provide["auth_client.provider"]
+    token_cache_provider: Singleton[VerifiedTokenCache] = Provide[
+        "token_cache.provider"
+    ]
+
+    async def verify_remote(
+        self,
+        access_token: str,
+        exp: int | float | None = None,
+        use_cache: bool = True,
+    ) -> None:
+        """
+        Ask auth server whether token is valid, answering from verification cache if possible.
+        use_cache=False always asks auth server, e.g. a revocation must be seen at once.
+        Raise TokenException on invalid token.
+        """
+        token_cache = self.token_cache_provider()
+        code = await token_cache.get(access_token) if use_cache else None
+        if code is None:
+            auth_client = self.auth_client_provider()
+            try:
+                is_valid = await auth_client.is_token_valid(access_token)
+                code = ResponseCode.OK if is_valid else ResponseCode.TOKEN_INVALID
+            except TokenExpireException:
+                code = ResponseCode.TOKEN_EXPIRED
+            except TokenDecodeException:
+                code = ResponseCode.TOKEN_INVALID
+            await token_cache.set(access_token, code, exp=exp)
+
+        if code == ResponseCode.TOKEN_EXPIRED:
+            raise TokenExpireException()
+        if code != ResponseCode.OK:
+            raise TokenDecodeException()
+
+    async def verify_token(self, access_token: str) -> dict:
+        """Return token payload of verified token."""
+        creds = access_token.split(".")
+        if len(creds) != 3:
+            raise TokenDecodeException()
+        user_info = decode_base64(creds[1])
+        exp = user_info.get("exp")
+        await self.verify_remote(
+            access_token, exp=exp if isinstance(exp, (int, float)) else None
+        )
+        return user_info
 
     async def authenticate(
         self, conn: HTTPConnection
     ) -> Tuple[AuthCredentials, BaseUser] | None:
-        auth_client = self.auth_client_provider()
         current_user = AuthUser()
         auth_credentials = CustomAuthCredentials()
         authorization: str | None = conn.headers.get("Authorization")
@@ -100,16 +144,11 @@ class ExternalAuthBackend(AuthenticationBackend):
             return auth_credentials, current_user
         try:
             scheme, access_token = authorization.split(" ")
-            if (
-                (scheme.lower() != "bearer")
-                or (access_token is None)
-                or (not await auth_client.is_token_valid(access_token))
-            ):
+            if (scheme.lower() != "bearer") or (access_token is None):
                 current_user.auth_error = TokenDecodeException()
                 return auth_credentials, current_user
 
-            creds = access_token.split(".")
-            user_info = decode_base64(creds[1])
+            user_info = await self.verify_token(access_token)
 
         except ValueError as e:
             logger.info(f"TokenValueException: {e}")
@@ -0,0 +1,69 @@
+import logging
+
+import jwt
+
+from application.core.exceptions.token import TokenDecodeException, TokenExpireException
+from application.core.external_service.jwks import JWKSKeySet
+
+from .authentication_external import ExternalAuthBackend
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSAuthBackend(ExternalAuthBackend):
+    """
+    Verify token signature locally against auth server's published keys.
+
+    Remote `/oauth2/verify` is called only when token's `kid` is not known yet
+    or token carries one of revocation sensitive scopes, the latter bypassing verification cache.
+    """
+
+    def __init__(
+        self,
+        key_set: JWKSKeySet,
+        algorithms: list[str],
+        revocation_sensitive_scopes: list[str] | None = None,
+        audience: str | None = None,
+    ) -> None:
+        self.key_set = key_set
+        self.algorithms = algorithms
+        self.revocation_sensitive_scopes = set(revocation_sensitive_scopes or [])
+        self.audience = audience
+
+    def is_revocation_sensitive(self, payload: dict) -> bool:
+        if not self.revocation_sensitive_scopes:
+            return False
+        scope = payload.get("scope") or []
+        if isinstance(scope, str):
+            scope = scope.replace(",", " ").split()
+        return not self.revocation_sensitive_scopes.isdisjoint(scope)
+
+    async def verify_token(self, access_token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(access_token)
+        except jwt.PyJWTError:
+            raise TokenDecodeException()
+
+        key = await self.key_set.get_signing_key(header.get("kid"))
+        if key is None:
+            logger.info(f"JWKSAuthBackend unknown kid: {header.get('kid')}")
+            return await super().verify_token(access_token)
+
+        try:
+            payload = jwt.decode(
+                access_token,
+                key=key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                options={"verify_aud": self.audience is not None},
+            )
+        except jwt.ExpiredSignatureError:
+            raise TokenExpireException()
+        except jwt.PyJWTError:
+            raise TokenDecodeException()
+
+        if self.is_revocation_sensitive(payload):
+            await self.verify_remote(
+                access_token, exp=payload.get("exp"), use_cache=False
+            )
+        return payload
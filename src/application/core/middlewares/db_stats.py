@@ -0,0 +1,38 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from application.core.db.instrumentation import (
+    RequestDBStats,
+    reset_request_db_stats,
+    set_request_db_stats,
+)
+
+
+class DBStatsMiddleware:
+    """
+    Database time of each request, as `Server-Timing` response header:
+    `db` time spent in statements, `db-pool` time spent waiting for a connection.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        context = set_request_db_stats(stats)
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "server-timing", stats.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            reset_request_db_stats(context)
@@ -0,0 +1,101 @@
+import datetime
+import uuid
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from application.core.fastapi.log_policy import LogPolicy
+
+# request_response_log.path is VARCHAR(20)
+PATH_MAX_LENGTH = 20
+
+
+def log_path(path: str) -> str:
+    """Path cut to column length, a longer one(e.g. scanned by bots, 404) would fail its batch."""
+    return path[:PATH_MAX_LENGTH]
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+@dataclass(slots=True)
+class RequestLogRecord:
+    """Fixed shape request log, turned into a row by log sink's worker."""
+
+    user_id: int | None
+    # "" and 0 when server did not report the client, columns are not nullable
+    ip: str
+    port: int
+    method: str
+    path: str
+    agent: str
+    response_status: int
+    created_at: datetime.datetime = field(default_factory=_utcnow)
+    request_id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+    def as_row(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "ip": self.ip,
+            "port": self.port,
+            "method": self.method,
+            "path": self.path,
+            "agent": self.agent,
+            "response_status": self.response_status,
+            "created_at": self.created_at,
+            "updated_at": self.created_at,
+            "request_id": self.request_id,
+        }
+
+
+def _user_agent(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"user-agent":
+            return value.decode("latin-1")
+    return ""
+
+
+class RequestLogMiddleware:
+    """
+    Request log of every http request, REQUEST_LOG_MODE=middleware.
+
+    Fields are read from ASGI scope and `http.response.start` message, no Request object is built.
+    Runs inside AuthenticationMiddleware for `scope["user"]`.
+    A request failing before response starts is logged as 500.
+    """
+
+    def __init__(self, app: ASGIApp, log_handler, log_policy: LogPolicy) -> None:
+        self.app = app
+        self.log_handler = log_handler
+        self.log_policy = log_policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.log_policy.skips(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            if self.log_policy.should_log(status_code):
+                client = scope.get("client")
+                await self.log_handler(
+                    RequestLogRecord(
+                        user_id=getattr(scope.get("user"), "user_id", None),
+                        ip=client[0] if client else "",
+                        port=client[1] if client else 0,
+                        method=scope["method"],
+                        path=log_path(scope["path"]),
+                        agent=_user_agent(scope),
+                        response_status=status_code,
+                    )
+                )
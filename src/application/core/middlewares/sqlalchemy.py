@@ -2,25 +2,107 @@ from uuid import uuid4
 
 from dependency_injector.wiring import Provide
 from sqlalchemy.ext.asyncio import async_scoped_session
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from application.core.db.read_your_writes import (
+    WriteState,
+    reset_write_state,
+    set_write_state,
+    sign_write_token,
+    verify_write_token,
+)
 from application.core.db.session_maker import reset_session_context, set_session_context
 
 session: async_scoped_session = Provide["session"]
 
+WRITE_TOKEN_HEADER = "x-last-write"
+WRITE_TOKEN_COOKIE = "last_write"
+
 
 class SQLAlchemyMiddleware:
-    def __init__(self, app: ASGIApp) -> None:
+    """
+    Session scope per request, unit of work of repository calls joining it.
+    Committed as response starts with status below 400, rolled back otherwise.
+
+    Read your writes: a request which wrote gets a signed last write token,
+    as `x-last-write` header and cookie. Requests presenting it within
+    read_your_writes_window seconds read from writer or a caught up replica.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str | None = None,
+        read_your_writes_window: float = 0,
+    ) -> None:
         self.app = app
+        self.secret_key = secret_key
+        self.read_your_writes_window = read_your_writes_window
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         session_id = str(uuid4())
         context = set_session_context(session_id=session_id)
 
+        write_context = None
+        reads_own_writes = self.secret_key and self.read_your_writes_window > 0
+        if reads_own_writes and scope["type"] in ("http", "websocket"):
+            write_state = self._load_write_state(scope)
+            write_context = set_write_state(write_state)
+            send = self._send_write_token(write_state, send)
+
+        if scope["type"] == "http":
+            send = self._commit_on_response(send)
+
         try:
             await self.app(scope, receive, send)
+            if scope["type"] == "websocket":
+                await session.commit()
         except Exception as e:
             raise e
         finally:
             await session.remove()
             reset_session_context(context=context)
+            if write_context is not None:
+                reset_write_state(write_context)
+
+    def _load_write_state(self, scope: Scope) -> WriteState:
+        connection = HTTPConnection(scope)
+        token = connection.headers.get(WRITE_TOKEN_HEADER) or connection.cookies.get(
+            WRITE_TOKEN_COOKIE
+        )
+        last_write_at = (
+            verify_write_token(self.secret_key, token) if token else None  # type: ignore[arg-type]
+        )
+        return WriteState(
+            window=self.read_your_writes_window, last_write_at=last_write_at
+        )
+
+    @staticmethod
+    def _commit_on_response(send: Send) -> Send:
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # before response leaves, failing commit still turns into an error response
+                if message["status"] < 400:
+                    await session.commit()
+                else:
+                    await session.rollback()
+            await send(message)
+
+        return _send
+
+    def _send_write_token(self, write_state: WriteState, send: Send) -> Send:
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start" and write_state.wrote:
+                token = sign_write_token(self.secret_key, write_state.last_write_at)  # type: ignore[arg-type]
+                headers = MutableHeaders(scope=message)
+                headers.append(WRITE_TOKEN_HEADER, token)
+                headers.append(
+                    "set-cookie",
+                    f"{WRITE_TOKEN_COOKIE}={token}; Max-Age={int(self.read_your_writes_window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        return _send
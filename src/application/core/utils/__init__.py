@@ -1,5 +1,7 @@
+from .single_flight import SingleFlight
 from .token_helper import TokenHelper
 
 __all__ = [
+    "SingleFlight",
     "TokenHelper",
 ]
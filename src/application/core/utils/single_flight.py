@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing a key into one awaitable.
+
+    The call runs as its own task, so cancelling one waiter does not cancel the others.
+    `issued` counts calls actually executed, `coalesced` counts calls which joined one in flight.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def stats(self) -> dict:
+        return {"issued": self.issued, "coalesced": self.coalesced}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs,
+    ) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.issued += 1
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # exception is re-raised to every waiter, mark it retrieved even if all waiters left
+        if not task.cancelled():
+            task.exception()
+
+
+def render_stats(prefix: str, stats: dict[str, dict]) -> str:
+    """Prometheus text exposition of single flights' stats by call."""
+    lines = []
+    for counter in ("issued", "coalesced"):
+        name = f"{prefix}_{counter}_total"
+        lines.append(f"# TYPE {name} counter")
+        for call, call_stats in stats.items():
+            lines.append(f'{name}{{call="{call}"}} {call_stats[counter]}')
+    return "\n".join(lines) + "\n"
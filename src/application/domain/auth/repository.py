@@ -1,9 +1,9 @@
 from dependency_injector.wiring import Provide
-from sqlalchemy import and_, select, update
+from sqlalchemy import and_, bindparam, select, update
 from sqlalchemy.ext.asyncio import async_scoped_session
 
 from application.core.base_class.repository import BaseAlchemyRepository
-from application.core.db import standalone_session
+from application.core.db import session_scope
 
 from .models import Token
 
@@ -18,14 +18,20 @@ class TokenAlchemyRepository(BaseAlchemyRepository[Token]):
     def __init__(self, model):
         super().__init__(model)
 
-    @standalone_session
+    @session_scope
     async def get_token_instance(self, token: str) -> Token | None:
-        query = select(self.model).filter(self.model.refresh_token == token)
-        result = await session.execute(query)
+        query = self.statement(
+            "by_refresh_token",
+            lambda: select(self.model).where(  # type: ignore[arg-type]
+                self.model.refresh_token == bindparam("token")
+            ),
+        )
+        result = await session.execute(query, {"token": token})
         return result.scalars().first()
 
-    @standalone_session
+    @session_scope
     async def make_all_token_invalid(self, user_id):
+        # literal values, loaded tokens are synchronized by evaluating the statement
         stmt = (
             update(self.model)
             .where(and_(self.model.user_id == user_id, self.model.is_valid == True))
@@ -1,8 +1,12 @@
+from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Response
 
 from application.core.authority.permissions import AllowAll
+from application.core.db.instrumentation import DBMetrics
 from application.core.dependencies import PermissionDependency
+from application.core.external_service import AuthClient
 from application.core.fastapi.log_route import LogRoute
+from application.core.utils.single_flight import render_stats
 
 home_router = APIRouter(route_class=LogRoute)
 
@@ -10,3 +14,24 @@ home_router = APIRouter(route_class=LogRoute)
 @home_router.get("/health", dependencies=[Depends(PermissionDependency([AllowAll]))])
 async def home():
     return Response(status_code=200)
+
+
+# metrics scrapes are not request logged
+metrics_router = APIRouter()
+
+
+@metrics_router.get(
+    "/metrics",
+    dependencies=[Depends(PermissionDependency([AllowAll]))],
+    include_in_schema=False,
+)
+@inject
+async def metrics(
+    db_metrics: DBMetrics = Depends(Provide["db_metrics"]),
+    auth_client: AuthClient = Depends(Provide["auth_client"]),
+):
+    return Response(
+        content=db_metrics.render()
+        + render_stats("auth_client_single_flight", auth_client.single_flight_stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -3,12 +3,35 @@ from dependency_injector import containers, providers
 from .models import RequestResponseLog
 from .repository import RequestResponseLogAlchemyRepository
 from .service import DatabaseLoghandler
+from .sink import BufferedLogSink
+from .spool import LogSpool
 
 
 class LogContainer(containers.DeclarativeContainer):
+    config = providers.Configuration()
+
     token_repository = providers.Factory(
         RequestResponseLogAlchemyRepository, model=RequestResponseLog
     )
     data_base_log_handler = providers.Factory(
         DatabaseLoghandler, repository=token_repository
     )
+    log_spool = providers.Singleton(
+        LogSpool,
+        directory=config.LOG_SPOOL_DIR,
+        segment_bytes=config.LOG_SPOOL_SEGMENT_BYTES,
+        max_bytes=config.LOG_SPOOL_MAX_BYTES,
+    )
+    # one queue and worker per process
+    log_sink = providers.Singleton(
+        BufferedLogSink,
+        repository=token_repository,
+        max_size=config.LOG_SINK_MAX_SIZE,
+        batch_size=config.LOG_SINK_BATCH_SIZE,
+        flush_interval=config.LOG_SINK_FLUSH_INTERVAL,
+        overflow=config.LOG_SINK_OVERFLOW,
+        sample_rate=config.LOG_SINK_SAMPLE_RATE,
+        spool=log_spool,
+        write_timeout=config.LOG_SINK_WRITE_TIMEOUT,
+        retry_interval=config.LOG_SINK_RETRY_INTERVAL,
+    )
@@ -1,7 +1,7 @@
 import uuid
 
 import sqlalchemy as sa
-from sqlalchemy import BigInteger, Column
+from sqlalchemy import DDL, BigInteger, Column, DateTime, Index, event, func
 from sqlalchemy_utils import UUIDType
 
 from application.core.db import Base
@@ -9,8 +9,22 @@ from application.core.db.mixins import TimestampMixin
 
 
 class RequestResponseLog(Base, TimestampMixin):
+    """Range partitioned by month of created_at, see core/db/partition.py"""
+
     __tablename__ = "request_response_log"
+    __table_args__ = (
+        # replayed logs are looked up by request_id
+        Index(
+            "ix_request_response_log_request_id_created_at", "request_id", "created_at"
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # partition key must be part of primary key, which leads with id:
+    # ranges within a month are read by an index of their own
+    created_at = Column(
+        DateTime, primary_key=True, default=func.now(), nullable=False, index=True
+    )
     user_id = Column(sa.INTEGER)
     ip = Column(sa.VARCHAR, nullable=False)
     port = Column(sa.INTEGER, nullable=False)
@@ -19,3 +33,15 @@ class RequestResponseLog(Base, TimestampMixin):
     path = Column(sa.VARCHAR(20), nullable=False)
     response_status = Column(sa.SMALLINT, nullable=False)
     request_id = Column(UUIDType(binary=False), nullable=False, default=uuid.uuid4)
+
+
+# metadata.create_all(tests) gets a partition taking every row, migrations create monthly ones
+event.listen(
+    RequestResponseLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+    ).execute_if(
+        dialect="postgresql"  # type: ignore[arg-type]
+    ),
+)
@@ -1,9 +1,13 @@
-from typing import Type
+import datetime
+import uuid
+from typing import Any, AsyncIterator, Sequence, Type
 
 from dependency_injector.wiring import Provide
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import async_scoped_session
 
 from application.core.base_class.repository import BaseAlchemyRepository
+from application.core.db import session_scope
 
 from .models import RequestResponseLog
 
@@ -11,7 +15,89 @@ session: async_scoped_session = Provide["session"]
 
 
 class RequestResponseLogAlchemyRepository(BaseAlchemyRepository[RequestResponseLog]):
+    """
+    Queries bounded by [start, end) of created_at, partition key,
+    so only partitions of those months are scanned.
+    """
+
     model: Type[RequestResponseLog]
 
     def __init__(self, model):
         super().__init__(model)
+
+    def _between(self, shape: str, build_select):
+        return self.statement(
+            shape,
+            lambda: build_select().where(
+                self.model.created_at >= bindparam("start"),
+                self.model.created_at < bindparam("end"),
+            ),
+        )
+
+    @session_scope
+    async def find_between(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        user_id: int | None = None,
+    ) -> list[RequestResponseLog]:
+        params: dict[str, Any] = {"start": start, "end": end}
+        if user_id is None:
+            query = self._between("between", lambda: select(self.model))  # type: ignore[arg-type]
+        else:
+            query = self._between(
+                "between_by_user",
+                lambda: select(self.model).where(  # type: ignore[arg-type]
+                    self.model.user_id == bindparam("user_id")
+                ),
+            )
+            params["user_id"] = user_id
+        result = await session.execute(query, params)
+        return result.scalars().all()
+
+    @session_scope
+    async def stream_between(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        fetch_size: int | None = None,
+    ) -> AsyncIterator[RequestResponseLog]:
+        """Connection is held while iterating."""
+        query = self._between("between", lambda: select(self.model))  # type: ignore[arg-type]
+        async for log in self._stream(query, fetch_size, {"start": start, "end": end}):
+            yield log
+
+    @session_scope
+    async def find_written_request_ids(
+        self,
+        request_ids: Sequence[uuid.UUID],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> set[uuid.UUID]:
+        """request_ids of rows created within [start, end], both inclusive."""
+        query = self._between(
+            "written_request_ids",
+            lambda: select(self.model.request_id).where(  # type: ignore[arg-type]
+                self.model.request_id.in_(bindparam("request_ids", expanding=True))
+            ),
+        )
+        result = await session.execute(
+            query,
+            {
+                "request_ids": list(request_ids),
+                "start": start,
+                "end": end + datetime.timedelta(microseconds=1),
+            },
+        )
+        return set(result.scalars().all())
+
+    @session_scope
+    async def count_between(
+        self, start: datetime.datetime, end: datetime.datetime
+    ) -> int:
+        query = self._between(
+            "count_between",
+            lambda: select(func.count()).select_from(self.model),  # type: ignore[arg-type]
+        )
+        result = await session.execute(query, {"start": start, "end": end})
+        return result.scalar_one()
@@ -0,0 +1,326 @@
+import asyncio
+import datetime
+import logging
+import random
+import uuid
+from itertools import chain
+from typing import Iterator, Sequence
+
+from dependency_injector.wiring import Provide, inject
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from application.core.db import standalone_session
+from application.core.middlewares.request_log import RequestLogRecord
+
+from .repository import RequestResponseLogAlchemyRepository
+from .service import BaseLogHandler
+from .spool import LogSpool
+
+logger = logging.getLogger(__name__)
+
+DROP = "drop"
+SAMPLE = "sample"
+BLOCK = "block"
+
+Record = dict | RequestLogRecord
+# SQLSTATE classes of rows refused by database: data exception, integrity constraint violation
+REJECTED_SQLSTATE_CLASSES = ("22", "23")
+
+
+def _row(record: Record) -> dict:
+    return record.as_row() if isinstance(record, RequestLogRecord) else record
+
+
+def _is_rejected(e: BaseException) -> bool:
+    """Whether database refused rows themselves, writing them again fails the same way."""
+    if isinstance(e, (DataError, IntegrityError)):
+        return True
+    # asyncpg dialect raises some of them(e.g. value too long) as plain DBAPIError
+    sqlstate = getattr(getattr(e, "orig", None), "sqlstate", None)
+    return isinstance(e, DBAPIError) and str(sqlstate)[:2] in REJECTED_SQLSTATE_CLASSES
+
+
+def _next_batch(batches: Iterator[list[dict]]) -> list[dict] | None:
+    return next(batches, None)
+
+
+class BufferedLogSink(BaseLogHandler):
+    """
+    Request logs queued in memory and written by a background worker,
+    one transaction per batch instead of one per request.
+
+    A batch is flushed when batch_size records are queued or flush_interval seconds passed.
+    When the queue fills up(overflow):
+        drop: new records are dropped.
+        sample: past sample_above of max_size, only sample_rate of new records are kept, dropped when full.
+        block: caller waits for room.
+    Queued records are flushed on close.
+
+    With a spool, a batch failing or taking longer than write_timeout is appended to local spool,
+    and later batches go to the spool directly for retry_interval seconds(circuit open).
+    Once database accepts writes again, spooled records are replayed.
+    Records carry request_id from the start, replay skips those already written.
+
+    A batch refused for its rows(too long, null, constraint violated) is not an outage:
+    it is split in halves until refused records are found alone, those are dropped(rejected),
+    the rest written.
+    """
+
+    def __init__(
+        self,
+        repository: RequestResponseLogAlchemyRepository,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = DROP,
+        sample_rate: float = 0.1,
+        sample_above: float = 0.8,
+        spool: LogSpool | None = None,
+        write_timeout: float = 5.0,
+        retry_interval: float = 30.0,
+    ) -> None:
+        if overflow not in (DROP, SAMPLE, BLOCK):
+            raise ValueError(f"unknown overflow {overflow}")
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.sample_above = int(max_size * sample_above)
+        self.queue: asyncio.Queue[Record] = asyncio.Queue(maxsize=max_size)
+        self.spool = spool
+        self.write_timeout = write_timeout
+        self.retry_interval = retry_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.rejected = 0
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        # loop time until which batches skip database
+        self._open_until = 0.0
+        # leftovers of a previous run are replayed too
+        self._spooled = spool is not None
+        # timed out writes, cancelled, kept until they unwind
+        self._abandoned: set[asyncio.Task] = set()
+
+    async def __call__(self, data: Record) -> None:
+        if isinstance(data, dict):
+            # stamped here, a batch would otherwise get its flush time
+            data.setdefault("created_at", datetime.datetime.utcnow())
+            data.setdefault("updated_at", data["created_at"])
+            # stamped here too, a spooled record is then told apart once written
+            data.setdefault("request_id", uuid.uuid4())
+        if self.overflow == BLOCK and not self._closing:
+            await self.queue.put(data)
+            return
+        if (
+            self.overflow == SAMPLE
+            and self.queue.qsize() >= self.sample_above
+            and random.random() >= self.sample_rate
+        ):
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._closing = False
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop worker after writing every queued record."""
+        self._closing = True
+        if self._worker is not None:
+            await self._worker
+            self._worker = None
+        # records queued while no worker was running
+        while not self.queue.empty():
+            await self.flush(self._take(self.batch_size))
+        if self.spool is not None:
+            await asyncio.to_thread(self.spool.close)
+
+    def _take(self, size: int) -> list[Record]:
+        batch: list[Record] = []
+        while len(batch) < size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _next_batch(self) -> list[Record]:
+        """Wait for a full batch or flush_interval, whichever comes first."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch = self._take(self.batch_size)
+        while len(batch) < self.batch_size and not self._closing:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+            batch.extend(self._take(self.batch_size - len(batch)))
+        return batch
+
+    async def _run(self) -> None:
+        while not self._closing or not self.queue.empty():
+            batch = await self._next_batch()
+            if batch:
+                await self.flush(batch)
+            if self._spooled and not self._closing and not self.circuit_open:
+                await self.replay()
+
+    @property
+    def circuit_open(self) -> bool:
+        return asyncio.get_running_loop().time() < self._open_until
+
+    def _trip(self, size: int, e: BaseException) -> None:
+        self._open_until = asyncio.get_running_loop().time() + self.retry_interval
+        logger.error(f"request log batch of {size} failed: {e!r}")
+
+    async def _write_within_timeout(
+        self, batch: Sequence[Record], replayed: bool = False
+    ) -> None:
+        """
+        Timed out write is cancelled and not waited for, a stalled connection can not hold the worker.
+        A write committed just before timing out is spooled all the same, replay skips its rows.
+        """
+        write = self._write_unwritten(batch) if replayed else self._write(batch)
+        task = asyncio.ensure_future(write)
+        done, _ = await asyncio.wait({task}, timeout=self.write_timeout)
+        if not done:
+            task.cancel()
+            self._abandoned.add(task)
+            task.add_done_callback(self._abandoned.discard)
+            raise asyncio.TimeoutError(f"request log write over {self.write_timeout}s")
+        task.result()
+
+    async def _write_isolating(
+        self, batch: Sequence[Record], replayed: bool = False
+    ) -> int:
+        """
+        Write batch, halves of a refused one apart, a refused record alone is dropped.
+        Halves written before an outage are skipped on replay. Returns count of dropped.
+        """
+        try:
+            await self._write_within_timeout(batch, replayed)
+            return 0
+        except Exception as e:
+            if not _is_rejected(e):
+                raise
+            if len(batch) == 1:
+                self._reject(batch[0], e)
+                return 1
+        half = len(batch) // 2
+        rejected = await self._write_isolating(batch[:half], replayed)
+        return rejected + await self._write_isolating(batch[half:], replayed)
+
+    def _reject(self, record: Record, e: BaseException) -> None:
+        self.rejected += 1
+        row = _row(record)
+        logger.error(
+            f"request log {row.get('request_id')} of {row.get('path')!r} rejected: {e!r}"
+        )
+
+    async def flush(self, batch: list[Record]) -> None:
+        if self.spool is not None and self.circuit_open:
+            await self._spill(batch)
+            return
+        try:
+            self.written += len(batch) - await self._write_isolating(batch)
+        except Exception as e:
+            self._trip(len(batch), e)
+            if self.spool is None:
+                self.failed += len(batch)
+                return
+            await self._spill(batch)
+
+    async def _spill(self, batch: list[Record]) -> None:
+        assert self.spool is not None
+        try:
+            await asyncio.to_thread(
+                self.spool.append, [_row(record) for record in batch]
+            )
+        except OSError as e:
+            self.failed += len(batch)
+            logger.error(f"request log spool of {len(batch)} failed: {e!r}")
+            return
+        self.spilled += len(batch)
+        self._spooled = True
+
+    async def replay(self) -> None:
+        """Write spooled segments to database oldest first, stop at first failure."""
+        assert self.spool is not None
+        spool = self.spool
+        await asyncio.to_thread(spool.rotate)
+        for path in await asyncio.to_thread(spool.sealed_segments):
+            if (claimed := await asyncio.to_thread(spool.claim, path)) is None:
+                continue
+            batches = spool.read_batches(claimed, self.batch_size)
+            replayed = 0
+            # read lazily, a segment is never held in memory as a whole
+            while (batch := await asyncio.to_thread(_next_batch, batches)) is not None:
+                # live records go first, queue must not fill up while replaying
+                while self.queue.qsize() >= self.batch_size:
+                    await self.flush(self._take(self.batch_size))
+                try:
+                    rejected = await self._write_isolating(batch, replayed=True)
+                except Exception as e:
+                    self._trip(len(batch), e)
+                    # what is left goes back to spool, written part is not written twice
+                    await asyncio.to_thread(
+                        spool.append, chain(batch, chain.from_iterable(batches))
+                    )
+                    await asyncio.to_thread(spool.remove, claimed)
+                    return
+                replayed += len(batch) - rejected
+                self.replayed += len(batch) - rejected
+            await asyncio.to_thread(spool.remove, claimed)
+            logger.info(f"replayed {replayed} request logs of {path.name}")
+        self._spooled = False
+
+    @standalone_session
+    async def _write(self, batch: Sequence[Record]) -> None:
+        await self.repository.bulk_insert([_row(record) for record in batch])
+
+    async def _write_unwritten(self, batch: Sequence[Record]) -> None:
+        if unwritten := await self._unwritten([_row(record) for record in batch]):
+            await self._write(unwritten)
+
+    async def _unwritten(self, batch: list[dict]) -> list[dict]:
+        """Spooled rows not in database yet, rows spooled before request_id was stamped are kept."""
+        request_ids = [row["request_id"] for row in batch if row.get("request_id")]
+        if not request_ids:
+            return batch
+        created_at = [row["created_at"] for row in batch]
+        written = await self.repository.find_written_request_ids(
+            request_ids, start=min(created_at), end=max(created_at)
+        )
+        return [row for row in batch if row.get("request_id") not in written]
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "rejected": self.rejected,
+            "spooled_segments": len(self.spool) if self.spool is not None else 0,
+        }
+
+
+@inject
+async def start_log_sink(log_sink=Provide["log_container.log_sink"]) -> None:
+    log_sink.start()
+
+
+@inject
+async def close_log_sink(log_sink=Provide["log_container.log_sink"]) -> None:
+    await log_sink.close()
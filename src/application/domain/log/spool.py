@@ -0,0 +1,184 @@
+import datetime
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".ndjson"
+# being appended to, or being replayed, by process of the pid in name
+OPEN = ".open"
+CLAIMED = ".replaying"
+# restored from iso format on read
+DATETIME_FIELDS = ("created_at", "updated_at")
+UUID_FIELDS = ("request_id",)
+
+
+class LogSpool:
+    """
+    Append only NDJSON spool of request logs, kept on local disk while database is unavailable.
+
+    Records go to the active segment of the process, sealed past segment_bytes.
+    Sealed segments are claimed by one process, replayed oldest first and removed once loaded.
+    Segments left open or claimed by a dead process are sealed again on start.
+    Past max_bytes in total, oldest sealed segments are dropped.
+    File access is blocking, call from a thread.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        max_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._active: IO[bytes] | None = None
+        self._active_path: Path | None = None
+        self.dropped_segments = 0
+        self._recover()
+
+    def _recover(self) -> None:
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob(f"*{SUFFIX}.*"):
+            pid = _owner(path)
+            if pid == os.getpid() or not _alive(pid):
+                path.rename(_sealed(path))
+
+    def sealed_segments(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        # names start with creation time, sort is oldest first
+        return sorted(self.directory.glob(f"*{SUFFIX}"))
+
+    def __len__(self) -> int:
+        return len(self.sealed_segments())
+
+    def size(self) -> int:
+        if not self.directory.exists():
+            return 0
+        total = 0
+        for path in self.directory.glob(f"*{SUFFIX}*"):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def append(self, records: Iterable[dict]) -> None:
+        if self._active is None:
+            self._open()
+        assert self._active is not None
+        for record in records:
+            self._active.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        self._active.flush()
+        if self._active.tell() >= self.segment_bytes:
+            self.rotate()
+        self._enforce_limit()
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._active_path = (
+            self.directory / f"{time.time_ns():020d}-{os.getpid()}{SUFFIX}{OPEN}"
+        )
+        self._active = open(self._active_path, "ab")
+
+    def rotate(self) -> None:
+        """Seal active segment, next append opens a new one."""
+        if self._active is not None:
+            os.fsync(self._active.fileno())
+            self._active.close()
+        if self._active_path is not None:
+            self._active_path.rename(_sealed(self._active_path))
+        self._active = None
+        self._active_path = None
+
+    def close(self) -> None:
+        self.rotate()
+
+    def _enforce_limit(self) -> None:
+        sealed = self.sealed_segments()
+        total = self.size()
+        while total > self.max_bytes and sealed:
+            oldest = sealed.pop(0)
+            try:
+                total -= oldest.stat().st_size
+                oldest.unlink()
+            except FileNotFoundError:
+                # claimed by another process meanwhile
+                continue
+            self.dropped_segments += 1
+            logger.warning(
+                f"log spool over {self.max_bytes} bytes, dropped {oldest.name}"
+            )
+
+    @staticmethod
+    def claim(path: Path) -> Path | None:
+        """Take a sealed segment for replay, None when another process took it."""
+        claimed = path.with_name(f"{path.name}{CLAIMED}-{os.getpid()}")
+        try:
+            path.rename(claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    @staticmethod
+    def read_batches(path: Path, size: int) -> Iterator[list[dict]]:
+        """Records of a segment by batch of size, a torn last line from a crash is skipped."""
+        batch: list[dict] = []
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning(f"skipped broken line of {path.name}")
+                    continue
+                for field in DATETIME_FIELDS:
+                    if isinstance(record.get(field), str):
+                        record[field] = datetime.datetime.fromisoformat(record[field])
+                for field in UUID_FIELDS:
+                    if isinstance(record.get(field), str):
+                        record[field] = uuid.UUID(record[field])
+                batch.append(record)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def release(path: Path) -> None:
+        """Give a claimed segment back, e.g. replay failed."""
+        path.rename(_sealed(path))
+
+    @staticmethod
+    def remove(path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+
+def _sealed(path: Path) -> Path:
+    return path.with_name(path.name.split(SUFFIX)[0] + SUFFIX)
+
+
+def _owner(path: Path) -> int:
+    """pid of process appending to or replaying the segment."""
+    if CLAIMED in path.name:
+        return int(path.name.rsplit("-", 1)[1])
+    return int(path.name.split(SUFFIX)[0].rsplit("-", 1)[1])
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
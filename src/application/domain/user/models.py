@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, Field
 from sqlalchemy import BigInteger, Boolean, Column, Enum, Unicode
 
@@ -37,6 +39,12 @@ class GetUserListResponseSchema(BaseModel):
         orm_mode = True
 
 
+class GetUserListPageResponseSchema(BaseModel):
+    items: List[GetUserListResponseSchema] = Field(..., description="Users")
+    next_cursor: Optional[str] = Field(None, description="Cursor of next page")
+    prev_cursor: Optional[str] = Field(None, description="Cursor of previous page")
+
+
 class CreateUserRequestSchema(BaseModel):
     email: str = Field(..., description="Email")
     password1: str = Field(..., description="Password1")
@@ -52,6 +60,15 @@ class CreateUserResponseSchema(BaseModel):
         orm_mode = True
 
 
+class UpdateUserRequestSchema(BaseModel):
+    nickname: str = Field(..., description="Nickname")
+
+
+class UpdateUserResponseSchema(BaseModel):
+    id: int = Field(..., description="ID")
+    nickname: str = Field(..., description="Nickname")
+
+
 class LoginResponseSchema(BaseModel):
     access_token: str = Field(..., description="Access Token")
     refresh_token: str = Field(..., description="Refresh token")
@@ -1,11 +1,12 @@
-from typing import List, Type
+from typing import Type
 
 from dependency_injector.wiring import Provide
-from sqlalchemy import or_, select
+from sqlalchemy import bindparam, or_, select
 from sqlalchemy.ext.asyncio import async_scoped_session
 
+from application.core.base_class.pagination import KeysetPage
 from application.core.base_class.repository import BaseAlchemyRepository
-from application.core.db import standalone_session
+from application.core.db import session_scope
 
 from .models import User
 
@@ -18,38 +19,59 @@ class UserAlchemyRepository(BaseAlchemyRepository[User]):
     def __init__(self, model):
         super().__init__(model)
 
-    @standalone_session
+    @session_scope
     async def get_user_list(
         self, limit: int = 12, prev: int | None = None
-    ) -> List[User]:
+    ) -> list[User]:
+        """Newest first, of id below prev, at most 12."""
         query = select(self.model)  # type: ignore[arg-type]
-
         if prev is not None:
-            if self.model.id is not None:
-                query = query.where(self.model.id < prev)
-
-        if limit > 12:
-            limit = 12
+            query = query.where(self.model.id < prev)
+        page = await self.paginate(order_by=("-id",), limit=min(limit, 12), query=query)
+        return page.items
 
-        query = query.limit(limit)
-        result = await session.execute(query)
-        return result.scalars().all()
+    @session_scope
+    async def get_user_page(
+        self, limit: int = 12, cursor: str | None = None
+    ) -> KeysetPage[User]:
+        """Newest first."""
+        return await self.paginate(order_by=("-id",), limit=limit, cursor=cursor)
 
-    @standalone_session
+    @session_scope
     async def get_user_by_email(self, email: str) -> User | None:
-        query = select(self.model).filter(self.model.email == email)  # type: ignore[arg-type]
-        result = await session.execute(query)
+        query = self.statement(
+            "by_email",
+            lambda: select(self.model).where(self.model.email == bindparam("email")),  # type: ignore[arg-type]
+        )
+        result = await session.execute(query, {"email": email})
+        return result.scalars().first()
+
+    @session_scope
+    async def get_user_by_nickname(self, nickname: str) -> User | None:
+        query = self.statement(
+            "by_nickname",
+            lambda: select(self.model).where(self.model.nickname == bindparam("nickname")),  # type: ignore[arg-type]
+        )
+        result = await session.execute(query, {"nickname": nickname})
         return result.scalars().first()
 
-    @standalone_session
+    @session_scope
     async def get_user_by_email_or_nickname(
         self, email: str, nickname: str
     ) -> User | None:
-        query = select(self.model).where(or_(self.model.email == email, self.model.nickname == nickname))  # type: ignore[arg-type]
-        result = await session.execute(query)
+        query = self.statement(
+            "by_email_or_nickname",
+            lambda: select(self.model).where(  # type: ignore[arg-type]
+                or_(
+                    self.model.email == bindparam("email"),
+                    self.model.nickname == bindparam("nickname"),
+                )
+            ),
+        )
+        result = await session.execute(query, {"email": email, "nickname": nickname})
         return result.scalars().first()
 
-    @standalone_session
+    @session_scope
     async def save_user(self, email: str, hashed_password, nickname: str) -> None:
         user = self.model(email=email, password=hashed_password, nickname=nickname)
         session.add(user)
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Optional
 
 import bcrypt
@@ -6,6 +7,7 @@ from sqlalchemy.ext.asyncio import async_scoped_session
 
 from application.core.base_class.service import BaseService
 from application.core.db import Transactional
+from application.core.helpers.cache import CacheManager, CacheTag
 from application.domain.auth.service import TokenService
 
 from .exceptions import (
@@ -14,11 +16,17 @@ from .exceptions import (
     PasswordDoesNotMatchException,
     UserNotFoundException,
 )
-from .models import LoginResponseSchema, User
+from .models import (
+    GetUserListPageResponseSchema,
+    GetUserListResponseSchema,
+    LoginResponseSchema,
+)
 from .repository import UserAlchemyRepository
 
 session: async_scoped_session = Provide["session"]
 
+logger = logging.getLogger(__name__)
+
 
 def hash_password(password: str) -> str:
     byte_password = password.encode("utf-8")
@@ -42,11 +50,37 @@ class UserService(BaseService):
         self,
         limit: int = 12,
         prev: Optional[int] = None,
-    ) -> List[User]:
-        return self.repository.get_user_list(limit=limit, prev=prev)
+    ) -> List[GetUserListResponseSchema]:
+        users = await self.repository.get_user_list(limit=limit, prev=prev)
+        return [GetUserListResponseSchema.from_orm(user) for user in users]
 
-    @Transactional()
+    async def get_user_page(
+        self,
+        limit: int = 12,
+        cursor: Optional[str] = None,
+    ) -> GetUserListPageResponseSchema:
+        page = await self.repository.get_user_page(limit=limit, cursor=cursor)
+        return GetUserListPageResponseSchema(
+            items=[GetUserListResponseSchema.from_orm(user) for user in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
+
+    @inject
     async def create_user(
+        self,
+        email: str,
+        password1: str,
+        password2: str,
+        nickname: str,
+        cache_manager: CacheManager = Provide["cache_manager"],
+    ) -> None:
+        """Cached user list pages are removed once creation is committed."""
+        await self._create_user(email, password1, password2, nickname)
+        await self._remove_cached(cache_manager, CacheTag.GET_USER_LIST)
+
+    @Transactional()
+    async def _create_user(
         self, email: str, password1: str, password2: str, nickname: str
     ) -> None:
         if password1 != password2:
@@ -63,6 +97,51 @@ class UserService(BaseService):
             email=email, hashed_password=hashed_password, nickname=nickname
         )
 
+    @inject
+    async def update_user(
+        self,
+        user_id: int,
+        params: dict,
+        cache_manager: CacheManager = Provide["cache_manager"],
+    ) -> None:
+        """Cached responses listing the user are removed once update is committed."""
+        await self._update_user(user_id, params)
+        await self._remove_cached(cache_manager, CacheTag.USER.of(user_id))
+
+    @Transactional()
+    async def _update_user(self, user_id: int, params: dict) -> None:
+        if not await self.repository.get_by_id(id=user_id):
+            raise UserNotFoundException
+        if "nickname" in params:
+            exist_user = await self.repository.get_user_by_nickname(params["nickname"])
+            if exist_user and exist_user.id != user_id:
+                raise DuplicateEmailOrNicknameException
+        await self.repository.update_by_id(user_id, params)
+
+    @inject
+    async def delete_user(
+        self,
+        user_id: int,
+        cache_manager: CacheManager = Provide["cache_manager"],
+    ) -> None:
+        """Cached responses listing the user are removed once deletion is committed."""
+        await self._delete_user(user_id)
+        await self._remove_cached(cache_manager, CacheTag.USER.of(user_id))
+
+    @Transactional()
+    async def _delete_user(self, user_id: int) -> None:
+        if not await self.repository.get_by_id(id=user_id):
+            raise UserNotFoundException
+        await self.repository.delete_by_id(user_id)
+
+    @staticmethod
+    async def _remove_cached(cache_manager: CacheManager, tag: CacheTag | str) -> None:
+        """Committed write does not fail with cache, entries left are served until their ttl."""
+        try:
+            await cache_manager.remove_by_tag(tag)
+        except Exception as e:
+            logger.warning(f"cache removal of {tag} failed: {e!r}")
+
     async def is_admin(self, user_id: int) -> bool:
         user = await self.repository.get_by_id(id=user_id)
         if not user:
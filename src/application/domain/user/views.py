@@ -3,17 +3,22 @@ from typing import List
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Query
 
+from application.core.authority.permissions import IsHigherOrEqualAdmin
 from application.core.dependencies import PermissionDependency
 from application.core.fastapi.log_route import LogRoute
+from application.core.helpers.cache import CacheTag
 from application.core.helpers.cache.cache_manager import cached
 
 from .models import (
     CreateUserRequestSchema,
     CreateUserResponseSchema,
     ErrorResponse,
+    GetUserListPageResponseSchema,
     GetUserListResponseSchema,
     LoginRequest,
     LoginResponse,
+    UpdateUserRequestSchema,
+    UpdateUserResponseSchema,
 )
 from .service import UserService
 
@@ -27,7 +32,12 @@ user_router = APIRouter(route_class=LogRoute)
     responses={"400": {"model": ErrorResponse}},
     dependencies=[Depends(PermissionDependency([]))],
 )
-@cached(prefix="get_user_list", ttl=60)
+@cached(
+    tag=CacheTag.GET_USER_LIST,
+    ttl=60,
+    lock=True,
+    tags=lambda users: [CacheTag.USER.of(user.id) for user in users],
+)
 @inject
 async def get_user_list(
     limit: int = Query(10, description="Limit"),
@@ -37,6 +47,28 @@ async def get_user_list(
     return await user_service.get_user_list(limit=limit, prev=prev)
 
 
+@user_router.get(
+    "/page",
+    response_model=GetUserListPageResponseSchema,
+    response_model_exclude={"items": {"__all__": {"id"}}},
+    responses={"400": {"model": ErrorResponse}},
+    dependencies=[Depends(PermissionDependency([]))],
+)
+@cached(
+    tag=CacheTag.GET_USER_LIST,
+    ttl=60,
+    lock=True,
+    tags=lambda page: [CacheTag.USER.of(user.id) for user in page.items],
+)
+@inject
+async def get_user_page(
+    limit: int = Query(10, ge=1, le=100, description="Limit"),
+    cursor: str = Query(None, description="Cursor of next or previous page"),
+    user_service: UserService = Depends(Provide["user_container.user_service"]),
+):
+    return await user_service.get_user_page(limit=limit, cursor=cursor)
+
+
 @user_router.post(
     "",
     response_model=CreateUserResponseSchema,
@@ -51,6 +83,36 @@ async def create_user(
     return {"email": request.email, "nickname": request.nickname}
 
 
+@user_router.patch(
+    "/{user_id}",
+    response_model=UpdateUserResponseSchema,
+    responses={"400": {"model": ErrorResponse}, "404": {"model": ErrorResponse}},
+    dependencies=[Depends(PermissionDependency([IsHigherOrEqualAdmin]))],
+)
+@inject
+async def update_user(
+    user_id: int,
+    request: UpdateUserRequestSchema,
+    user_service: UserService = Depends(Provide["user_container.user_service"]),
+):
+    await user_service.update_user(user_id, request.dict())
+    return {"id": user_id, "nickname": request.nickname}
+
+
+@user_router.delete(
+    "/{user_id}",
+    status_code=204,
+    responses={"404": {"model": ErrorResponse}},
+    dependencies=[Depends(PermissionDependency([IsHigherOrEqualAdmin]))],
+)
+@inject
+async def delete_user(
+    user_id: int,
+    user_service: UserService = Depends(Provide["user_container.user_service"]),
+):
+    await user_service.delete_user(user_id)
+
+
 @user_router.post(
     "/login",
     response_model=LoginResponse,
@@ -7,11 +7,15 @@ from fastapi import FastAPI, Request
 
 from application.api import router
 from application.container import AppContainer
+from application.core.db import dispose_engines, start_replica_health_check
 from application.core.enums import ResponseCode
 from application.core.exceptions import CustomException
+from application.core.external_service.auth_client import close_auth_client
 from application.core.external_service.http_client import Aiohttp
 from application.core.fastapi.custom_json_response import CustomORJSONResponse
-from application.domain.log.service import DatabaseLoghandler
+from application.core.helpers.cache.cache_manager import close_cache_manager
+from application.core.middlewares.request_log import log_path
+from application.domain.log.sink import BufferedLogSink, close_log_sink, start_log_sink
 
 nest_asyncio.apply()
 
@@ -23,7 +27,8 @@ def init_routers(app_: FastAPI) -> None:
 @inject
 def init_listeners(
     app_: FastAPI,
-    log_handler: DatabaseLoghandler = Provide["log_container.db_log_handler"],
+    log_handler: BufferedLogSink = Provide["log_container.log_sink"],
+    request_log_mode: str = Provide["config.REQUEST_LOG_MODE"],
 ) -> None:
     """
     Order of presence is not affecting handler.
@@ -37,16 +42,18 @@ def init_listeners(
         """
         try:
             # fill your logging
-            log_data = {
-                "user_id": request.user.user_id,
-                "ip": request.client.host if request.client else None,
-                "port": request.client.port if request.client else None,
-                "method": request.method,
-                "path": request.url.path,
-                "agent": dict(request.headers.items())["user-agent"],
-                "response_status": HTTPStatus.INTERNAL_SERVER_ERROR,
-            }
-            await log_handler(log_data)
+            # RequestLogMiddleware logs the failed request itself
+            if request_log_mode != "middleware":
+                log_data = {
+                    "user_id": request.user.user_id,
+                    "ip": request.client.host if request.client else "",
+                    "port": request.client.port if request.client else 0,
+                    "method": request.method,
+                    "path": log_path(request.url.path),
+                    "agent": request.headers.get("user-agent", ""),
+                    "response_status": HTTPStatus.INTERNAL_SERVER_ERROR,
+                }
+                await log_handler(log_data)
             return CustomORJSONResponse(
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
                 content={"code": ResponseCode.UNDEFINED_ERROR, "message": exc},
@@ -80,8 +87,16 @@ async def create_app() -> FastAPI:
         docs_url=None if config.ENV() == "production" else "/docs",
         redoc_url=None if config.ENV() == "production" else "/redoc",
         middleware=middlewares,
-        on_startup=[],
-        on_shutdown=[Aiohttp.on_shutdown],
+        on_startup=[start_replica_health_check, start_log_sink],
+        # background refresh stops before http session is closed,
+        # log sink flushes before engines are disposed
+        on_shutdown=[
+            close_auth_client,
+            close_cache_manager,
+            Aiohttp.on_shutdown,
+            close_log_sink,
+            dispose_engines,
+        ],
     )
 
     init_routers(app_=app_)
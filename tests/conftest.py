@@ -29,6 +29,8 @@ async def async_create_all():
     async with engine.begin() as conn:
         # Use run_sync() to run metadata.create_all() asynchronously
         await conn.run_sync(Base.metadata.create_all)
+    # engine is a singleton, connections must not outlive this event loop
+    await engine.dispose()
 
 
 asyncio.run(async_create_all())
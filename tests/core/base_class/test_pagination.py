@@ -0,0 +1,69 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlalchemy.orm import declarative_base
+
+from application.core.base_class.pagination import (
+    BACKWARD,
+    FORWARD,
+    Keyset,
+    decode_cursor,
+    encode_cursor,
+)
+from application.core.exceptions import InvalidCursorException
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(BigInteger, primary_key=True)
+    created_at = Column(DateTime)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(FORWARD, [3, "a"])
+
+    assert decode_cursor(cursor, 2) == (FORWARD, [3, "a"])
+
+
+def test_tampered_cursor_is_rejected():
+    with pytest.raises(InvalidCursorException):
+        decode_cursor("not-a-cursor", 1)
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(encode_cursor(FORWARD, [1]), 2)
+
+
+def test_id_is_appended_as_tie_breaker():
+    keyset = Keyset(Item, ["-created_at"])
+
+    assert [key.name for key in keyset.keys] == ["created_at", "id"]
+    assert str(keyset.after(FORWARD, [datetime.datetime(2023, 1, 1), 1])) == (
+        "items.created_at < :created_at_1 "
+        "OR items.created_at = :created_at_2 AND items.id > :id_1"
+    )
+
+
+def test_first_page_has_only_next_cursor():
+    keyset = Keyset(Item, ["id"])
+    rows = [SimpleNamespace(id=i) for i in range(1, 5)]
+
+    page = keyset.page(rows, limit=3, direction=FORWARD, cursor=None)
+
+    assert [item.id for item in page.items] == [1, 2, 3]
+    assert decode_cursor(page.next_cursor, 1) == (FORWARD, [3])
+    assert page.prev_cursor is None
+
+
+def test_backward_page_is_returned_in_sort_order():
+    keyset = Keyset(Item, ["id"])
+    rows = [SimpleNamespace(id=i) for i in (6, 5, 4)]
+
+    page = keyset.page(rows, limit=3, direction=BACKWARD, cursor="cursor")
+
+    assert [item.id for item in page.items] == [4, 5, 6]
+    assert decode_cursor(page.next_cursor, 1) == (FORWARD, [6])
+    assert page.prev_cursor is None
@@ -0,0 +1,213 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event, select
+
+from application.core.db import standalone_session
+from application.core.enums.repository import SynchronizeSessionEnum
+from application.domain.auth.models import Token
+from application.domain.user.models import User
+from application.server import app
+
+root_container = app.container
+token_repository = root_container.auth_container.token_repository()
+user_repository = root_container.user_container.user_repository()
+
+USER_ID = 99998
+
+
+async def loaded_token(refresh_token: str) -> Token:
+    token = Token(user_id=USER_ID, refresh_token=refresh_token)
+    session = root_container.session()
+    session.add(token)
+    await session.flush()
+    return token
+
+
+@pytest.mark.parametrize(
+    "synchronize_session",
+    [SynchronizeSessionEnum.EVALUATE, SynchronizeSessionEnum.FETCH],
+)
+@pytest.mark.asyncio
+async def test_update_by_id_synchronizes_loaded_object(synchronize_session):
+    @standalone_session
+    async def update():
+        token = await loaded_token(f"sync-{synchronize_session.name}")
+
+        await token_repository.update_by_id(
+            token.id, {"is_valid": False}, synchronize_session=synchronize_session
+        )
+
+        assert token.is_valid is False
+        await root_container.session().delete(token)
+
+    await update()
+
+
+@pytest.mark.asyncio
+async def test_update_by_id_without_synchronization_is_written():
+    @standalone_session
+    async def create() -> int:
+        return (await loaded_token("unsynchronized")).id
+
+    @standalone_session
+    async def update(id: int):
+        await token_repository.update_by_id(id, {"is_valid": False})
+        await token_repository.update_by_id(id, {"refresh_token": "updated"})
+
+    @standalone_session
+    async def read_and_delete(id: int) -> Token:
+        session = root_container.session()
+        token = await session.get(Token, id)
+        await session.delete(token)
+        return token
+
+    id = await create()
+    await update(id)
+    token = await read_and_delete(id)
+
+    assert (token.is_valid, token.refresh_token) == (False, "updated")
+
+
+@pytest.mark.asyncio
+async def test_make_all_token_invalid_synchronizes_loaded_tokens():
+    @standalone_session
+    async def invalidate():
+        tokens = [await loaded_token(f"invalidate-{i}") for i in range(2)]
+
+        await token_repository.make_all_token_invalid(USER_ID)
+
+        assert [token.is_valid for token in tokens] == [False, False]
+        for token in tokens:
+            await root_container.session().delete(token)
+
+    await invalidate()
+
+
+def bulk_user(i: int, nickname: str | None = None) -> dict:
+    return {
+        "email": f"bulk_{i}@mail.com",
+        "password": "password",
+        "nickname": nickname or f"bulk_{i}",
+    }
+
+
+@standalone_session
+async def bulk_nicknames() -> dict[str, str]:
+    result = await root_container.session().execute(
+        select(User.email, User.nickname).where(User.email.like("bulk_%"))
+    )
+    return dict(result.all())
+
+
+@standalone_session
+async def delete_bulk_users() -> None:
+    await root_container.session().execute(
+        delete(User)
+        .where(User.email.like("bulk_%"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+@pytest_asyncio.fixture
+async def inserts():
+    """INSERT statements sent by writer, executemany counted once."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    engine = root_container.writer_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+    await delete_bulk_users()
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_executes_many_per_chunk(inserts):
+    rows = await standalone_session(user_repository.bulk_insert)(
+        [bulk_user(i) for i in range(5)], chunk_size=2
+    )
+
+    assert rows == []
+    assert len(inserts) == 3
+    assert len(await bulk_nicknames()) == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_returns_rows_in_order(inserts):
+    values = [bulk_user(i) for i in range(5)]
+
+    rows = await standalone_session(user_repository.bulk_insert)(
+        values, chunk_size=2, returning=("id", "email")
+    )
+
+    assert [row.email for row in rows] == [value["email"] for value in values]
+    assert len({row.id for row in rows}) == 5
+    assert len(inserts) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_on_conflict_target(inserts):
+    inserted = await standalone_session(user_repository.bulk_insert)(
+        [bulk_user(i) for i in range(2)], returning=("id",)
+    )
+
+    rows = await standalone_session(user_repository.bulk_upsert)(
+        [bulk_user(i, nickname=f"bulk_upserted_{i}") for i in range(3)],
+        index_elements=["email"],
+        update_fields=["nickname"],
+        returning=("id", "nickname"),
+    )
+
+    assert [row.id for row in rows[:2]] == [row.id for row in inserted]
+    assert [row.nickname for row in rows] == [f"bulk_upserted_{i}" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_without_update_fields_does_nothing_on_conflict(inserts):
+    await standalone_session(user_repository.bulk_insert)([bulk_user(0)])
+
+    rows = await standalone_session(user_repository.bulk_upsert)(
+        [bulk_user(i, nickname=f"bulk_upserted_{i}") for i in range(2)],
+        index_elements=["email"],
+        update_fields=[],
+        returning=("email",),
+    )
+
+    assert [row.email for row in rows] == ["bulk_1@mail.com"]
+    assert (await bulk_nicknames())["bulk_0@mail.com"] == "bulk_0"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_ids_sets_each_row(inserts):
+    rows = await standalone_session(user_repository.bulk_insert)(
+        [bulk_user(i) for i in range(3)], returning=("id", "email")
+    )
+
+    await standalone_session(user_repository.bulk_update_by_ids)(
+        [{"id": row.id, "nickname": f"bulk_updated_{row.id}"} for row in rows],
+        chunk_size=2,
+    )
+
+    assert await bulk_nicknames() == {
+        row.email: f"bulk_updated_{row.id}" for row in rows
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_by_condition_outside_request_scope(inserts):
+    await standalone_session(user_repository.bulk_insert)(
+        [bulk_user(i, nickname="bulk_streamed") for i in range(1)]
+        + [bulk_user(i) for i in range(1, 3)]
+    )
+
+    streamed = [
+        user.email
+        async for user in user_repository.stream_by_or_condition(
+            {"nickname": "bulk_streamed", "email": "bulk_2@mail.com"}, fetch_size=1
+        )
+    ]
+
+    assert sorted(streamed) == ["bulk_0@mail.com", "bulk_2@mail.com"]
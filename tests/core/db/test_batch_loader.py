@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from application.core.db import batch_loader, standalone_session
+from application.core.db.batch_loader import BatchLoader
+from application.domain.auth.models import Token
+from application.domain.user.models import User
+from application.server import app
+
+root_container = app.container
+
+USER_ID = 99997
+
+
+@standalone_session
+async def add_tokens(count: int) -> list[int]:
+    tokens = [Token(user_id=USER_ID, refresh_token="batch") for _ in range(count)]
+    session = root_container.session()
+    session.add_all(tokens)
+    await session.flush()
+    return [token.id for token in tokens]
+
+
+@pytest_asyncio.fixture
+async def ids():
+    yield await add_tokens(3)
+
+    @standalone_session
+    async def delete_tokens():
+        await root_container.session().execute(
+            delete(Token)
+            .where(Token.user_id == USER_ID)
+            .execution_options(synchronize_session=False)
+        )
+
+    await delete_tokens()
+
+
+@pytest.mark.asyncio
+async def test_loads_of_one_tick_are_sent_as_one_query(ids):
+    @standalone_session
+    async def load():
+        loader = BatchLoader.of(Token)
+
+        tokens = await loader.load_many([ids[2], ids[0], ids[1], ids[0]])
+
+        assert [token.id for token in tokens] == [ids[2], ids[0], ids[1], ids[0]]
+        assert await loader.load(ids[1]) is tokens[2]
+        assert loader.queries == 1
+
+    await load()
+
+
+@pytest.mark.asyncio
+async def test_misses_are_not_kept(ids):
+    @standalone_session
+    async def load():
+        loader = BatchLoader.of(Token)
+        missing = ids[-1] + 1
+        assert await loader.load(missing) is None
+
+        # committed by another session meanwhile
+        (added,) = await add_tokens(1)
+
+        assert added == missing
+        assert (await loader.load(missing)).id == missing
+        assert loader.queries == 2
+
+    await load()
+
+
+class FakeSession:
+    """Session answering every query with no rows, counting queries in flight."""
+
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute(self, query, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return Result()
+
+
+class Result:
+    def scalars(self):
+        return self
+
+    def all(self) -> list:
+        return []
+
+
+@pytest.mark.asyncio
+async def test_loaders_of_one_session_query_one_at_a_time(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(batch_loader, "session", session)
+
+    async def load_later():
+        # sent while first batch of Token is in flight
+        await asyncio.sleep(0.005)
+        return await BatchLoader.of(Token).load(2)
+
+    loaded = await asyncio.gather(
+        BatchLoader.of(Token).load(1), BatchLoader.of(User).load(1), load_later()
+    )
+
+    assert loaded == [None, None, None]
+    assert session.max_in_flight == 1
@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from application.core.db.partition import MonthlyPartitions, add_months, month_floor
+from application.server import app
+
+
+def test_add_months_crosses_year():
+    assert add_months(datetime.date(2024, 11, 1), 3) == datetime.date(2025, 2, 1)
+    assert add_months(datetime.date(2024, 1, 1), -1) == datetime.date(2023, 12, 1)
+
+
+def test_month_floor():
+    assert month_floor(datetime.datetime(2024, 2, 29, 23, 59)) == datetime.date(
+        2024, 2, 1
+    )
+
+
+def test_partition_covers_one_month():
+    partitions = MonthlyPartitions(engine=None, table="request_response_log")
+
+    assert (
+        partitions.name(datetime.date(2024, 12, 1)) == "request_response_log_p2024_12"
+    )
+    assert partitions.create_statement(datetime.date(2024, 12, 15)) == (
+        'CREATE TABLE IF NOT EXISTS "request_response_log_p2024_12"'
+        ' PARTITION OF "request_response_log"'
+        " FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+
+
+@pytest_asyncio.fixture
+async def partitions():
+    partitions = MonthlyPartitions(
+        engine=app.container.writer_engine(), table="request_response_log"
+    )
+    before = set(await partitions.months())
+    yield partitions
+    async with partitions.engine.begin() as conn:
+        for month in set(await partitions.months()) - before:
+            await conn.execute(text(f'DROP TABLE "{partitions.name(month)}"'))
+
+
+async def count(partitions: MonthlyPartitions, table: str, where: str = "TRUE") -> int:
+    async with partitions.engine.connect() as conn:
+        return await conn.scalar(text(f'SELECT count(*) FROM "{table}" WHERE {where}'))
+
+
+@pytest.mark.asyncio
+async def test_premake_creates_missing_months_once(partitions):
+    today = datetime.date(2090, 12, 10)
+
+    created = await partitions.premake(months_ahead=1, today=today)
+
+    assert created == ["request_response_log_p2090_12", "request_response_log_p2091_01"]
+    assert await partitions.premake(months_ahead=1, today=today) == []
+
+
+@pytest.mark.asyncio
+async def test_premake_moves_rows_of_month_out_of_default(partitions):
+    async with partitions.engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO request_response_log"
+                " (created_at, updated_at, ip, port, agent, method, path, response_status, request_id)"
+                " VALUES ('2092-03-15', '2092-03-15', '', 0, '', 'GET', '/', 200, gen_random_uuid())"
+            )
+        )
+
+    created = await partitions.premake(months_ahead=1, today=datetime.date(2092, 3, 1))
+
+    assert created == ["request_response_log_p2092_03", "request_response_log_p2092_04"]
+    assert await count(partitions, "request_response_log_p2092_03") == 1
+    left_in_default = await count(
+        partitions, "request_response_log_default", "created_at >= '2092-01-01'"
+    )
+    assert left_in_default == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_older_than_keeps_retention_months(partitions):
+    await partitions.premake(months_ahead=2, today=datetime.date(2093, 1, 1))
+
+    dropped = await partitions.drop_older_than(
+        retention_months=2, today=datetime.date(2093, 3, 1)
+    )
+
+    assert dropped == ["request_response_log_p2093_01"]
+    assert datetime.date(2093, 2, 1) in await partitions.months()
@@ -0,0 +1,32 @@
+import time
+
+from application.core.db.read_your_writes import (
+    WriteState,
+    sign_write_token,
+    verify_write_token,
+)
+
+
+def test_write_token_round_trip():
+    last_write_at = time.time()
+    token = sign_write_token("secret", last_write_at)
+
+    assert verify_write_token("secret", token) == round(last_write_at, 3)
+
+
+def test_forged_write_token_is_rejected():
+    token = sign_write_token("secret", time.time())
+
+    assert verify_write_token("other", token) is None
+    assert verify_write_token("secret", "1.0.bad") is None
+
+
+def test_reads_are_pinned_within_window():
+    state = WriteState(window=5)
+    assert state.pinned_to() is None
+
+    state.mark_write()
+    assert state.pinned_to() == state.last_write_at
+
+    state.last_write_at -= 10
+    assert state.pinned_to() is None
@@ -0,0 +1,84 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from application.core.config.settings_model import Settings
+from application.core.db.replica import ReplicaSet
+
+
+def make_engine(name: str, checked_out: int = 0):
+    pool = SimpleNamespace(checkedout=lambda: checked_out)
+    return SimpleNamespace(name=name, sync_engine=SimpleNamespace(pool=pool))
+
+
+def test_round_robin_follows_weights():
+    readers = [make_engine("a"), make_engine("b")]
+    replica_set = ReplicaSet(
+        writer=make_engine("writer"),
+        readers=readers,
+        weights=[3, 1],
+        balancer="round_robin",
+    )
+
+    picks = Counter(replica_set.choose().name for _ in range(8))
+
+    assert picks == {"a": 6, "b": 2}
+
+
+def test_least_outstanding_picks_idle_replica():
+    replica_set = ReplicaSet(
+        writer=make_engine("writer"),
+        readers=[make_engine("busy", checked_out=4), make_engine("idle")],
+    )
+
+    assert replica_set.choose().name == "idle"
+
+
+def test_writer_serves_reads_when_no_replica_is_healthy():
+    writer = make_engine("writer")
+    replica_set = ReplicaSet(writer=writer, readers=[make_engine("a")])
+    replica_set.replicas[0].healthy = False
+
+    assert replica_set.choose() is writer
+    assert replica_set.is_available(writer)
+
+
+def test_pinned_reads_skip_replicas_behind_last_write():
+    behind, caught_up = make_engine("behind"), make_engine("caught_up")
+    replica_set = ReplicaSet(writer=make_engine("writer"), readers=[behind, caught_up])
+    replica_set.replicas[0].lag, replica_set.replicas[0].replayed_until = 3.0, 97.0
+    replica_set.replicas[1].lag, replica_set.replicas[1].replayed_until = 0.0, 101.0
+
+    assert replica_set.choose(written_at=100.0) is caught_up
+    assert not replica_set.is_available(behind, written_at=100.0)
+
+
+def test_empty_reader_urls_fall_back_to_reader_url(monkeypatch):
+    created = []
+    monkeypatch.setattr(
+        "application.core.db.replica.create_engine",
+        lambda url, **kwargs: created.append(url) or make_engine(url),
+    )
+
+    ReplicaSet.from_urls(
+        writer=make_engine("writer"), urls=[""], fallback_url="postgresql://reader"
+    )
+
+    assert created == ["postgresql://reader"]
+
+
+def test_more_weights_than_replicas_are_rejected():
+    with pytest.raises(ValueError):
+        ReplicaSet(
+            writer=make_engine("writer"), readers=[make_engine("a")], weights=[1, 2]
+        )
+
+
+def test_empty_weights_setting_is_parsed_as_no_weights(monkeypatch):
+    monkeypatch.setenv("READER_DB_URLS", "")
+    monkeypatch.setenv("READER_DB_WEIGHTS", "")
+
+    settings = Settings()
+
+    assert (settings.READER_DB_URLS, settings.READER_DB_WEIGHTS) == ([], [])
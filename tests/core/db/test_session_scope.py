@@ -0,0 +1,106 @@
+from contextlib import aclosing
+
+import pytest
+
+from application.core.db import session_scope, standalone_session_maker
+from application.core.db.session_maker import (
+    get_session_context,
+    has_session_context,
+    reset_session_context,
+    set_session_context,
+)
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def commit(self) -> None:
+        self.calls.append("commit")
+
+    async def rollback(self) -> None:
+        self.calls.append("rollback")
+
+    async def remove(self) -> None:
+        self.calls.append("remove")
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(standalone_session_maker, "session", session)
+    return session
+
+
+@session_scope
+async def current_scope() -> str:
+    return get_session_context()
+
+
+@session_scope
+async def fail() -> None:
+    raise ValueError("failed")
+
+
+@session_scope
+async def stream_scopes():
+    for _ in range(2):
+        yield get_session_context() if has_session_context() else None
+
+
+@pytest.mark.asyncio
+async def test_joins_surrounding_scope_without_commit(session):
+    context = set_session_context("request")
+    try:
+        assert await current_scope() == "request"
+    finally:
+        reset_session_context(context)
+
+    assert session.calls == []
+
+
+@pytest.mark.asyncio
+async def test_runs_standalone_outside_any_scope(session):
+    await current_scope()
+
+    assert session.calls == ["commit", "remove"]
+    assert not has_session_context()
+
+
+@pytest.mark.asyncio
+async def test_standalone_scope_is_rolled_back_on_error(session):
+    with pytest.raises(ValueError):
+        await fail()
+
+    assert session.calls == ["rollback", "remove"]
+
+
+@pytest.mark.asyncio
+async def test_stream_runs_standalone_within_its_steps_only(session):
+    scopes = []
+    async for scope in stream_scopes():
+        scopes.append(scope)
+        assert not has_session_context()
+
+    assert scopes[0] is not None and scopes == [scopes[0]] * 2
+    assert session.calls == ["commit", "remove"]
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early_releases_its_session(session):
+    async with aclosing(stream_scopes()) as stream:
+        async for _ in stream:
+            break
+
+    assert session.calls == ["remove"]
+
+
+@pytest.mark.asyncio
+async def test_stream_joins_surrounding_scope(session):
+    context = set_session_context("request")
+    try:
+        assert [scope async for scope in stream_scopes()] == ["request"] * 2
+    finally:
+        reset_session_context(context)
+
+    assert session.calls == []
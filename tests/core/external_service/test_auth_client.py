@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from application.core.external_service.auth_client import AuthClient
+
+
+class FakeResponse:
+    def __init__(self, body: dict) -> None:
+        self.body = body
+
+    async def json(self) -> dict:
+        return self.body
+
+
+class ServerTokenAuthClient(AuthClient):
+    """Client credentials grant answered locally, token_1, token_2, ..."""
+
+    def __init__(self, expires_in: float, **kwargs) -> None:
+        super().__init__(
+            auth_base_url="http://auth",
+            client_id="client",
+            client_secret="secret",
+            refresh_token_key="refresh",
+            session=None,
+            **kwargs,
+        )
+        self.expires_in = expires_in
+        self.issued = 0
+
+    async def _post(self, url: str, **kwargs) -> FakeResponse:
+        self.issued += 1
+        return FakeResponse(
+            {"access_token": f"token_{self.issued}", "expires_in": self.expires_in}
+        )
+
+
+@pytest.mark.asyncio
+async def test_server_token_is_cached_until_refresh():
+    auth_client = ServerTokenAuthClient(expires_in=600)
+
+    tokens = [await auth_client.get_server_access_token() for _ in range(3)]
+
+    assert tokens == ["token_1"] * 3
+    assert auth_client.issued == 1
+    await auth_client.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_server_token_is_issued_again():
+    # expiry skew makes a token of 5 seconds expired at once
+    auth_client = ServerTokenAuthClient(expires_in=5)
+
+    assert await auth_client.get_server_access_token() == "token_1"
+    assert await auth_client.get_server_access_token() == "token_2"
+    await auth_client.close()
+
+
+@pytest.mark.asyncio
+async def test_server_token_refresh_is_scheduled_at_refresh_at():
+    auth_client = ServerTokenAuthClient(expires_in=600, server_token_refresh_margin=30)
+    await auth_client.get_server_access_token()
+
+    timer = auth_client._server_token_timer
+    assert timer is not None
+    assert timer.when() - asyncio.get_running_loop().time() == pytest.approx(570, abs=1)
+    await auth_client.close()
+    assert auth_client._server_token_timer is None
+
+
+@pytest.mark.asyncio
+async def test_server_token_is_refreshed_in_background_without_calls():
+    auth_client = ServerTokenAuthClient(expires_in=600)
+    await auth_client.get_server_access_token()
+
+    # as if refresh_at was reached
+    auth_client._schedule_server_token_refresh(0.01)
+    await asyncio.sleep(0.05)
+
+    assert auth_client.issued == 2
+    assert await auth_client.get_server_access_token() == "token_2"
+    await auth_client.close()
+
+
+@pytest.mark.asyncio
+async def test_close_stops_background_refresh():
+    auth_client = ServerTokenAuthClient(expires_in=600)
+    await auth_client.get_server_access_token()
+    auth_client._schedule_server_token_refresh(0.01)
+
+    await auth_client.close()
+    await asyncio.sleep(0.05)
+
+    assert auth_client.issued == 1
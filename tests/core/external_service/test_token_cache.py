@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from application.core.enums import ResponseCode
+from application.core.external_service.token_cache import VerifiedTokenCache
+
+
+@pytest.mark.asyncio
+async def test_positive_entry_is_bounded_by_token_exp():
+    token_cache = VerifiedTokenCache(max_ttl=60)
+    await token_cache.set("valid-token", ResponseCode.OK, exp=time.time() + 30)
+    assert await token_cache.get("valid-token") == ResponseCode.OK
+
+    await token_cache.set("expired-token", ResponseCode.OK, exp=time.time() - 1)
+    assert await token_cache.get("expired-token") is None
+
+
+@pytest.mark.asyncio
+async def test_negative_entry_and_invalidate():
+    token_cache = VerifiedTokenCache(max_ttl=60, negative_ttl=10)
+    await token_cache.set("invalid-token", ResponseCode.TOKEN_INVALID)
+    assert await token_cache.get("invalid-token") == ResponseCode.TOKEN_INVALID
+
+    await token_cache.set("revoked-token", ResponseCode.OK)
+    await token_cache.invalidate("revoked-token")
+    assert await token_cache.get("revoked-token") == ResponseCode.TOKEN_REVOKED
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    token_cache = VerifiedTokenCache(max_size=2)
+    await token_cache.set("first", ResponseCode.OK)
+    await token_cache.set("second", ResponseCode.OK)
+    await token_cache.get("first")
+    await token_cache.set("third", ResponseCode.OK)
+
+    assert await token_cache.get("second") is None
+    assert await token_cache.get("first") == ResponseCode.OK
+
+
+@pytest.mark.asyncio
+async def test_revocation_reaches_every_worker_through_redis():
+    redis = FakeRedis()
+    workers = [VerifiedTokenCache(use_redis=True) for _ in range(2)]
+    for worker in workers:
+        worker.redis_provider = lambda: redis
+    await workers[0].set("shared-token", ResponseCode.OK)
+    assert await workers[1].get("shared-token") == ResponseCode.OK
+
+    await workers[0].invalidate("shared-token")
+
+    assert await workers[1].get("shared-token") == ResponseCode.TOKEN_REVOKED
@@ -0,0 +1,31 @@
+from application.core.fastapi.log_policy import LOG_ERRORS, LogPolicy
+
+
+def test_server_errors_are_always_logged():
+    policy = LogPolicy(sample_rate=0, client_error_sample_rate=0)
+
+    assert policy.should_log(500)
+    assert policy.should_log(503)
+    assert not policy.should_log(200)
+    assert not policy.should_log(404)
+
+
+def test_success_is_sampled():
+    policy = LogPolicy(sample_rate=0.1)
+    logged = sum(policy.should_log(200) for _ in range(10000))
+
+    assert 500 < logged < 1500
+    assert policy.should_log(404)
+
+
+def test_skip_paths_from_settings():
+    policy = LogPolicy.from_settings(skip_paths=["/health", ""])
+
+    assert policy.skips("/health")
+    assert not policy.skips("/api/v1/users")
+    assert policy.skip_paths == frozenset({"/health"})
+
+
+def test_errors_only_policy():
+    assert LOG_ERRORS.should_log(500)
+    assert not LOG_ERRORS.should_log(401)
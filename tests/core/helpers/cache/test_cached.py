@@ -0,0 +1,143 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+
+import pytest
+
+from application.core.db.session_maker import (
+    reset_session_context,
+    session_context,
+    set_session_context,
+)
+from application.core.helpers.cache import CacheManager, CustomKeyMaker, cached
+from application.core.helpers.cache.base import BaseBackend, InvalidationReport
+from application.core.helpers.cache.cache_entry import CacheEntry
+from application.server import app
+
+session = app.container.session()
+
+
+class MemoryBackend(BaseBackend):
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.locked: set[str] = set()
+
+    async def get(self, key: str) -> Any:
+        return self.values.get(key)
+
+    async def set(
+        self, response: Any, key: str, ttl: int = 60, tags: Iterable[str] = ()
+    ) -> None:
+        self.values[key] = response
+
+    async def delete_startswith(self, value: str) -> InvalidationReport:
+        return InvalidationReport(deleted=0, elapsed=0)
+
+    async def delete_by_tag(self, tag: str) -> InvalidationReport:
+        return InvalidationReport(deleted=0, elapsed=0)
+
+    @asynccontextmanager
+    async def lock(
+        self, key: str, timeout: float, blocking_timeout: float | None = None
+    ) -> AsyncIterator[bool]:
+        acquired = key not in self.locked
+        self.locked.add(key)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.locked.discard(key)
+
+
+def make_cache_manager() -> CacheManager:
+    return CacheManager(backend=MemoryBackend(), key_maker=CustomKeyMaker())
+
+
+def expire(cache_manager: CacheManager) -> None:
+    for entry in cache_manager.backend.values.values():
+        entry.expires_at = time.time() - 1
+
+
+@pytest.mark.asyncio
+async def test_lock_computes_concurrent_misses_once():
+    cache_manager = make_cache_manager()
+    calls = 0
+
+    @cached(prefix="lock", lock=True)
+    async def get_user(user_id: int) -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": user_id}
+
+    results = await asyncio.gather(
+        *[get_user(1, cache_manager=cache_manager) for _ in range(10)]
+    )
+
+    assert results == [{"id": 1}] * 10
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshed_in_background():
+    cache_manager = make_cache_manager()
+    version = 0
+
+    @cached(prefix="stale", ttl=60, stale_ttl=60)
+    async def get_user(user_id: int) -> dict:
+        nonlocal version
+        version += 1
+        return {"id": user_id, "version": version}
+
+    await get_user(1, cache_manager=cache_manager)
+    expire(cache_manager)
+
+    assert await get_user(1, cache_manager=cache_manager) == {"id": 1, "version": 1}
+    await asyncio.sleep(0.01)
+    assert await get_user(1, cache_manager=cache_manager) == {"id": 1, "version": 2}
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_runs_in_its_own_session_scope():
+    cache_manager = make_cache_manager()
+    contexts = []
+
+    @cached(prefix="scope", ttl=60, stale_ttl=60)
+    async def get_user(user_id: int) -> dict:
+        contexts.append(session_context.get(None))
+        return {"id": user_id}
+
+    await get_user(1, cache_manager=cache_manager)
+    expire(cache_manager)
+    request_context = set_session_context("request")
+    await get_user(1, cache_manager=cache_manager)
+    reset_session_context(request_context)
+    await asyncio.sleep(0.01)
+
+    refresh_context = contexts[-1]
+    assert len(contexts) == 2
+    assert refresh_context not in (None, "request")
+    assert refresh_context not in session.registry.registry
+
+
+@pytest.mark.asyncio
+async def test_early_expiration_refreshes_ahead_of_ttl():
+    cache_manager = make_cache_manager()
+    version = 0
+
+    @cached(prefix="early", ttl=60, early_expiration=1.0)
+    async def get_user(user_id: int) -> dict:
+        nonlocal version
+        version += 1
+        return {"id": user_id, "version": version}
+
+    await get_user(1, cache_manager=cache_manager)
+    (entry,) = cache_manager.backend.values.values()
+    assert isinstance(entry, CacheEntry)
+    # as if computing took far longer than remaining ttl
+    entry.delta = 10_000
+
+    assert await get_user(1, cache_manager=cache_manager) == {"id": 1, "version": 1}
+    await asyncio.sleep(0.01)
+    assert await get_user(1, cache_manager=cache_manager) == {"id": 1, "version": 2}
@@ -0,0 +1,130 @@
+import datetime
+import pickle
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from application.core.helpers.cache.cache_entry import CacheEntry
+from application.core.helpers.cache.codec import (
+    FORMAT_MASK,
+    FORMATS,
+    MODEL_FORMATS,
+    Codec,
+)
+from application.domain.user.models import (
+    GetUserListPageResponseSchema,
+    GetUserListResponseSchema,
+)
+
+
+def test_plain_data_is_encoded_as_json():
+    codec = Codec()
+    users = [{"id": 1, "email": "a@b.c", "nickname": "a", "tags": [], "score": 1.5}]
+
+    data = codec.encode(users)
+
+    assert data[0] & FORMAT_MASK == FORMATS["orjson"]
+    assert codec.decode(data) == users
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@pytest.mark.parametrize("format", ["orjson", "msgpack"])
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"created_at": datetime.datetime(2024, 1, 1, 12, 30)},
+        {"id": uuid.UUID(int=1)},
+        [Color.RED],
+        Point(1, 2),
+        (1, 2),
+        {1: "a"},
+        [2**70],
+    ],
+)
+def test_hit_returns_same_types_as_miss(format, value):
+    codec = Codec(format=format)
+
+    data = codec.encode(value)
+
+    assert data[0] & FORMAT_MASK == FORMATS["pickle"]
+    decoded = codec.decode(data)
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+class Event(BaseModel):
+    at: datetime.datetime
+
+
+@pytest.mark.parametrize("format", ["orjson", "msgpack"])
+@pytest.mark.parametrize(
+    "value",
+    [
+        GetUserListPageResponseSchema(
+            items=[GetUserListResponseSchema(id=1, email="a@b.c", nickname="a")],
+            next_cursor="next",
+        ),
+        [
+            GetUserListResponseSchema(id=i, email="a@b.c", nickname="a")
+            for i in range(2)
+        ],
+    ],
+)
+def test_models_of_plain_data_are_encoded_by_format(format, value):
+    codec = Codec(format=format)
+
+    data = codec.encode(value)
+
+    assert data[0] & FORMAT_MASK == MODEL_FORMATS[format]
+    decoded = codec.decode(data)
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_model_holding_non_plain_data_falls_back_to_pickle():
+    codec = Codec()
+    value = Event(at=datetime.datetime(2024, 1, 1))
+
+    data = codec.encode(value)
+
+    assert data[0] & FORMAT_MASK == FORMATS["pickle"]
+    assert codec.decode(data) == value
+
+
+def test_unsupported_value_falls_back_to_pickle():
+    codec = Codec()
+    value = {1, 2, 3}
+
+    assert codec.decode(codec.encode(value)) == value
+
+
+def test_cache_entry_envelope_round_trip():
+    codec = Codec()
+    entry = CacheEntry(value={"a": 1}, expires_at=100.0, delta=0.5)
+
+    assert codec.decode(codec.encode(entry)) == entry
+
+
+def test_legacy_payloads_are_readable():
+    codec = Codec()
+
+    assert codec.decode(orjson.dumps({"a": 1})) == {"a": 1}
+    assert codec.decode(pickle.dumps([1, 2])) == [1, 2]
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        Codec(format="yaml")
@@ -0,0 +1,34 @@
+import pytest
+
+from application.core.helpers.cache import CustomKeyMaker
+
+
+async def get_user_list(limit: int = 10, prev: int | None = None):
+    ...
+
+
+@pytest.mark.asyncio
+async def test_key_depends_on_argument_values():
+    key_maker = CustomKeyMaker()
+    key = await key_maker.make(
+        get_user_list, "get_user_list", arguments={"limit": 5, "prev": 100}
+    )
+    other_key = await key_maker.make(
+        get_user_list, "get_user_list", arguments={"limit": 10, "prev": 100}
+    )
+
+    assert key != other_key
+    assert key.startswith("get_user_list::")
+
+
+@pytest.mark.asyncio
+async def test_key_is_independent_of_argument_order():
+    key_maker = CustomKeyMaker()
+    key = await key_maker.make(
+        get_user_list, "get_user_list", arguments={"limit": 5, "prev": 100}
+    )
+    same_key = await key_maker.make(
+        get_user_list, "get_user_list", arguments={"prev": 100, "limit": 5}
+    )
+
+    assert key == same_key
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from application.core.helpers.cache import CacheManager, CustomKeyMaker, RedisBackend
+from application.core.helpers.cache.redis_backend import UNLINK_CHUNK_SIZE
+
+
+def make_backend(redis: FakeRedis, **kwargs) -> RedisBackend:
+    backend = RedisBackend(**kwargs)
+    backend.redis_provider = lambda: redis
+    return backend
+
+
+async def fill(redis: FakeRedis, prefix: str, count: int) -> None:
+    await redis.mset({f"{prefix}::{i}": i for i in range(count)})
+
+
+@pytest.mark.asyncio
+async def test_delete_startswith_removes_prefix_in_batches():
+    redis = FakeRedis()
+    backend = make_backend(redis, scan_count=7, delete_batch_size=10)
+    await fill(redis, "users", 25)
+    await fill(redis, "items", 5)
+
+    report = await backend.delete_startswith("users")
+
+    assert report.deleted == 25
+    assert report.elapsed >= 0
+    assert await redis.keys("users::*") == []
+    assert len(await redis.keys("items::*")) == 5
+
+
+@pytest.mark.asyncio
+async def test_unlink_is_chunked_in_one_pipeline(monkeypatch):
+    redis = FakeRedis()
+    backend = make_backend(redis, delete_batch_size=1000)
+    await fill(redis, "users", 250)
+    pipelines = []
+    unlinked = []
+    pipeline = redis.pipeline
+
+    def recording_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        unlink = pipe.unlink
+        pipe.unlink = lambda *keys: unlinked.append(len(keys)) or unlink(*keys)
+        pipelines.append(pipe)
+        return pipe
+
+    monkeypatch.setattr(redis, "pipeline", recording_pipeline)
+
+    report = await backend.delete_startswith("users")
+
+    assert report.deleted == 250
+    assert len(pipelines) == 1
+    assert unlinked == [UNLINK_CHUNK_SIZE, UNLINK_CHUNK_SIZE, 50]
+
+
+@pytest.mark.asyncio
+async def test_delete_startswith_without_match_reports_nothing():
+    backend = make_backend(FakeRedis())
+
+    report = await backend.delete_startswith("users")
+
+    assert report.deleted == 0
+
+
+@pytest.mark.asyncio
+async def test_remove_by_prefix_in_background():
+    redis = FakeRedis()
+    cache_manager = CacheManager(
+        backend=make_backend(redis), key_maker=CustomKeyMaker()
+    )
+    await fill(redis, "users", 10)
+
+    assert await cache_manager.remove_by_prefix("users", background=True) is None
+    await asyncio.sleep(0.05)
+
+    assert await redis.keys("users::*") == []
+
+
+@pytest.mark.asyncio
+async def test_tag_set_holds_live_keys_only():
+    redis = FakeRedis()
+    backend = make_backend(redis)
+    tag_key = backend.tag_key("users")
+    await redis.set("users::expired", 1)
+    await redis.zadd(tag_key, {"users::expired": time.time() - 1})
+
+    await backend.set(response=1, key="users::1", ttl=60, tags=["users"])
+
+    assert await redis.zrange(tag_key, 0, -1) == [b"users::1"]
+    assert 0 < await redis.ttl(tag_key) <= 60
+
+
+@pytest.mark.asyncio
+async def test_delete_by_tag_removes_tagged_keys_only():
+    redis = FakeRedis()
+    backend = make_backend(redis, delete_batch_size=2)
+    for i in range(3):
+        await backend.set(response=i, key=f"users::{i}", tags=["users"])
+    await backend.set(response=0, key="items::0", tags=["items"])
+
+    report = await backend.delete_by_tag("users")
+
+    assert report.deleted == 3
+    assert await redis.keys("users::*") == []
+    assert await redis.exists("items::0")
+    assert not await redis.exists(backend.tag_key("users"))
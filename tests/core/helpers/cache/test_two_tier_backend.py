@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from application.core.helpers.cache import RedisBackend, TwoTierBackend
+
+
+def make_backend(redis: FakeRedis, **kwargs) -> TwoTierBackend:
+    remote = RedisBackend()
+    remote.redis_provider = lambda: redis
+    return TwoTierBackend(remote=remote, **kwargs)
+
+
+async def subscribed(*backends: TwoTierBackend) -> None:
+    for backend in backends:
+        backend._ensure_listener()
+    for _ in range(100):
+        if all(backend._subscribed for backend in backends):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("invalidation channel not subscribed")
+
+
+@pytest.mark.asyncio
+async def test_local_hit_is_a_copy():
+    redis = FakeRedis()
+    backend = make_backend(redis)
+    await subscribed(backend)
+    await backend.set(response={"items": [1, 2]}, key="users::1")
+    await backend.get("users::1")
+
+    first = await backend.get("users::1")
+    first["items"].append(3)
+
+    assert "users::1" in backend._entries
+    assert await backend.get("users::1") == {"items": [1, 2]}
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_other_workers():
+    redis = FakeRedis()
+    workers = [make_backend(redis), make_backend(redis)]
+    await subscribed(*workers)
+    await workers[0].set(response="old", key="users::1")
+    assert await workers[1].get("users::1") == "old"
+
+    await workers[0].set(response="new", key="users::1")
+    await asyncio.sleep(0.05)
+
+    assert await workers[1].get("users::1") == "new"
+    for worker in workers:
+        await worker.close()
+
+
+@pytest.mark.asyncio
+async def test_local_tier_is_bounded_by_bytes():
+    redis = FakeRedis()
+    backend = make_backend(redis, max_bytes=64)
+    await subscribed(backend)
+    for i in range(4):
+        await backend.set(response="x" * 20, key=f"users::{i}")
+        await backend.get(f"users::{i}")
+
+    assert backend._bytes <= 64
+    assert "users::0" not in backend._entries
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_close_stops_listener():
+    redis = FakeRedis()
+    backend = make_backend(redis)
+    await subscribed(backend)
+    listener = backend._listener
+
+    await backend.close()
+
+    assert listener is not None and listener.done()
+    assert backend._listener is None
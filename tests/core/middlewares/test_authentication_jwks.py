@@ -0,0 +1,140 @@
+import hashlib
+import hmac
+import json
+import time
+
+import jwt
+import pytest
+from aiohttp import ClientConnectionError
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.utils import base64url_encode
+
+from application.core.enums import ResponseCode
+from application.core.exceptions.token import TokenDecodeException, TokenExpireException
+from application.core.external_service.jwks import JWKSKeySet
+from application.core.external_service.token_cache import VerifiedTokenCache
+from application.core.middlewares.authentication_jwks import JWKSAuthBackend
+
+KID = "key-1"
+private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+other_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+public_pem = private_key.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+)
+
+
+class FakeAuthClient:
+    def __init__(self, is_valid: bool = True, jwks_error: Exception | None = None):
+        self.is_valid = is_valid
+        self.jwks_error = jwks_error
+        self.verified = 0
+
+    async def get_jwks(self) -> dict:
+        if self.jwks_error is not None:
+            raise self.jwks_error
+        jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+        return {"keys": [{**jwk, "kid": KID, "alg": "RS256", "use": "sig"}]}
+
+    async def is_token_valid(self, token: str) -> bool:
+        self.verified += 1
+        return self.is_valid
+
+
+def make_backend(
+    auth_client: FakeAuthClient, token_cache: VerifiedTokenCache | None = None
+) -> JWKSAuthBackend:
+    key_set = JWKSKeySet()
+    key_set.auth_client_provider = lambda: auth_client
+    backend = JWKSAuthBackend(
+        key_set=key_set,
+        algorithms=["RS256"],
+        revocation_sensitive_scopes=["admin"],
+    )
+    token_cache = token_cache or VerifiedTokenCache()
+    backend.auth_client_provider = lambda: auth_client
+    backend.token_cache_provider = lambda: token_cache
+    return backend
+
+
+def make_token(key=private_key, kid=KID, algorithm="RS256", **claims) -> str:
+    payload = {"user_id": 1, "scope": ["read"], "exp": int(time.time()) + 60}
+    return jwt.encode(
+        {**payload, **claims}, key, algorithm=algorithm, headers={"kid": kid}
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_signed_by_published_key_is_verified_locally():
+    auth_client = FakeAuthClient()
+    backend = make_backend(auth_client)
+
+    payload = await backend.verify_token(make_token())
+
+    assert payload["user_id"] == 1
+    assert auth_client.verified == 0
+
+
+@pytest.mark.asyncio
+async def test_bad_signature_is_rejected():
+    backend = make_backend(FakeAuthClient())
+
+    with pytest.raises(TokenDecodeException):
+        await backend.verify_token(make_token(key=other_private_key))
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_rejected():
+    backend = make_backend(FakeAuthClient())
+
+    with pytest.raises(TokenExpireException):
+        await backend.verify_token(make_token(exp=int(time.time()) - 10))
+
+
+@pytest.mark.asyncio
+async def test_hmac_token_keyed_by_public_key_is_rejected():
+    backend = make_backend(FakeAuthClient())
+    # algorithm confusion, public key used as HMAC secret
+    header = base64url_encode(
+        json.dumps({"alg": "HS256", "typ": "JWT", "kid": KID}).encode()
+    )
+    payload = make_token().split(".")[1].encode()
+    signature = hmac.new(public_pem, header + b"." + payload, hashlib.sha256)
+    token = b".".join([header, payload, base64url_encode(signature.digest())])
+
+    with pytest.raises(TokenDecodeException):
+        await backend.verify_token(token.decode())
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_falls_back_to_remote_verification():
+    auth_client = FakeAuthClient(is_valid=False)
+    backend = make_backend(auth_client)
+
+    with pytest.raises(TokenDecodeException):
+        await backend.verify_token(make_token(kid="rotated-key"))
+    assert auth_client.verified == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_jwks_falls_back_to_remote_verification():
+    auth_client = FakeAuthClient(jwks_error=ClientConnectionError("refused"))
+    backend = make_backend(auth_client)
+
+    payload = await backend.verify_token(make_token())
+
+    assert payload["user_id"] == 1
+    assert auth_client.verified == 1
+
+
+@pytest.mark.asyncio
+async def test_revocation_sensitive_scope_bypasses_verification_cache():
+    auth_client = FakeAuthClient(is_valid=False)
+    token_cache = VerifiedTokenCache()
+    backend = make_backend(auth_client, token_cache)
+    token = make_token(scope=["admin"])
+    await token_cache.set(token, ResponseCode.OK)
+
+    with pytest.raises(TokenDecodeException):
+        await backend.verify_token(token)
+    assert auth_client.verified == 1
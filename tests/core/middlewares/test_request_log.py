@@ -0,0 +1,109 @@
+import pytest
+
+from application.core.fastapi.log_policy import LOG_ALL, LogPolicy
+from application.core.middlewares.request_log import RequestLogMiddleware
+from application.domain.log.models import RequestResponseLog
+
+
+class User:
+    user_id = 7
+
+
+def make_scope(path="/api/v1/users"):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"host", b"test"), (b"user-agent", b"pytest")],
+        "client": ("10.0.0.1", 1234),
+        "user": User(),
+    }
+
+
+def make_app(status=200, raises=False):
+    async def app(scope, receive, send):
+        if raises:
+            raise RuntimeError("boom")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+class Handler:
+    def __init__(self):
+        self.records = []
+
+    async def __call__(self, record):
+        self.records.append(record)
+
+
+@pytest.mark.asyncio
+async def test_record_is_read_from_scope_and_response_start():
+    handler = Handler()
+    middleware = RequestLogMiddleware(make_app(status=201), handler, LOG_ALL)
+    await middleware(make_scope(), receive, send)
+
+    (record,) = handler.records
+    assert (record.user_id, record.ip, record.port) == (7, "10.0.0.1", 1234)
+    assert (record.method, record.path, record.agent) == (
+        "GET",
+        "/api/v1/users",
+        "pytest",
+    )
+    assert record.response_status == 201
+    assert record.as_row()["updated_at"] == record.created_at
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_logged_as_server_error():
+    handler = Handler()
+    policy = LogPolicy(sample_rate=0, client_error_sample_rate=0)
+    middleware = RequestLogMiddleware(make_app(raises=True), handler, policy)
+    with pytest.raises(RuntimeError):
+        await middleware(make_scope(), receive, send)
+
+    assert handler.records[0].response_status == 500
+
+
+@pytest.mark.asyncio
+async def test_policy_skips_path_and_sampled_out_status():
+    handler = Handler()
+    policy = LogPolicy(sample_rate=0, skip_paths=frozenset({"/health"}))
+    await RequestLogMiddleware(make_app(), handler, policy)(
+        make_scope("/health"), receive, send
+    )
+    await RequestLogMiddleware(make_app(), handler, policy)(make_scope(), receive, send)
+
+    assert handler.records == []
+
+
+@pytest.mark.asyncio
+async def test_missing_client_is_logged_as_empty_address():
+    handler = Handler()
+    scope = make_scope()
+    del scope["client"]
+    await RequestLogMiddleware(make_app(), handler, LOG_ALL)(scope, receive, send)
+
+    row = handler.records[0].as_row()
+    assert (row["ip"], row["port"]) == ("", 0)
+
+
+@pytest.mark.asyncio
+async def test_path_is_cut_to_column_length():
+    handler = Handler()
+    scope = make_scope("/wp-admin/" + "x" * 100)
+    await RequestLogMiddleware(make_app(status=404), handler, LOG_ALL)(
+        scope, receive, send
+    )
+
+    length = RequestResponseLog.__table__.c.path.type.length
+    assert handler.records[0].path == scope["path"][:length]
@@ -0,0 +1,68 @@
+import pytest
+
+from application.core.db.session_maker import get_session_context, has_session_context
+from application.core.middlewares import sqlalchemy
+from application.core.middlewares.sqlalchemy import SQLAlchemyMiddleware
+
+
+class FakeSession:
+    def __init__(self, calls: list) -> None:
+        self.calls = calls
+
+    async def commit(self) -> None:
+        self.calls.append("commit")
+
+    async def rollback(self) -> None:
+        self.calls.append("rollback")
+
+    async def remove(self) -> None:
+        self.calls.append("remove")
+
+
+def make_app(status: int, calls: list):
+    async def app(scope, receive, send):
+        calls.append(f"handled in {get_session_context()}")
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        calls.append("response started")
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def call(middleware: SQLAlchemyMiddleware) -> None:
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    await middleware(scope, receive, send)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sqlalchemy, "session", FakeSession(calls))
+    return calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, outcome", [(200, "commit"), (400, "rollback")])
+async def test_session_is_settled_as_response_starts(calls, status, outcome):
+    await call(SQLAlchemyMiddleware(make_app(status, calls)))
+
+    assert calls[0].startswith("handled in ")
+    assert calls[1:] == [outcome, "response started", "remove"]
+    assert not has_session_context()
+
+
+@pytest.mark.asyncio
+async def test_each_request_has_its_own_session_scope(calls):
+    middleware = SQLAlchemyMiddleware(make_app(200, calls))
+
+    await call(middleware)
+    await call(middleware)
+
+    scopes = [step for step in calls if step.startswith("handled in ")]
+    assert len(set(scopes)) == 2
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from application.core.utils.single_flight import SingleFlight, render_stats
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def verify(token: str) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return token
+
+    results = await asyncio.gather(
+        *[single_flight.do("token", verify, "token") for _ in range(20)]
+    )
+
+    assert results == ["token"] * 20
+    assert calls == 1
+    assert single_flight.stats() == {"issued": 1, "coalesced": 19}
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_key_released():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("fail")
+
+    results = await asyncio.gather(
+        single_flight.do("key", fail),
+        single_flight.do("key", fail),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(single_flight) == 0
+
+
+def test_stats_are_rendered_as_counters_by_call():
+    text = render_stats(
+        "auth_client_single_flight",
+        {
+            "verify": {"issued": 2, "coalesced": 5},
+            "revoke": {"issued": 1, "coalesced": 0},
+        },
+    )
+
+    assert text.splitlines() == [
+        "# TYPE auth_client_single_flight_issued_total counter",
+        'auth_client_single_flight_issued_total{call="verify"} 2',
+        'auth_client_single_flight_issued_total{call="revoke"} 1',
+        "# TYPE auth_client_single_flight_coalesced_total counter",
+        'auth_client_single_flight_coalesced_total{call="verify"} 5',
+        'auth_client_single_flight_coalesced_total{call="revoke"} 0',
+    ]
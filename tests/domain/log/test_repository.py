@@ -0,0 +1,73 @@
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from application.core.db import standalone_session
+from application.domain.log.models import RequestResponseLog
+from application.domain.log.sink import BufferedLogSink
+from application.domain.log.spool import LogSpool
+from application.server import app
+
+root_container = app.container
+log_repository = root_container.log_container.token_repository()
+
+
+def log_row(created_at: datetime.datetime) -> dict:
+    return {
+        "ip": "127.0.0.1",
+        "port": 1,
+        "agent": "test",
+        "method": "GET",
+        "path": "/",
+        "response_status": 200,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "request_id": uuid.uuid4(),
+    }
+
+
+@standalone_session
+async def delete_logs(request_ids: list[uuid.UUID]) -> None:
+    await root_container.session().execute(
+        delete(RequestResponseLog)
+        .where(RequestResponseLog.request_id.in_(request_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_written_request_ids_within_bounds():
+    created_at = datetime.datetime(2020, 1, 15, 12, 0)
+    rows = [log_row(created_at), log_row(created_at + datetime.timedelta(hours=1))]
+    await standalone_session(log_repository.bulk_insert)(rows)
+    request_ids = [row["request_id"] for row in rows]
+
+    try:
+        written = await log_repository.find_written_request_ids(
+            [*request_ids, uuid.uuid4()], start=created_at, end=rows[1]["created_at"]
+        )
+        before_second = await log_repository.find_written_request_ids(
+            request_ids, start=created_at, end=created_at
+        )
+    finally:
+        await delete_logs(request_ids)
+
+    assert written == set(request_ids)
+    assert before_second == {request_ids[0]}
+
+
+@pytest.mark.asyncio
+async def test_sink_drops_row_refused_by_database(tmp_path):
+    sink = BufferedLogSink(repository=log_repository, spool=LogSpool(str(tmp_path)))
+    now = datetime.datetime.utcnow()
+    batch = [log_row(now), {**log_row(now), "path": "/" + "a" * 40}]
+
+    await sink.flush(batch)
+
+    assert (sink.written, sink.rejected, sink.spilled) == (1, 1, 0)
+    request_ids = [row["request_id"] for row in batch]
+    written = await log_repository.find_written_request_ids(request_ids, now, now)
+    assert written == {request_ids[0]}
+    await delete_logs(request_ids)
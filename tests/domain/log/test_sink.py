@@ -0,0 +1,182 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from application.domain.log.sink import BufferedLogSink
+from application.domain.log.spool import LogSpool
+
+
+class TruncationError(Exception):
+    """asyncpg error as adapted by dialect, value too long."""
+
+    sqlstate = "22001"
+
+
+class RecordingSink(BufferedLogSink):
+    """
+    Batches kept in memory instead of written, fail while `down`,
+    refused as database does when holding a record of port None or -1.
+    """
+
+    def __init__(self, repository=None, **kwargs):
+        super().__init__(repository=repository, **kwargs)
+        self.batches = []
+        self.down = False
+
+    async def _write(self, batch):
+        if self.down:
+            raise ConnectionError("database is down")
+        ports = [record["port"] for record in batch]
+        if None in ports:
+            raise IntegrityError("INSERT", {}, Exception("null value in port"))
+        if -1 in ports:
+            raise DBAPIError("INSERT", {}, TruncationError())
+        self.batches.append(batch)
+
+
+@pytest.mark.asyncio
+async def test_records_are_flushed_in_batches_on_close():
+    sink = RecordingSink(batch_size=2, flush_interval=60)
+    sink.start()
+    for i in range(5):
+        await sink(data={"port": i})
+    await sink.close()
+
+    assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+    assert sink.stats()["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_overflow_drops_when_full():
+    sink = RecordingSink(max_size=2)
+    for i in range(3):
+        await sink(data={"port": i})
+
+    assert sink.queue.qsize() == 2
+    assert sink.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_overflow_samples_past_watermark():
+    sink = RecordingSink(
+        max_size=10, overflow="sample", sample_rate=0, sample_above=0.5
+    )
+    for i in range(10):
+        await sink(data={"port": i})
+
+    assert sink.queue.qsize() == 5
+    assert sink.dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_spooled_and_replayed(tmp_path):
+    sink = RecordingSink(spool=LogSpool(str(tmp_path)), retry_interval=0)
+    sink.down = True
+    await sink.flush([{"port": 1}, {"port": 2}])
+
+    assert sink.spilled == 2
+    assert sink.batches == []
+
+    sink.down = False
+    await sink.replay()
+
+    assert sink.replayed == 2
+    assert [record["port"] for batch in sink.batches for record in batch] == [1, 2]
+    assert len(sink.spool) == 0
+
+
+@pytest.mark.asyncio
+async def test_batches_skip_database_while_circuit_is_open(tmp_path):
+    sink = RecordingSink(spool=LogSpool(str(tmp_path)), retry_interval=60)
+    sink.down = True
+    await sink.flush([{"port": 1}])
+    sink.down = False
+    await sink.flush([{"port": 2}])
+
+    assert sink.circuit_open
+    assert sink.spilled == 2
+    assert sink.batches == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("refused", [None, -1])
+async def test_refused_records_are_dropped_rest_written(tmp_path, refused):
+    sink = RecordingSink(spool=LogSpool(str(tmp_path)))
+    await sink.flush([{"port": port} for port in [1, 2, refused, 4, 5]])
+
+    written = [record["port"] for batch in sink.batches for record in batch]
+    assert written == [1, 2, 4, 5]
+    assert sink.stats()["rejected"] == 1
+    assert sink.written == 4
+    assert sink.spilled == 0
+    assert not sink.circuit_open
+
+
+@pytest.mark.asyncio
+async def test_refused_records_are_dropped_from_spool_on_replay(tmp_path):
+    sink = RecordingSink(spool=LogSpool(str(tmp_path)), retry_interval=0)
+    sink.down = True
+    await sink.flush([{"port": 1}, {"port": None}, {"port": 3}])
+
+    sink.down = False
+    await sink.replay()
+
+    written = [record["port"] for batch in sink.batches for record in batch]
+    assert written == [1, 3]
+    assert sink.replayed == 2
+    assert sink.rejected == 1
+    assert len(sink.spool) == 0
+
+
+class WrittenRepository:
+    """Reports request_ids of written as already in database."""
+
+    def __init__(self, written: set[uuid.UUID]) -> None:
+        self.written = written
+
+    async def find_written_request_ids(self, request_ids, start, end):
+        return self.written.intersection(request_ids)
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_records_written_before_timeout(tmp_path):
+    written = set()
+    sink = RecordingSink(
+        repository=WrittenRepository(written),
+        spool=LogSpool(str(tmp_path)),
+        retry_interval=0,
+    )
+    for i in range(2):
+        await sink(data={"port": i})
+    batch = sink._take(2)
+    # committed, but reported too late
+    written.add(batch[0]["request_id"])
+    sink.down = True
+    await sink.flush(batch)
+
+    sink.down = False
+    await sink.replay()
+
+    assert [[record["port"] for record in batch] for batch in sink.batches] == [[1]]
+    assert sink.batches[0][0]["request_id"] == batch[1]["request_id"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_write_is_cancelled(tmp_path):
+    class StalledSink(RecordingSink):
+        async def _write(self, batch):
+            self.cancelled = False
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+
+    sink = StalledSink(spool=LogSpool(str(tmp_path)), write_timeout=0.01)
+    await sink.flush([{"port": 1}])
+    await asyncio.sleep(0)
+
+    assert sink.cancelled
+    assert sink.spilled == 1
@@ -0,0 +1,71 @@
+import datetime
+import os
+
+from application.domain.log.spool import LogSpool
+
+
+def test_sealed_segment_is_read_back_in_batches(tmp_path):
+    spool = LogSpool(str(tmp_path))
+    created_at = datetime.datetime(2024, 1, 1, 12, 0)
+    spool.append([{"port": i, "created_at": created_at} for i in range(5)])
+
+    # active segment is not replayed
+    assert spool.sealed_segments() == []
+    spool.rotate()
+    (segment,) = spool.sealed_segments()
+
+    batches = list(LogSpool.read_batches(segment, 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0] == {"port": 0, "created_at": created_at}
+
+
+def test_torn_line_is_skipped(tmp_path):
+    spool = LogSpool(str(tmp_path))
+    spool.append([{"port": 1}])
+    spool.rotate()
+    (segment,) = spool.sealed_segments()
+    with open(segment, "ab") as f:
+        f.write(b'{"port": 2')
+
+    assert list(LogSpool.read_batches(segment, 10)) == [[{"port": 1}]]
+
+
+def test_segment_is_claimed_once(tmp_path):
+    spool = LogSpool(str(tmp_path))
+    spool.append([{"port": 1}])
+    spool.rotate()
+    (segment,) = spool.sealed_segments()
+
+    claimed = LogSpool.claim(segment)
+    assert claimed is not None
+    assert LogSpool.claim(segment) is None
+    assert spool.sealed_segments() == []
+
+    LogSpool.release(claimed)
+    assert spool.sealed_segments() == [segment]
+
+
+def test_segments_of_this_process_are_sealed_on_start(tmp_path):
+    spool = LogSpool(str(tmp_path))
+    spool.append([{"port": 1}])
+    assert len(spool) == 0
+
+    # as if process restarted with segment left open
+    assert len(LogSpool(str(tmp_path))) == 1
+
+
+def test_oldest_segments_are_dropped_past_max_bytes(tmp_path):
+    spool = LogSpool(str(tmp_path), segment_bytes=1, max_bytes=30)
+    for i in range(5):
+        spool.append([{"port": i}])
+
+    assert spool.size() <= 30
+    assert spool.dropped_segments > 0
+    remaining = [
+        batch[0]["port"]
+        for segment in spool.sealed_segments()
+        for batch in LogSpool.read_batches(segment, 10)
+    ]
+    assert remaining == sorted(remaining)
+    assert remaining[-1] == 4
+    assert all(name.endswith(".ndjson") for name in os.listdir(tmp_path))
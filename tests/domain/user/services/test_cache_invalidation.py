@@ -0,0 +1,143 @@
+import pytest
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy import select
+
+from application.core.db import standalone_session
+from application.core.helpers.cache import (
+    CacheManager,
+    CacheTag,
+    CustomKeyMaker,
+    RedisBackend,
+)
+from application.domain.user.exceptions import (
+    DuplicateEmailOrNicknameException,
+    UserNotFoundException,
+)
+from application.domain.user.models import User
+from application.server import app
+
+root_container = app.container
+user_service = root_container.user_container.user_service()
+
+
+@pytest.fixture
+def redis():
+    redis = FakeRedis()
+    backend = RedisBackend()
+    backend.redis_provider = lambda: redis
+    cache_manager = CacheManager(backend=backend, key_maker=CustomKeyMaker())
+    with root_container.cache_manager.override(cache_manager):
+        yield redis
+
+
+@standalone_session
+async def create_user(nickname: str) -> int:
+    user = User(email=f"{nickname}@mail.com", password="password", nickname=nickname)
+    session = root_container.session()
+    session.add(user)
+    await session.flush()
+    return user.id
+
+
+@standalone_session
+async def find_nickname(user_id: int) -> str | None:
+    result = await root_container.session().execute(
+        select(User.nickname).where(User.id == user_id)
+    )
+    return result.scalars().first()
+
+
+async def cache_page_listing(redis: FakeRedis, user_id: int) -> None:
+    await root_container.cache_manager().backend.set(
+        response=[user_id],
+        key="get_user_list::page",
+        tags=[CacheTag.GET_USER_LIST.value, CacheTag.USER.of(user_id)],
+    )
+    assert await redis.exists("get_user_list::page")
+
+
+@standalone_session
+async def delete_user_by_nickname(nickname: str) -> None:
+    user = await user_service.repository.get_user_by_nickname(nickname)
+    await root_container.session().delete(user)
+
+
+@pytest.mark.asyncio
+async def test_update_user_removes_cached_pages_listing_user(redis):
+    user_id = await create_user("cache_update")
+    await cache_page_listing(redis, user_id)
+
+    await standalone_session(user_service.update_user)(
+        user_id, {"nickname": "cache_updated"}
+    )
+
+    assert not await redis.exists("get_user_list::page")
+    assert await find_nickname(user_id) == "cache_updated"
+    await standalone_session(user_service.delete_user)(user_id)
+
+
+@pytest.mark.asyncio
+async def test_delete_user_removes_cached_pages_listing_user(redis):
+    user_id = await create_user("cache_delete")
+    await cache_page_listing(redis, user_id)
+
+    await standalone_session(user_service.delete_user)(user_id)
+
+    assert not await redis.exists("get_user_list::page")
+    assert await find_nickname(user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_create_user_removes_cached_user_list_pages(redis):
+    user_id = await create_user("cache_listed")
+    await cache_page_listing(redis, user_id)
+
+    await standalone_session(user_service.create_user)(
+        "cache_created@mail.com", "password", "password", "cache_created"
+    )
+
+    assert not await redis.exists("get_user_list::page")
+    await delete_user_by_nickname("cache_created")
+    await standalone_session(user_service.delete_user)(user_id)
+
+
+@pytest.mark.asyncio
+async def test_update_to_taken_nickname_keeps_cache(redis):
+    user_id = await create_user("cache_taken")
+    other_id = await create_user("cache_other")
+    await cache_page_listing(redis, user_id)
+
+    with pytest.raises(DuplicateEmailOrNicknameException):
+        await standalone_session(user_service.update_user)(
+            user_id, {"nickname": "cache_other"}
+        )
+
+    assert await redis.exists("get_user_list::page")
+    for id in (user_id, other_id):
+        await standalone_session(user_service.delete_user)(id)
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_user_is_not_found(redis):
+    with pytest.raises(UserNotFoundException):
+        await standalone_session(user_service.delete_user)(2**62)
+
+
+@pytest.mark.asyncio
+async def test_write_is_kept_when_cache_is_unreachable(redis, monkeypatch):
+    user_id = await create_user("cache_down")
+
+    calls = []
+
+    async def unreachable(tag):
+        calls.append(tag)
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(root_container.cache_manager(), "remove_by_tag", unreachable)
+    await standalone_session(user_service.update_user)(
+        user_id, {"nickname": "cache_down_updated"}
+    )
+
+    assert calls == [CacheTag.USER.of(user_id)]
+    assert await find_nickname(user_id) == "cache_down_updated"
+    await standalone_session(user_service.delete_user)(user_id)
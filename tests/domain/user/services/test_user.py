@@ -1,4 +1,13 @@
 import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from application.core.db import standalone_session
+from application.domain.user.models import User
+from application.server import app
+
+root_container = app.container
+user_service = root_container.user_container.user_service()
 
 
 @pytest.mark.asyncio
@@ -14,3 +23,52 @@ async def test_create_user():
 @pytest.mark.asyncio
 async def test_is_admin():
     ...
+
+
+@standalone_session
+async def create_users(count: int) -> list[int]:
+    users = [
+        User(email=f"list{i}@mail.com", password="password", nickname=f"list{i}")
+        for i in range(count)
+    ]
+    session = root_container.session()
+    session.add_all(users)
+    await session.flush()
+    return [user.id for user in users]
+
+
+@standalone_session
+async def delete_users(ids: list[int]) -> None:
+    await root_container.session().execute(
+        delete(User)
+        .where(User.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+@pytest_asyncio.fixture
+async def user_ids():
+    ids = await create_users(14)
+    yield ids
+    await delete_users(ids)
+
+
+@pytest.mark.asyncio
+async def test_user_list_keeps_prev_id_contract(user_ids):
+    assert len(await standalone_session(user_service.get_user_list)(limit=50)) == 12
+
+    users = await standalone_session(user_service.get_user_list)(
+        limit=3, prev=user_ids[-1]
+    )
+
+    assert [user.id for user in users] == user_ids[-2:-5:-1]
+
+
+@pytest.mark.asyncio
+async def test_user_page_walks_by_cursor(user_ids):
+    first = await standalone_session(user_service.get_user_page)(limit=3)
+    second = await standalone_session(user_service.get_user_page)(
+        limit=3, cursor=first.next_cursor
+    )
+
+    assert [user.id for user in first.items + second.items] == user_ids[:-7:-1]